@@ -0,0 +1,43 @@
+"""Compile the DATA_PATH export into the SQLite file used by STORE_BACKEND=sqlite.
+
+python -m app.compile [--output PATH]
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+
+from app.config import settings
+from app.services.data_loader import DataStore
+from app.services.sqlite_store import write_sqlite_store
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compile the export to SQLite")
+    parser.add_argument("--data-path", type=Path, default=settings.DATA_PATH)
+    parser.add_argument("--output", type=Path, default=settings.SQLITE_PATH)
+    parser.add_argument("--workers", type=int, default=settings.LOAD_WORKERS)
+    args = parser.parse_args(argv)
+    if args.output is None:
+        parser.error("--output is required when SQLITE_PATH is not set")
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+    store = DataStore(args.data_path, load_workers=args.workers)
+    store.load_all()
+    store.load_report.log(logger)
+    write_sqlite_store(args.output, store)
+    logger.info(
+        "Compiled %d topics and %d categories to %s in %.1fs",
+        len(store.topics),
+        len(store.categories),
+        args.output,
+        time.perf_counter() - start,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -9,6 +10,26 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     DEBUG: bool = False
+    # Nombre de workers du serveur préforké (python -m app.server)
+    WORKERS: int = 1
+    # Nombre de processus pour le parsing des topics (1 = chargement série)
+    LOAD_WORKERS: int = 1
+    # Répertoire du snapshot précompilé (désactivé si non défini)
+    CACHE_PATH: Path | None = None
+    # Rechargement incrémental des fichiers modifiés sous DATA_PATH
+    WATCH_DATA: bool = False
+    WATCH_POLL_INTERVAL: float = 2.0
+    # Métadonnées seules en mémoire, contenus relus à la demande (cache LRU)
+    LAZY_BODIES: bool = False
+    BODY_CACHE_BYTES: int = 64 * 1024 * 1024
+    # Stockage des données: en mémoire par worker, fichier mmap partagé,
+    # ou base SQLite compilée par python -m app.compile
+    STORE_BACKEND: Literal["memory", "mmap", "sqlite"] = "memory"
+    SQLITE_PATH: Path | None = None
+    # Recherche: index des mots des titres en mémoire, ou plein texte SQLite FTS5
+    SEARCH_BACKEND: Literal["memory", "fts5"] = "memory"
+    # Jeton des routes /api/v1/admin (Authorization: Bearer); désactivées si vide
+    ADMIN_TOKEN: str | None = None
 
     class Config:
         env_file = ".env"
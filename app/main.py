@@ -1,22 +1,62 @@
+import asyncio
+import contextlib
+import threading
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any
 
-from fastapi import FastAPI, Request, Response
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.config import settings
-from app.routers import api, web
-from app.services.data_loader import init_data_store
+from app.routers import admin, api, web
+from app.services import data_loader
+from app.services.watcher import watch_data_store
+
+# Délai suggéré aux clients pendant le chargement des données
+RETRY_AFTER_SECONDS = 5
+
+
+async def _watch_when_loaded(loader: threading.Thread | None) -> None:
+    if loader is not None:
+        await asyncio.to_thread(loader.join)
+    store = data_loader.data_store
+    if store is None or not store.live_reload:
+        return
+    await watch_data_store(store, settings.WATCH_POLL_INTERVAL)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    init_data_store()
+    # Chargement en arrière-plan: le serveur répond (/health, /ready) pendant ce
+    # temps. Store déjà chargé si le processus a été forké par app.server.
+    loader = None
+    if data_loader.data_store is None:
+        loader = data_loader.start_background_load()
+    if not settings.WATCH_DATA:
+        yield
+        return
+
+    watcher = asyncio.create_task(_watch_when_loaded(loader))
     yield
+    watcher.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await watcher
+
+
+def require_data_store() -> None:
+    """Fast 503 on data routes until the store is loaded."""
+    state = data_loader.load_status.state
+    if state in (data_loader.LoadState.LOADING, data_loader.LoadState.FAILED):
+        raise HTTPException(
+            status_code=503,
+            detail=f"Data store {state}",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
 
 
 app = FastAPI(
@@ -32,8 +72,10 @@ app.mount("/static", StaticFiles(directory=static_path), name="static")
 if settings.IMAGES_PATH.exists():
     app.mount("/images", StaticFiles(directory=settings.IMAGES_PATH), name="images")
 
-app.include_router(api.router)
-app.include_router(web.router)
+app.include_router(api.router, dependencies=[Depends(require_data_store)])
+app.include_router(web.router, dependencies=[Depends(require_data_store)])
+# Sans require_data_store: le rapport reste lisible pendant et après un échec
+app.include_router(admin.router)
 
 templates = Jinja2Templates(directory=Path(__file__).parent / "templates")
 
@@ -47,16 +89,42 @@ async def http_exception_handler(
         if "application/json" in accept:
             return JSONResponse(status_code=404, content={"detail": exc.detail})
         return templates.TemplateResponse(request, "404.html", status_code=404)
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=exc.headers,
+    )
 
 
 @app.get("/health")
-async def health_check() -> dict[str, str | int]:
-    from app.services.data_loader import get_data_store
-
-    store = get_data_store()
-    return {
+async def health_check() -> dict[str, Any]:
+    health: dict[str, Any] = {
         "status": "healthy",
-        "topics_loaded": len(store.topics),
-        "categories_loaded": len(store.categories),
+        "state": data_loader.load_status.state,
+        "topics_loaded": 0,
+        "categories_loaded": 0,
     }
+    try:
+        store = data_loader.get_data_store()
+    except data_loader.StoreNotReadyError:
+        return health
+    health["topics_loaded"] = len(store.topics)
+    health["categories_loaded"] = len(store.categories)
+    if store.body_cache is not None:
+        health["body_cache"] = store.body_cache.stats()
+    return health
+
+
+@app.get("/ready")
+async def readiness_check() -> JSONResponse:
+    status = data_loader.load_status.as_dict()
+    if data_loader.load_status.state in (
+        data_loader.LoadState.LOADING,
+        data_loader.LoadState.FAILED,
+    ):
+        return JSONResponse(
+            status_code=503,
+            content=status,
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+    return JSONResponse(content=status)
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class ArchiveMonth(BaseModel):
+    year: int
+    month: int
+    topic_count: int = 0
+
+
+class ArchiveYear(BaseModel):
+    year: int
+    topic_count: int = 0
+    months: list[ArchiveMonth] = []
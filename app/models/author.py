@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class AuthorDetail(BaseModel):
+    author_id: int
+    topic_count: int = 0
+    view_count: int = Field(default=0, description="Total views of the topics")
+    post_count: int = Field(default=0, description="Total posts of the topics")
+    first_activity: datetime | None = None
+    last_activity: datetime | None = None
@@ -1,3 +1,4 @@
+from datetime import datetime
 
 from pydantic import BaseModel, Field
 
@@ -15,6 +16,15 @@ class CategorySummary(BaseModel):
     is_subcategory: bool = False
     topic_count: int = 0
     post_count: int = 0
+    total_topic_count: int = Field(
+        default=0, description="Topic count including all subcategories"
+    )
+    total_post_count: int = Field(
+        default=0, description="Post count of the topics of the whole subtree"
+    )
+    last_post: datetime | None = Field(
+        default=None, description="Latest post date in the category subtree"
+    )
 
 
 class CategoryDetail(CategorySummary):
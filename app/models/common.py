@@ -11,6 +11,8 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int = 1
     page_size: int = 20
     total_pages: int
+    # Curseur de la page suivante (pagination par clé), absent en fin de liste
+    next_cursor: str | None = None
 
 
 class ExportInfo(BaseModel):
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class TagSummary(BaseModel):
+    name: str
+    topic_count: int = 0
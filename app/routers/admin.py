@@ -0,0 +1,44 @@
+import secrets
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.config import settings
+from app.services import data_loader
+
+
+def require_admin_token(
+    authorization: Annotated[str | None, Header()] = None,
+) -> None:
+    """404 while ADMIN_TOKEN is unset, 401 unless the bearer token matches."""
+    token = settings.ADMIN_TOKEN
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, supplied = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        supplied.encode(), token.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(prefix="/api/v1/admin", dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/load-report")
+async def get_load_report() -> dict[str, Any]:
+    """Timings, file counts and skipped files of the last store load.
+
+    Served while the store is loading or after a failed load, from the store
+    being built, so that the skipped files explain the failure.
+    """
+    status = data_loader.load_status
+    store = data_loader.data_store or status.store
+    report: dict[str, Any] = {}
+    if store is not None:
+        report = store.load_report.as_dict(root=store.data_path)
+    report["status"] = status.as_dict()
+    return report
@@ -1,35 +1,118 @@
-from typing import Any
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
+from app.models.archive import ArchiveMonth, ArchiveYear
+from app.models.author import AuthorDetail
 from app.models.category import CategoryDetail, CategorySummary, CategoryTree
 from app.models.common import ExportInfo, PaginatedResponse
+from app.models.tag import TagSummary
 from app.models.topic import TopicDetail, TopicSummary
-from app.services.data_loader import get_data_store
-from app.services.search import SearchService
+from app.services.cursor import decode_cursor, encode_cursor
+from app.services.data_loader import get_data_store, topic_sort_key
+from app.services.facets import TopicFilter
+from app.services.records import Category, Topic
+from app.services.search import get_search_service
+from app.services.urls import parse_id_from_path
 
 router = APIRouter(prefix="/api/v1")
 
-_search_service: SearchService | None = None
 
+def _paginate(
+    fetch: Callable[[int, tuple[Any, ...] | None], tuple[list[Topic], int]],
+    page: int,
+    page_size: int,
+    sort_by: str,
+    order: str,
+    cursor: str | None,
+    pinned_first: bool,
+) -> PaginatedResponse[TopicSummary]:
+    """Offset (page) or keyset (cursor) page of topics, with the next cursor."""
+    if cursor is None:
+        topics, total = fetch(page_size, None)
+        has_more = page * page_size < total
+    else:
+        try:
+            after = decode_cursor(cursor, sort_by, order, pinned_first)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from None
+        # Un topic de plus pour savoir s'il reste une page
+        topics, total = fetch(page_size + 1, after)
+        has_more = len(topics) > page_size
+        topics = topics[:page_size]
+
+    next_cursor = None
+    if has_more and topics:
+        key = topic_sort_key(topics[-1], sort_by, order == "desc", pinned_first)
+        next_cursor = encode_cursor(sort_by, order, key)
+    total_pages = (total + page_size - 1) // page_size if total > 0 else 1
+
+    return PaginatedResponse(
+        items=[TopicSummary.model_validate(t, from_attributes=True) for t in topics],
+        total=total,
+        page=page,
+        page_size=page_size,
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+    )
 
-def parse_id_from_path(path: str) -> int:
-    """Extract ID from path like '20/some-slug', '20-some-slug' (legacy), or '20'."""
-    # Nouveau format: id/slug
-    if "/" in path:
-        return int(path.split("/", 1)[0])
-    # Ancien format (legacy): id-slug
-    if "-" in path:
-        return int(path.split("-", 1)[0])
-    # ID seul
-    return int(path)
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    # Les dates de l'export sont naïves (UTC)
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def topic_filter_params(
+    pinned: bool | None = Query(None),
+    locked: bool | None = Query(None),
+    deleted: bool | None = Query(None),
+    tags: Annotated[
+        list[str] | None, Query(description="Topics carrying all tags")
+    ] = None,
+    author_id: int | None = Query(None),
+    created_after: Annotated[
+        datetime | None, Query(description="Inclusive bound")
+    ] = None,
+    created_before: Annotated[
+        datetime | None, Query(description="Exclusive bound")
+    ] = None,
+) -> TopicFilter:
+    """Listing filters shared by the topic listing endpoints."""
+    return TopicFilter(
+        pinned=pinned,
+        locked=locked,
+        deleted=deleted,
+        tags=tuple(tags or ()),
+        author_id=author_id,
+        created_after=_naive_utc(created_after),
+        created_before=_naive_utc(created_before),
+    )
 
 
-def get_search_service() -> SearchService:
-    global _search_service
-    if _search_service is None:
-        _search_service = SearchService(get_data_store())
-    return _search_service
+def _category_fields(cat: Category | dict[str, Any]) -> dict[str, Any]:
+    """Summary fields of a category record (or build_category_tree node)."""
+    return {
+        "id": cat["id"],
+        "name": cat["name"],
+        "slug": cat.get("slug", ""),
+        "parent_cid": cat.get("parent_cid", 0),
+        "icon": cat.get("icon"),
+        "bgColor": cat.get("bgColor"),
+        "color": cat.get("color"),
+        "order": cat.get("order", 0),
+        "disabled": cat.get("disabled", False),
+        "is_subcategory": cat.get("is_subcategory", False),
+        # Agrégats précalculés par le DataStore
+        "topic_count": cat.get("topic_count", 0),
+        "post_count": cat.get("post_count", 0),
+        "total_topic_count": cat.get("total_topic_count", 0),
+        "total_post_count": cat.get("total_post_count", 0),
+        "last_post": cat.get("last_post"),
+    }
 
 
 @router.get("/info", response_model=ExportInfo)
@@ -48,23 +131,7 @@ async def get_info() -> ExportInfo:
 async def list_root_categories() -> list[CategorySummary]:
     store = get_data_store()
     categories = store.get_root_categories()
-    return [
-        CategorySummary(
-            id=c["id"],
-            name=c["name"],
-            slug=c.get("slug", ""),
-            parent_cid=c.get("parent_cid", 0),
-            icon=c.get("icon"),
-            bgColor=c.get("bgColor"),
-            color=c.get("color"),
-            order=c.get("order", 0),
-            disabled=c.get("disabled", False),
-            is_subcategory=c.get("is_subcategory", False),
-            topic_count=len(store.category_topics.get(c["id"], [])),
-            post_count=c.get("postcount", 0),
-        )
-        for c in categories
-    ]
+    return [CategorySummary(**_category_fields(c)) for c in categories]
 
 
 @router.get("/categories/tree", response_model=list[CategoryTree])
@@ -73,18 +140,7 @@ async def get_category_tree() -> list[CategoryTree]:
 
     def build_tree(cat_data: dict[str, Any]) -> CategoryTree:
         return CategoryTree(
-            id=cat_data["id"],
-            name=cat_data["name"],
-            slug=cat_data.get("slug", ""),
-            parent_cid=cat_data.get("parent_cid", 0),
-            icon=cat_data.get("icon"),
-            bgColor=cat_data.get("bgColor"),
-            color=cat_data.get("color"),
-            order=cat_data.get("order", 0),
-            disabled=cat_data.get("disabled", False),
-            is_subcategory=cat_data.get("is_subcategory", False),
-            topic_count=len(store.category_topics.get(cat_data["id"], [])),
-            post_count=cat_data.get("postcount", 0),
+            **_category_fields(cat_data),
             children=[build_tree(child) for child in cat_data.get("children", [])],
         )
 
@@ -98,10 +154,15 @@ async def get_category_tree() -> list[CategoryTree]:
 )
 async def list_category_topics(
     category_path: str,
+    topic_filter: Annotated[TopicFilter, Depends(topic_filter_params)],
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     sort_by: str = Query("created", pattern="^(created|last_post|view_count|rating)$"),
     order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None),
+    include_descendants: bool = Query(
+        False, description="Also list the topics of all subcategories"
+    ),
 ) -> PaginatedResponse[TopicSummary]:
     try:
         category_id = parse_id_from_path(category_path)
@@ -112,36 +173,19 @@ async def list_category_topics(
     if category_id not in store.categories:
         raise HTTPException(status_code=404, detail="Category not found")
 
-    topics, total = store.get_category_topics(
-        category_id, page, page_size, sort_by, order
-    )
-    total_pages = (total + page_size - 1) // page_size if total > 0 else 1
+    def fetch(limit: int, after: tuple[Any, ...] | None) -> tuple[list[Topic], int]:
+        return store.get_category_topics(
+            category_id,
+            page,
+            limit,
+            sort_by,
+            order,
+            after,
+            topic_filter,
+            include_descendants,
+        )
 
-    return PaginatedResponse(
-        items=[
-            TopicSummary(
-                topic_id=t["topic_id"],
-                title=t["title"],
-                author_id=t["author_id"],
-                category_id=t["category_id"],
-                created=t["created"],
-                deleted=t.get("deleted", False),
-                locked=t.get("locked", False),
-                pinned=t.get("pinned", False),
-                post_count=t.get("post_count", 0),
-                rating=t.get("rating", 0),
-                view_count=t.get("view_count", 0),
-                tags=t.get("tags", []),
-                last_post=t.get("last_post"),
-                slug=t.get("slug", ""),
-            )
-            for t in topics
-        ],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-    )
+    return _paginate(fetch, page, page_size, sort_by, order, cursor, True)
 
 
 @router.get("/categories/{category_path:path}", response_model=CategoryDetail)
@@ -159,74 +203,26 @@ async def get_category(category_path: str) -> CategoryDetail:
     subcategories = store.get_subcategories(category_id)
 
     return CategoryDetail(
-        id=cat["id"],
-        name=cat["name"],
-        slug=cat.get("slug", ""),
-        parent_cid=cat.get("parent_cid", 0),
-        icon=cat.get("icon"),
-        bgColor=cat.get("bgColor"),
-        color=cat.get("color"),
-        order=cat.get("order", 0),
-        disabled=cat.get("disabled", False),
-        is_subcategory=cat.get("is_subcategory", False),
-        topic_count=len(store.category_topics.get(cat["id"], [])),
-        post_count=cat.get("postcount", 0),
-        subcategories=[
-            CategorySummary(
-                id=s["id"],
-                name=s["name"],
-                slug=s.get("slug", ""),
-                parent_cid=s.get("parent_cid", 0),
-                icon=s.get("icon"),
-                bgColor=s.get("bgColor"),
-                color=s.get("color"),
-                order=s.get("order", 0),
-                disabled=s.get("disabled", False),
-                is_subcategory=s.get("is_subcategory", False),
-                topic_count=len(store.category_topics.get(s["id"], [])),
-                post_count=s.get("postcount", 0),
-            )
-            for s in subcategories
-        ],
+        **_category_fields(cat),
+        subcategories=[CategorySummary(**_category_fields(s)) for s in subcategories],
     )
 
 
 @router.get("/topics", response_model=PaginatedResponse[TopicSummary])
 async def list_all_topics(
+    topic_filter: Annotated[TopicFilter, Depends(topic_filter_params)],
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     sort_by: str = Query("created", pattern="^(created|last_post|view_count|rating)$"),
     order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None),
 ) -> PaginatedResponse[TopicSummary]:
     store = get_data_store()
-    topics, total = store.get_all_topics(page, page_size, sort_by, order)
-    total_pages = (total + page_size - 1) // page_size if total > 0 else 1
 
-    return PaginatedResponse(
-        items=[
-            TopicSummary(
-                topic_id=t["topic_id"],
-                title=t["title"],
-                author_id=t["author_id"],
-                category_id=t["category_id"],
-                created=t["created"],
-                deleted=t.get("deleted", False),
-                locked=t.get("locked", False),
-                pinned=t.get("pinned", False),
-                post_count=t.get("post_count", 0),
-                rating=t.get("rating", 0),
-                view_count=t.get("view_count", 0),
-                tags=t.get("tags", []),
-                last_post=t.get("last_post"),
-                slug=t.get("slug", ""),
-            )
-            for t in topics
-        ],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-    )
+    def fetch(limit: int, after: tuple[Any, ...] | None) -> tuple[list[Topic], int]:
+        return store.get_all_topics(page, limit, sort_by, order, after, topic_filter)
+
+    return _paginate(fetch, page, page_size, sort_by, order, cursor, False)
 
 
 @router.get("/topics/{topic_path:path}", response_model=TopicDetail)
@@ -241,24 +237,95 @@ async def get_topic(topic_path: str) -> TopicDetail:
     if not topic:
         raise HTTPException(status_code=404, detail="Topic not found")
 
-    return TopicDetail(
-        topic_id=topic["topic_id"],
-        title=topic["title"],
-        author_id=topic["author_id"],
-        category_id=topic["category_id"],
-        created=topic["created"],
-        deleted=topic.get("deleted", False),
-        locked=topic.get("locked", False),
-        pinned=topic.get("pinned", False),
-        post_count=topic.get("post_count", 0),
-        rating=topic.get("rating", 0),
-        view_count=topic.get("view_count", 0),
-        tags=topic.get("tags", []),
-        last_post=topic.get("last_post"),
-        slug=topic.get("slug", ""),
-        content=topic.get("content", ""),
-        content_html=topic.get("content_html", ""),
-    )
+    return TopicDetail.model_validate(topic, from_attributes=True)
+
+
+@router.get("/tags", response_model=list[TagSummary])
+async def list_tags() -> list[TagSummary]:
+    store = get_data_store()
+    return [TagSummary(name=tag, topic_count=count) for tag, count in store.tag_counts]
+
+
+@router.get("/tags/{tag}/topics", response_model=PaginatedResponse[TopicSummary])
+async def list_tag_topics(
+    tag: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    sort_by: str = Query("created", pattern="^(created|last_post|view_count|rating)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None),
+) -> PaginatedResponse[TopicSummary]:
+    store = get_data_store()
+    if tag not in store.tag_topics:
+        raise HTTPException(status_code=404, detail="Tag not found")
+
+    def fetch(limit: int, after: tuple[Any, ...] | None) -> tuple[list[Topic], int]:
+        return store.get_tag_topics(tag, page, limit, sort_by, order, after)
+
+    return _paginate(fetch, page, page_size, sort_by, order, cursor, False)
+
+
+@router.get("/authors/{author_id}", response_model=AuthorDetail)
+async def get_author(author_id: int) -> AuthorDetail:
+    store = get_data_store()
+    stats = store.author_stats.get(author_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Author not found")
+    return AuthorDetail.model_validate(stats, from_attributes=True)
+
+
+@router.get(
+    "/authors/{author_id}/topics", response_model=PaginatedResponse[TopicSummary]
+)
+async def list_author_topics(
+    author_id: int,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    sort_by: str = Query("created", pattern="^(created|last_post|view_count|rating)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None),
+) -> PaginatedResponse[TopicSummary]:
+    store = get_data_store()
+    if author_id not in store.author_stats:
+        raise HTTPException(status_code=404, detail="Author not found")
+
+    def fetch(limit: int, after: tuple[Any, ...] | None) -> tuple[list[Topic], int]:
+        return store.get_author_topics(author_id, page, limit, sort_by, order, after)
+
+    return _paginate(fetch, page, page_size, sort_by, order, cursor, False)
+
+
+@router.get("/archive", response_model=list[ArchiveYear])
+async def get_archive() -> list[ArchiveYear]:
+    """Topic counts per year and month of creation, most recent year first."""
+    store = get_data_store()
+    years: dict[int, ArchiveYear] = {}
+    for (year, month), (start, stop) in store.archive.items():
+        bucket = years.setdefault(year, ArchiveYear(year=year))
+        bucket.months.append(
+            ArchiveMonth(year=year, month=month, topic_count=stop - start)
+        )
+        bucket.topic_count += stop - start
+    return list(reversed(years.values()))
+
+
+@router.get("/archive/{year}/{month}", response_model=PaginatedResponse[TopicSummary])
+async def list_archive_topics(
+    year: int,
+    month: int,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None),
+) -> PaginatedResponse[TopicSummary]:
+    store = get_data_store()
+    if (year, month) not in store.archive:
+        raise HTTPException(status_code=404, detail="No topics in this month")
+
+    def fetch(limit: int, after: tuple[Any, ...] | None) -> tuple[list[Topic], int]:
+        return store.get_archive_topics(year, month, page, limit, order, after)
+
+    return _paginate(fetch, page, page_size, "created", order, cursor, False)
 
 
 @router.get("/search", response_model=list[TopicSummary])
@@ -269,22 +336,4 @@ async def search_topics(
     search_service = get_search_service()
     results = search_service.search(q, limit)
 
-    return [
-        TopicSummary(
-            topic_id=t["topic_id"],
-            title=t["title"],
-            author_id=t["author_id"],
-            category_id=t["category_id"],
-            created=t["created"],
-            deleted=t.get("deleted", False),
-            locked=t.get("locked", False),
-            pinned=t.get("pinned", False),
-            post_count=t.get("post_count", 0),
-            rating=t.get("rating", 0),
-            view_count=t.get("view_count", 0),
-            tags=t.get("tags", []),
-            last_post=t.get("last_post"),
-            slug=t.get("slug", ""),
-        )
-        for t in results
-    ]
+    return [TopicSummary.model_validate(t, from_attributes=True) for t in results]
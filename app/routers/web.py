@@ -1,57 +1,37 @@
 from pathlib import Path
-from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
 
 from app.services.data_loader import get_data_store
-from app.services.search import SearchService
+from app.services.records import Category
+from app.services.search import get_search_service
+from app.services.urls import resolve_path
 
 router = APIRouter()
 templates = Jinja2Templates(directory=Path(__file__).parent.parent / "templates")
 
-_search_service: SearchService | None = None
+MONTH_NAMES = (
+    "janvier",
+    "février",
+    "mars",
+    "avril",
+    "mai",
+    "juin",
+    "juillet",
+    "août",
+    "septembre",
+    "octobre",
+    "novembre",
+    "décembre",
+)
 
 
-def parse_id_from_path(path: str) -> int:
-    """Extract ID from path like '20/some-slug', '20-some-slug' (legacy), or '20'."""
-    # Nouveau format: id/slug
-    if "/" in path:
-        return int(path.split("/", 1)[0])
-    # Ancien format (legacy): id-slug
-    if "-" in path:
-        return int(path.split("-", 1)[0])
-    # ID seul
-    return int(path)
-
-
-def get_category_url_slug(category: dict[str, Any]) -> str:
-    """Get URL path for category: {id}/{slug} (NodeBB format)."""
-    cat_id = category["id"]
-    slug = category.get("slug", "")
-    # Le slug peut contenir un chemin (ex: "parent/child"), on prend la derniere partie
-    slug_part = slug.split("/")[-1] if "/" in slug else slug
-    return f"{cat_id}/{slug_part}" if slug_part else str(cat_id)
-
-
-def get_topic_url_slug(topic: dict[str, Any]) -> str:
-    """Get URL path for topic: {id}/{title-slug} (NodeBB format)."""
-    topic_id = topic["topic_id"]
-    slug = topic.get("slug", "")
-    if slug:
-        # slug contient "{id}-{title}", on extrait juste le titre
-        parts = slug.split("-", 1)
-        title_slug = parts[1] if len(parts) > 1 else ""
-        return f"{topic_id}/{title_slug}" if title_slug else str(topic_id)
-    return str(topic_id)
-
-
-def get_search_service() -> SearchService:
-    global _search_service
-    if _search_service is None:
-        _search_service = SearchService(get_data_store())
-    return _search_service
+def _breadcrumbs(category: Category) -> list[Category]:
+    """Precomputed ancestor chain of a category, followed by the category."""
+    categories = get_data_store().categories
+    return [categories[cid] for cid in category.ancestors] + [category]
 
 
 @router.get("/", response_class=HTMLResponse)
@@ -64,7 +44,6 @@ async def home(request: Request) -> Response:
             "request": request,
             "categories": category_tree,
             "export_info": store.export_info,
-            "get_category_url_slug": get_category_url_slug,
         },
     )
 
@@ -75,40 +54,27 @@ async def category_page(
     category_path: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    include_descendants: bool = Query(False),
 ) -> Response:
+    store = get_data_store()
     try:
-        category_id = parse_id_from_path(category_path)
-    except (ValueError, IndexError):
+        category, canonical_path = resolve_path(category_path, store.get_category)
+    except LookupError:
         raise HTTPException(status_code=404, detail="Category not found") from None
 
-    store = get_data_store()
-    category = store.get_category(category_id)
-    if not category:
-        raise HTTPException(status_code=404, detail="Category not found")
-
-    canonical_path = get_category_url_slug(category)
-    if category_path != canonical_path:
+    if canonical_path is not None:
         query = str(request.query_params)
         url = f"/category/{canonical_path}"
         if query:
             url += f"?{query}"
         return RedirectResponse(url=url, status_code=301)
 
-    topics, total = store.get_category_topics(category_id, page, page_size)
-    subcategories = store.get_subcategories(category_id)
-    for sub in subcategories:
-        sub["topic_count"] = len(store.category_topics.get(sub["id"], []))
+    topics, total = store.get_category_topics(
+        category.id, page, page_size, include_descendants=include_descendants
+    )
+    subcategories = store.get_subcategories(category.id)
     total_pages = (total + page_size - 1) // page_size if total > 0 else 1
 
-    breadcrumbs: list[dict[str, Any]] = []
-    current_cat: dict[str, Any] | None = category
-    while current_cat:
-        breadcrumbs.insert(0, current_cat)
-        parent_cid = current_cat.get("parent_cid", 0)
-        if parent_cid == 0:
-            break
-        current_cat = store.get_category(parent_cid)
-
     return templates.TemplateResponse(
         "category.html",
         {
@@ -120,9 +86,8 @@ async def category_page(
             "page_size": page_size,
             "total": total,
             "total_pages": total_pages,
-            "breadcrumbs": breadcrumbs,
-            "get_category_url_slug": get_category_url_slug,
-            "get_topic_url_slug": get_topic_url_slug,
+            "include_descendants": include_descendants,
+            "breadcrumbs": _breadcrumbs(category),
         },
     )
 
@@ -132,41 +97,108 @@ async def topic_page(
     request: Request,
     topic_path: str,
 ) -> Response:
+    store = get_data_store()
     try:
-        topic_id = parse_id_from_path(topic_path)
-    except (ValueError, IndexError):
+        topic, canonical_path = resolve_path(topic_path, store.get_topic)
+    except LookupError:
         raise HTTPException(status_code=404, detail="Topic not found") from None
 
-    store = get_data_store()
-    topic = store.get_topic(topic_id)
-    if not topic:
-        raise HTTPException(status_code=404, detail="Topic not found")
-
-    canonical_path = get_topic_url_slug(topic)
-    if topic_path != canonical_path:
+    if canonical_path is not None:
         return RedirectResponse(url=f"/topic/{canonical_path}", status_code=301)
 
-    category_id = topic.get("category_id")
+    category_id = topic.category_id
     category = store.get_category(category_id) if category_id is not None else None
 
-    breadcrumbs: list[dict[str, Any]] = []
-    current_cat: dict[str, Any] | None = category
-    while current_cat:
-        breadcrumbs.insert(0, current_cat)
-        parent_cid = current_cat.get("parent_cid", 0)
-        if parent_cid == 0:
-            break
-        current_cat = store.get_category(parent_cid)
-
     return templates.TemplateResponse(
         "topic.html",
         {
             "request": request,
             "topic": topic,
             "category": category,
-            "breadcrumbs": breadcrumbs,
-            "get_category_url_slug": get_category_url_slug,
-            "get_topic_url_slug": get_topic_url_slug,
+            "breadcrumbs": _breadcrumbs(category) if category else [],
+        },
+    )
+
+
+@router.get("/tag/{tag}", response_class=HTMLResponse)
+async def tag_page(
+    request: Request,
+    tag: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+) -> Response:
+    store = get_data_store()
+    if tag not in store.tag_topics:
+        raise HTTPException(status_code=404, detail="Tag not found")
+
+    topics, total = store.get_tag_topics(tag, page, page_size)
+    total_pages = (total + page_size - 1) // page_size if total > 0 else 1
+
+    return templates.TemplateResponse(
+        "tag.html",
+        {
+            "request": request,
+            "tag": tag,
+            "topics": topics,
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "total_pages": total_pages,
+        },
+    )
+
+
+@router.get("/archive", response_class=HTMLResponse)
+async def archive_index(request: Request) -> Response:
+    store = get_data_store()
+    years: dict[int, list[tuple[int, int]]] = {}
+    for (year, month), (start, stop) in store.archive.items():
+        years.setdefault(year, []).append((month, stop - start))
+
+    return templates.TemplateResponse(
+        "archive.html",
+        {
+            "request": request,
+            # Années les plus récentes d'abord, mois dans l'ordre du calendrier
+            "years": list(reversed(years.items())),
+            "month_names": MONTH_NAMES,
+        },
+    )
+
+
+@router.get("/archive/{year}/{month}", response_class=HTMLResponse)
+async def archive_month_page(
+    request: Request,
+    year: int,
+    month: int,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+) -> Response:
+    store = get_data_store()
+    if (year, month) not in store.archive:
+        raise HTTPException(status_code=404, detail="No topics in this month")
+
+    topics, total = store.get_archive_topics(year, month, page, page_size, "asc")
+    total_pages = (total + page_size - 1) // page_size if total > 0 else 1
+    # Mois voisins non vides, pour la navigation chronologique
+    months = list(store.archive)
+    index = months.index((year, month))
+
+    return templates.TemplateResponse(
+        "archive_month.html",
+        {
+            "request": request,
+            "year": year,
+            "month": month,
+            "month_name": MONTH_NAMES[month - 1],
+            "previous": months[index - 1] if index > 0 else None,
+            "next": months[index + 1] if index + 1 < len(months) else None,
+            "month_names": MONTH_NAMES,
+            "topics": topics,
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "total_pages": total_pages,
         },
     )
 
@@ -188,6 +220,5 @@ async def search_page(
             "query": q,
             "results": results,
             "total": len(results),
-            "get_topic_url_slug": get_topic_url_slug,
         },
     )
@@ -0,0 +1,197 @@
+"""Preforking server: load the data once, then fork uvicorn workers.
+
+    python -m app.server --workers 4
+
+The master process loads the DataStore and the search index, freezes the
+heap and forks the workers, which share the loaded pages copy-on-write.
+SIGHUP replaces the workers one by one without reloading the data; SIGTERM
+or SIGINT stops them all. Workers that crash are restarted with an exponential
+backoff; the master gives up if they keep crashing.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from collections import deque
+from types import FrameType
+
+import uvicorn
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Signaux gérés par le maître, remis par défaut dans les workers
+_MASTER_SIGNALS = (signal.SIGHUP, signal.SIGTERM, signal.SIGINT)
+# Délai avant de relancer un worker tombé en erreur, doublé à chaque échec
+RESTART_BACKOFF = 0.5
+RESTART_BACKOFF_MAX = 30.0
+# Au-delà de MAX_RESTARTS relances en RESTART_WINDOW secondes, le maître s'arrête
+MAX_RESTARTS = 10
+RESTART_WINDOW = 60.0
+
+
+def preload() -> None:
+    """Load the store and build the search index before forking."""
+    from app.services.data_loader import init_data_store
+    from app.services.search import get_search_service
+
+    init_data_store()
+    # Index de recherche construit avant le fork, partagé par les workers
+    get_search_service()
+
+    # Objets du chargement exclus du GC: ses passes ne recopient pas les pages
+    gc.collect()
+    gc.freeze()
+
+
+class PreforkServer:
+    def __init__(self, config: uvicorn.Config, workers: int) -> None:
+        self.config = config
+        self.workers = workers
+        # pid 0: worker tombé, relancé à l'heure de _respawn_at
+        self.pids: list[int] = []
+        self._respawn_at: dict[int, float] = {}
+        self._restarts: deque[float] = deque()
+        self._failures = 0
+        self._reload = False
+        self._stop = False
+        self.exit_code = 0
+
+    def run(self) -> int:
+        """Serve until stopped; the exit code is 1 if the workers kept crashing."""
+        preload()
+        sock = self.config.bind_socket()
+        for sig in _MASTER_SIGNALS:
+            signal.signal(sig, self._handle_signal)
+
+        for _ in range(self.workers):
+            self.pids.append(self._spawn(sock))
+        logger.info("Started %d workers: %s", self.workers, self.pids)
+
+        while not self._stop:
+            if self._reload:
+                self._reload = False
+                self._rolling_restart(sock)
+            self._reap(sock)
+            time.sleep(0.2)
+
+        for pid in self.pids:
+            if pid:
+                self._terminate(pid)
+        sock.close()
+        return self.exit_code
+
+    def _handle_signal(self, signum: int, frame: FrameType | None) -> None:
+        if signum == signal.SIGHUP:
+            self._reload = True
+        else:
+            self._stop = True
+
+    def _spawn(self, sock: socket.socket) -> int:
+        pid = os.fork()
+        if pid != 0:
+            return pid
+
+        for sig in _MASTER_SIGNALS:
+            signal.signal(sig, signal.SIG_DFL)
+        # Code de sortie non nul si le worker n'a pas démarré ou a levé une erreur
+        code = 1
+        try:
+            server = uvicorn.Server(self.config)
+            server.run(sockets=[sock])
+            code = 0 if server.started else 1
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+        finally:
+            os._exit(code)
+
+    def _rolling_restart(self, sock: socket.socket) -> None:
+        """Start each replacement before stopping the worker it replaces."""
+        for i, old_pid in enumerate(list(self.pids)):
+            self._respawn_at.pop(i, None)
+            self.pids[i] = self._spawn(sock)
+            if old_pid:
+                self._terminate(old_pid)
+        logger.info("Workers restarted: %s", self.pids)
+
+    def _terminate(self, pid: int) -> None:
+        try:
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+        except (ChildProcessError, ProcessLookupError):
+            pass
+
+    def _reap(self, sock: socket.socket) -> None:
+        """Replace workers that exited on their own, throttling crash loops."""
+        now = time.monotonic()
+        for i, pid in enumerate(self.pids):
+            if not pid:
+                if now >= self._respawn_at[i]:
+                    del self._respawn_at[i]
+                    self._restart(i, sock, now)
+                continue
+            try:
+                done, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done, status = pid, 0
+            if not done:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if code == 0:
+                logger.warning("Worker %d exited, restarting it", pid)
+                self._restart(i, sock, now)
+                continue
+            # Échecs anciens oubliés: seule une série rapprochée allonge le délai
+            if self._restarts and now - self._restarts[-1] > RESTART_WINDOW:
+                self._failures = 0
+            self._failures += 1
+            delay = min(
+                RESTART_BACKOFF * 2 ** (self._failures - 1), RESTART_BACKOFF_MAX
+            )
+            logger.error(
+                "Worker %d exited with code %d, restarting it in %.1fs",
+                pid,
+                code,
+                delay,
+            )
+            self.pids[i] = 0
+            self._respawn_at[i] = now + delay
+
+    def _restart(self, i: int, sock: socket.socket, now: float) -> None:
+        while self._restarts and now - self._restarts[0] > RESTART_WINDOW:
+            self._restarts.popleft()
+        if len(self._restarts) >= MAX_RESTARTS:
+            logger.error(
+                "Workers restarted %d times in %.0fs, stopping the server",
+                len(self._restarts),
+                RESTART_WINDOW,
+            )
+            self._stop = True
+            self.exit_code = 1
+            return
+        self._restarts.append(now)
+        self.pids[i] = self._spawn(sock)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Preforking VEAF Community server")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=settings.WORKERS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    from app.main import app
+
+    config = uvicorn.Config(app, host=args.host, port=args.port)
+    sys.exit(PreforkServer(config, args.workers).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import sys
+from collections import OrderedDict
+
+
+class BodyCache:
+    """LRU of rendered topic bodies bounded by an approximate byte budget."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[int, tuple[str, str, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, topic_id: int) -> tuple[str, str] | None:
+        entry = self._entries.get(topic_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(topic_id)
+        return entry[0], entry[1]
+
+    def put(self, topic_id: int, content: str, content_html: str) -> None:
+        self.discard(topic_id)
+        size = sys.getsizeof(content) + sys.getsizeof(content_html)
+        if size > self.max_bytes:
+            return
+        self._entries[topic_id] = (content, content_html, size)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.size_bytes -= evicted_size
+            self.evictions += 1
+
+    def discard(self, topic_id: int) -> None:
+        entry = self._entries.pop(topic_id, None)
+        if entry is not None:
+            self.size_bytes -= entry[2]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,67 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+# Type des valeurs de tri: dates (naïves) ou compteurs entiers
+DATE_FIELDS = ("created", "last_post")
+COUNT_FIELDS = ("view_count", "rating")
+
+
+def encode_cursor(sort_by: str, order: str, key: tuple[Any, ...]) -> str:
+    """Opaque token for the sort key of the last topic of a page."""
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in key]
+    payload = json.dumps([sort_by, order, values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    token: str, sort_by: str, order: str, pinned_first: bool = False
+) -> tuple[Any, ...]:
+    """Sort key encoded in a cursor; ValueError if invalid or for another sort.
+
+    The key must have the shape of topic_sort_key for the same sort, order and
+    ``pinned_first``, so that it compares with the keys of the listing.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        cursor_sort, cursor_order, values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+    if (cursor_sort, cursor_order) != (sort_by, order) or not isinstance(values, list):
+        raise ValueError("Cursor does not match the requested sort")
+
+    # Clé: ([épinglé,] présence, valeur, topic_id), dates en ISO 8601
+    if len(values) != (4 if pinned_first else 3):
+        raise ValueError("Invalid cursor")
+    *flags, value, topic_id = values
+    if not all(isinstance(flag, bool) for flag in flags):
+        raise ValueError("Invalid cursor")
+    if isinstance(topic_id, bool) or not isinstance(topic_id, int):
+        raise ValueError("Invalid cursor")
+    # Drapeau de présence cohérent avec la valeur (voir topic_sort_key)
+    if flags[-1] != ((value is not None) if order == "desc" else (value is None)):
+        raise ValueError("Invalid cursor")
+    if value is not None:
+        values[-2] = _decode_value(value, sort_by)
+    return tuple(values)
+
+
+def _decode_value(value: Any, sort_by: str) -> Any:
+    if sort_by in DATE_FIELDS:
+        if not isinstance(value, str):
+            raise ValueError("Invalid cursor")
+        try:
+            decoded = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError("Invalid cursor") from None
+        # Les dates de l'export sont naïves: une date avec fuseau ne se compare pas
+        if decoded.tzinfo is not None:
+            raise ValueError("Invalid cursor")
+        return decoded
+    if sort_by in COUNT_FIELDS:
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError("Invalid cursor")
+        return value
+    raise ValueError(f"Unsupported sort field: {sort_by}")
@@ -1,13 +1,45 @@
+import logging
+import multiprocessing
+import os
 import re
+import threading
+import time
+import weakref
+from bisect import bisect_left, bisect_right, insort
+from collections import ChainMap
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime
+from enum import StrEnum
+from functools import partial
+from heapq import merge
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
-import frontmatter
 import markdown
-import yaml
 
 from app.config import settings
+from app.services.body_cache import BodyCache
+from app.services.facets import FacetIndex, TopicFilter
+from app.services.fast_yaml import (
+    load_yaml,
+    parse_frontmatter,
+    parse_simple_mapping,
+    read_frontmatter,
+)
+from app.services.load_report import FileStats, LoadReport
+from app.services.records import AuthorStats, Category, Topic
+from app.services.scanner import (
+    DataManifest,
+    FileKind,
+    classify_file,
+    scan_data_tree,
+)
+from app.services.snapshot import load_snapshot, snapshot_file, write_snapshot
+
+logger = logging.getLogger(__name__)
 
 
 def parse_datetime(value: Any) -> datetime | None:
@@ -32,124 +64,882 @@ def parse_datetime(value: Any) -> datetime | None:
     return None
 
 
+def create_markdown() -> markdown.Markdown:
+    return markdown.Markdown(extensions=["tables", "fenced_code", "nl2br"])
+
+
+def render_topic_html(md: markdown.Markdown, content: str, title: str) -> str:
+    """Render topic markdown, dropping a leading h1 that repeats the title."""
+    md.reset()
+    content_html = md.convert(content)
+    # Supprimer le premier h1 s'il correspond au titre (évite duplication)
+    if title and content_html.lstrip()[:4].lower() == "<h1>":
+        content_html = re.sub(
+            rf"^\s*<h1>{re.escape(title)}</h1>\s*",
+            "",
+            content_html,
+            flags=re.IGNORECASE,
+        )
+    return content_html
+
+
+def _read_source(path: Path) -> tuple[str, int]:
+    """Text of a source file and its size in bytes."""
+    with open(path, encoding="utf-8") as f:
+        return f.read(), os.fstat(f.fileno()).st_size
+
+
+def parse_category_file(
+    cat_file: Path, stats: FileStats | None = None
+) -> Category | None:
+    """Parse a _category.yml file, returning None when it has no id."""
+    text, size = _read_source(cat_file)
+    start = time.perf_counter()
+    cat_data = parse_simple_mapping(text)
+    if cat_data is None:
+        cat_data = load_yaml(text)
+    if stats is not None:
+        stats.record(cat_file, size, time.perf_counter() - start, 0.0)
+    if not cat_data or "id" not in cat_data:
+        return None
+    return Category.from_metadata(cat_data, path=str(cat_file.parent))
+
+
+def parse_topic_file(
+    md_file: Path,
+    md: markdown.Markdown,
+    with_body: bool = True,
+    stats: FileStats | None = None,
+) -> Topic | None:
+    """Parse a topic file, returning None when it has no topic_id.
+
+    With with_body=False only the metadata is kept and markdown is not rendered.
+    """
+    text, size = _read_source(md_file)
+    start = time.perf_counter()
+    topic_data, content = parse_frontmatter(text)
+    parsed = time.perf_counter()
+
+    content_html = None
+    if with_body and "topic_id" in topic_data:
+        content_html = render_topic_html(md, content, topic_data.get("title", ""))
+    if stats is not None:
+        stats.record(md_file, size, parsed - start, time.perf_counter() - parsed)
+    if "topic_id" not in topic_data:
+        return None
+    return Topic.from_metadata(
+        topic_data,
+        created=parse_datetime(topic_data.get("created")),
+        last_post=parse_datetime(topic_data.get("last_post")),
+        slug=md_file.stem,
+        path=str(md_file),
+        content=content if with_body else None,
+        content_html=content_html,
+    )
+
+
+TopicListener = Callable[[Topic | None, Topic | None], None]
+K = TypeVar("K", int, str)
+
+_worker_md: markdown.Markdown | None = None
+
+
+def load_topic_body(md_file: Path, md: markdown.Markdown) -> tuple[str, str]:
+    """Read a topic body back from its source file: (content, content_html)."""
+    metadata, content = read_frontmatter(md_file)
+    return content, render_topic_html(md, content, metadata.get("title", ""))
+
+
+def _parse_topic_batch(
+    md_files: list[Path],
+    md: markdown.Markdown | None = None,
+    with_body: bool = True,
+) -> tuple[list[Topic], FileStats]:
+    """Parse a batch of topic files, in order, skipping unreadable ones.
+
+    Skipped files and per-file timings are returned in the batch FileStats.
+
+    Also used as the process pool task: each worker process then keeps its
+    own Markdown instance between batches.
+    """
+    global _worker_md
+    if md is None:
+        if _worker_md is None:
+            _worker_md = create_markdown()
+        md = _worker_md
+
+    parsed = []
+    stats = FileStats()
+    for md_file in md_files:
+        try:
+            topic_data = parse_topic_file(md_file, md, with_body, stats)
+        except Exception as exc:
+            stats.skip(md_file, exc)
+            continue
+        if topic_data is None:
+            stats.skip(md_file, "no topic_id in frontmatter")
+        else:
+            parsed.append(topic_data)
+    return parsed, stats
+
+
+# Taille des lots du chargement série
+SERIAL_BATCH_SIZE = 256
+
+# Tris proposés pour les listes de topics (index précalculés)
+SORT_FIELDS = ("created", "last_post", "view_count", "rating")
+SORT_ORDERS = ("asc", "desc")
+# Coût relatif (par topic) du tri d'une liste filtrée et de son parcours dans
+# le tri précalculé, pour choisir entre les deux
+FILTER_SCAN_RATIO = 2
+
+
+def topic_sort_key(
+    topic: Topic, sort_by: str, descending: bool, pinned_first: bool = False
+) -> tuple[Any, ...]:
+    """Sort key giving a total order: missing values last, ties by topic_id.
+
+    Descending orders sort this key with reverse=True.
+    """
+    value = getattr(topic, sort_by)
+    if descending:
+        key: tuple[Any, ...] = (value is not None, value, topic.topic_id)
+        return (topic.pinned, *key) if pinned_first else key
+    key = (value is None, value, topic.topic_id)
+    return (not topic.pinned, *key) if pinned_first else key
+
+
+class _Descending:
+    """Reverses comparisons, to bisect lists sorted with reverse=True."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: tuple[Any, ...]) -> None:
+        self.key = key
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.key < self.key
+
+
+def seek_after(
+    topic_ids: list[int],
+    topics: Mapping[int, Topic],
+    after: tuple[Any, ...],
+    sort_by: str,
+    order: str,
+    pinned_first: bool = False,
+    lo: int = 0,
+    hi: int | None = None,
+) -> int:
+    """Position following the sort key ``after`` in an ordering (keyset paging).
+
+    ``lo`` and ``hi`` restrict the search to a slice of the ordering.
+    """
+    return _bisect_key(
+        bisect_right, topic_ids, topics, after, sort_by, order, pinned_first, lo, hi
+    )
+
+
+def _bisect_key(
+    bisect: Callable[..., int],
+    topic_ids: list[int],
+    topics: Mapping[int, Topic],
+    key: tuple[Any, ...],
+    sort_by: str,
+    order: str,
+    pinned_first: bool,
+    lo: int = 0,
+    hi: int | None = None,
+) -> int:
+    descending = order == "desc"
+
+    def topic_key(tid: int) -> tuple[Any, ...]:
+        return topic_sort_key(topics[tid], sort_by, descending, pinned_first)
+
+    if descending:
+        return bisect(
+            topic_ids,
+            _Descending(key),
+            lo,
+            hi,
+            key=lambda tid: _Descending(topic_key(tid)),
+        )
+    return bisect(topic_ids, key, lo, hi, key=topic_key)
+
+
+def insert_ordered(
+    topic_ids: list[int],
+    topics: Mapping[int, Topic],
+    topic: Topic,
+    sort_by: str,
+    order: str,
+) -> int:
+    """Insert a topic at its place in an ordering of ``topics``; its index."""
+    key = topic_sort_key(topic, sort_by, order == "desc")
+    position = _bisect_key(bisect_left, topic_ids, topics, key, sort_by, order, False)
+    topic_ids.insert(position, topic.topic_id)
+    return position
+
+
+def remove_ordered(
+    topic_ids: list[int],
+    topics: Mapping[int, Topic],
+    topic: Topic,
+    sort_by: str,
+    order: str,
+) -> int:
+    """Remove a topic from an ordering, ``topics`` mapping its id to ``topic``.
+
+    Returns the index the topic had in the ordering.
+    """
+    key = topic_sort_key(topic, sort_by, order == "desc")
+    position = _bisect_key(bisect_left, topic_ids, topics, key, sort_by, order, False)
+    if position == len(topic_ids) or topic_ids[position] != topic.topic_id:
+        raise ValueError(f"Topic {topic.topic_id} is not in the ordering")
+    del topic_ids[position]
+    return position
+
+
+def sort_topic_ids(
+    topic_ids: Iterable[int],
+    topics: Mapping[int, Topic],
+    sort_by: str,
+    order: str,
+    pinned_first: bool = False,
+) -> list[int]:
+    descending = order == "desc"
+    return sorted(
+        topic_ids,
+        key=lambda tid: topic_sort_key(topics[tid], sort_by, descending, pinned_first),
+        reverse=descending,
+    )
+
+
+def _author_key(topic: Topic | None) -> tuple[int, ...]:
+    if topic is None or topic.author_id is None:
+        return ()
+    return (topic.author_id,)
+
+
+def _move_in_index(
+    index: dict[K, list[int]], tid: int, old_keys: Iterable[K], new_keys: Iterable[K]
+) -> None:
+    """Move a topic id between the sorted id lists of an index."""
+    old, new = set(old_keys), set(new_keys)
+    for key in old - new:
+        topic_ids = index.get(key)
+        if topic_ids is not None and tid in topic_ids:
+            topic_ids.remove(tid)
+            if not topic_ids:
+                del index[key]
+    for key in new - old:
+        insort(index.setdefault(key, []), tid)
+
+
 class DataStore:
-    def __init__(self, data_path: Path) -> None:
+    # Le store accepte les mises à jour incrémentales (WATCH_DATA)
+    live_reload = True
+
+    # Attributs sauvegardés dans le snapshot (données + index construits)
+    STATE_ATTRS = (
+        "export_info",
+        "categories",
+        "topics",
+        "category_topics",
+        "category_tree",
+        "category_preorder",
+        "category_intervals",
+        "category_orderings",
+        "topic_orderings",
+        "tag_topics",
+        "tag_orderings",
+        "tag_counts",
+        "author_topics",
+        "author_orderings",
+        "author_stats",
+        "facets",
+        "archive",
+    )
+
+    def __init__(
+        self,
+        data_path: Path,
+        load_workers: int = 1,
+        cache_path: Path | None = None,
+        lazy_bodies: bool = False,
+        body_cache_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
         self.data_path = data_path
-        self.categories: dict[int, dict[str, Any]] = {}
-        self.topics: dict[int, dict[str, Any]] = {}
+        self.load_workers = load_workers
+        self.cache_path = cache_path
+        # Mode métadonnées seules: les contenus sont relus à la demande
+        self.lazy_bodies = lazy_bodies
+        self.body_cache = BodyCache(body_cache_bytes) if lazy_bodies else None
+        self.categories: dict[int, Category] = {}
+        self.topics: dict[int, Topic] = {}
         self.category_topics: dict[int, list[int]] = {}
         self.category_tree: dict[int, list[int]] = {}
+        # Catégories en préordre de l'arbre: la sous-arborescence d'une
+        # catégorie est la tranche [début, fin) de category_preorder
+        self.category_preorder: list[int] = []
+        self.category_intervals: dict[int, tuple[int, int]] = {}
+        # (catégorie, tri, sens) -> ids des topics, épinglés en premier
+        self.category_orderings: dict[tuple[int, str, str], list[int]] = {}
+        self._dirty_categories: set[int] = set()
+        # (tri, sens) -> ids de tous les topics
+        self.topic_orderings: dict[tuple[str, str], list[int]] = {}
+        self._topics_dirty = False
+        # tag -> ids des topics (croissants) et (tag, tri, sens) -> ids triés
+        self.tag_topics: dict[str, list[int]] = {}
+        self.tag_orderings: dict[tuple[str, str, str], list[int]] = {}
+        # (tag, nombre de topics), du plus utilisé au moins utilisé
+        self.tag_counts: list[tuple[str, int]] = []
+        self._dirty_tags: set[str] = set()
+        # auteur -> ids des topics (croissants), tris et statistiques
+        self.author_topics: dict[int, list[int]] = {}
+        self.author_orderings: dict[tuple[int, str, str], list[int]] = {}
+        self.author_stats: dict[int, AuthorStats] = {}
+        self._dirty_authors: set[int] = set()
+        # Bitmaps des filtres de listes (positions dans l'ordre de création)
+        self.facets = FacetIndex({}, {})
+        # (année, mois) -> tranche [début, fin) du tri ("created", "asc"),
+        # dans l'ordre chronologique
+        self.archive: dict[tuple[int, int], tuple[int, int]] = {}
         self.export_info: dict[str, Any] = {}
-        self._md = markdown.Markdown(extensions=["tables", "fenced_code", "nl2br"])
+        self._md = create_markdown()
+        self._listeners: list[weakref.WeakMethod[TopicListener]] = []
+        self._topic_paths: dict[str, int] | None = None
+        # Progression du chargement (fichiers topics parsés / à parser)
+        self.topic_files_total = 0
+        self.topic_files_done = 0
+        self.load_report = LoadReport()
 
     def load_all(self) -> None:
-        self._load_export_info()
-        self._load_categories()
-        self._load_topics()
-        self._build_indices()
+        self.load_report = LoadReport()
+        self._load()
+        self.load_report.topics_loaded = len(self.topics)
+        self.load_report.categories_loaded = len(self.categories)
+
+    def _load(self) -> None:
+        report = self.load_report
+        # Un seul parcours de l'arborescence, partagé par le snapshot et les loaders
+        with report.phase("walk"):
+            manifest = scan_data_tree(
+                self.data_path, fingerprint=self.cache_path is not None
+            )
+        if self.cache_path is None:
+            self._parse_all(manifest)
+            return
+
+        variant = "metadata" if self.lazy_bodies else "full"
+        path = snapshot_file(self.cache_path, self.data_path, variant)
+        with report.phase("snapshot_read"):
+            state = load_snapshot(path, manifest.fingerprints)
+        if state is not None:
+            report.source = "snapshot"
+            self.restore_state(state)
+            return
+
+        self._parse_all(manifest)
+        with report.phase("snapshot_write"):
+            write_snapshot(path, manifest.fingerprints, self.export_state())
+
+    def _parse_all(self, manifest: DataManifest) -> None:
+        report = self.load_report
+        with report.phase("export"):
+            self._load_export_info()
+        with report.phase("categories"):
+            self._load_categories(manifest.category_files)
+        with report.phase("topics"):
+            self._load_topics(manifest.topic_files)
+        with report.phase("index"):
+            self._build_indices()
+
+    def export_state(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.STATE_ATTRS}
+
+    def restore_state(self, state: dict[str, Any]) -> None:
+        for name in self.STATE_ATTRS:
+            setattr(self, name, state[name])
 
     def _load_export_info(self) -> None:
         export_file = self.data_path / "_export.yml"
         if export_file.exists():
             with open(export_file, encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+                data = load_yaml(f.read())
                 self.export_info = data.get("export_info", {})
 
-    def _load_categories(self) -> None:
-        for cat_file in self.data_path.rglob("_category.yml"):
+    def _load_categories(self, cat_files: list[Path]) -> None:
+        stats = self.load_report.categories
+        for cat_file in cat_files:
             try:
-                with open(cat_file, encoding="utf-8") as f:
-                    cat_data = yaml.safe_load(f)
-                    if cat_data and "id" in cat_data:
-                        cat_data["_path"] = str(cat_file.parent)
-                        cat_data.setdefault("parent_cid", 0)
-                        cat_data.setdefault("order", 0)
-                        cat_data.setdefault("disabled", False)
-                        cat_data.setdefault(
-                            "is_subcategory", cat_data.get("parent_cid", 0) != 0
-                        )
-                        cat_data.setdefault("icon", None)
-                        cat_data.setdefault("bgColor", None)
-                        cat_data.setdefault("color", None)
-                        cat_data.setdefault("postcount", 0)
-                        # topiccount: valeur statique de NodeBB, non utilisée
-                        # (topic_count calculé dynamiquement)
-                        cat_data.setdefault("topiccount", 0)
-                        self.categories[cat_data["id"]] = cat_data
-            except Exception:
-                pass
-
-    def _load_topics(self) -> None:
-        for md_file in self.data_path.rglob("*.md"):
-            if md_file.name == "index.md":
+                cat_data = parse_category_file(cat_file, stats)
+            except Exception as exc:
+                stats.skip(cat_file, exc)
                 continue
-            try:
-                post = frontmatter.load(md_file)
-                topic_data = dict(post.metadata)
-                if "topic_id" not in topic_data:
-                    continue
+            if cat_data is None:
+                stats.skip(cat_file, "no id in category file")
+            else:
+                self.categories[cat_data.id] = cat_data
 
-                topic_data["content"] = post.content
-                self._md.reset()
-                content_html = self._md.convert(post.content)
-                # Supprimer le premier h1 s'il correspond au titre (évite duplication)
-                title = topic_data.get("title", "")
-                if title:
-                    # Pattern pour matcher <h1>titre</h1> au début du contenu
-                    h1_pattern = re.compile(
-                        rf"^\s*<h1>{re.escape(title)}</h1>\s*", re.IGNORECASE
-                    )
-                    content_html = h1_pattern.sub("", content_html)
-                topic_data["content_html"] = content_html
-                topic_data["_path"] = str(md_file)
-                topic_data["slug"] = md_file.stem
-
-                topic_data.setdefault("deleted", False)
-                topic_data.setdefault("locked", False)
-                topic_data.setdefault("pinned", False)
-                topic_data.setdefault("post_count", 0)
-                topic_data.setdefault("rating", 0)
-                topic_data.setdefault("view_count", 0)
-                topic_data.setdefault("tags", [])
-                topic_data.setdefault("last_post", None)
-
-                # Parse date fields
-                if "created" in topic_data:
-                    topic_data["created"] = parse_datetime(topic_data["created"])
-                if "last_post" in topic_data:
-                    topic_data["last_post"] = parse_datetime(topic_data["last_post"])
-
-                self.topics[topic_data["topic_id"]] = topic_data
-            except Exception:
-                pass
+    def _load_topics(self, md_files: list[Path]) -> None:
+        self.topic_files_total = len(md_files)
+        batches: Iterator[tuple[int, tuple[list[Topic], FileStats]]]
+        if self.load_workers > 1 and len(md_files) > 1:
+            batches = self._parse_topics_parallel(md_files)
+        else:
+            batches = self._parse_topics_serial(md_files)
+        # Fusion dans l'ordre du parcours: résultat identique au chargement série
+        for file_count, (parsed, stats) in batches:
+            for topic_data in parsed:
+                self.topics[topic_data.topic_id] = topic_data
+            self.load_report.topics.merge(stats)
+            self.topic_files_done += file_count
+
+    def _parse_topics_serial(
+        self, md_files: list[Path]
+    ) -> Iterator[tuple[int, tuple[list[Topic], FileStats]]]:
+        # Par lots pour faire avancer le compteur de progression
+        for i in range(0, len(md_files), SERIAL_BATCH_SIZE):
+            batch = md_files[i : i + SERIAL_BATCH_SIZE]
+            yield len(batch), _parse_topic_batch(batch, self._md, not self.lazy_bodies)
+
+    def _parse_topics_parallel(
+        self, md_files: list[Path]
+    ) -> Iterator[tuple[int, tuple[list[Topic], FileStats]]]:
+        batch_size = max(1, -(-len(md_files) // (self.load_workers * 4)))
+        batches = [
+            md_files[i : i + batch_size] for i in range(0, len(md_files), batch_size)
+        ]
+        # Le chargement tourne dans un thread (boucle d'événements à côté): pas
+        # de fork d'un processus multi-thread, les workers partent du forkserver
+        # (spawn là où il n'existe pas, ex: Windows)
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn"
+        )
+        with ProcessPoolExecutor(
+            max_workers=self.load_workers, mp_context=context
+        ) as executor:
+            # map() conserve l'ordre des lots, quel que soit le worker qui a fini
+            parse_batch = partial(_parse_topic_batch, with_body=not self.lazy_bodies)
+            for batch, parsed in zip(
+                batches, executor.map(parse_batch, batches), strict=True
+            ):
+                yield len(batch), parsed
 
     def _build_indices(self) -> None:
         for cid, cat in self.categories.items():
-            parent = cat.get("parent_cid", 0)
+            parent = cat.parent_cid
             if parent not in self.category_tree:
                 self.category_tree[parent] = []
             self.category_tree[parent].append(cid)
 
         for parent_id in self.category_tree:
             self.category_tree[parent_id].sort(
-                key=lambda cid: self.categories.get(cid, {}).get("order", 0)
+                key=lambda cid: self.categories[cid].order
             )
 
         for tid, topic in self.topics.items():
-            cat_id = topic.get("category_id")
+            cat_id = topic.category_id
             if cat_id is not None:
                 if cat_id not in self.category_topics:
                     self.category_topics[cat_id] = []
                 self.category_topics[cat_id].append(tid)
 
-    def get_root_categories(self) -> list[dict[str, Any]]:
+        for tid in sorted(self.topics):
+            topic = self.topics[tid]
+            for tag in dict.fromkeys(topic.tags):
+                self.tag_topics.setdefault(tag, []).append(tid)
+            if topic.author_id is not None:
+                self.author_topics.setdefault(topic.author_id, []).append(tid)
+
+        self._build_category_orderings(self.category_topics)
+        self._build_topic_orderings()
+        self._build_facets()
+        self._build_archive()
+        self._build_tag_orderings(self.tag_topics)
+        self._build_author_index(self.author_topics)
+        self._build_category_ancestors()
+        self._build_category_intervals()
+        self._build_category_aggregates()
+
+    def _build_category_ancestors(self) -> None:
+        """Store on each category the chain of its parents, root first."""
+        for cid, cat in self.categories.items():
+            chain: list[int] = []
+            parent = cat.parent_cid
+            # Arrêt sur un parent inconnu ou un cycle de parent_cid
+            while parent in self.categories and parent not in chain and parent != cid:
+                chain.append(parent)
+                parent = self.categories[parent].parent_cid
+            ancestors = tuple(reversed(chain))
+            if ancestors != cat.ancestors:
+                self.categories[cid] = replace(cat, ancestors=ancestors)
+
+    def _build_category_intervals(self) -> None:
+        """Number the categories in pre-order of the tree (Euler tour).
+
+        Every subtree becomes a contiguous interval of category_preorder, so
+        listing it needs no recursive walk of the tree.
+        """
+        preorder: list[int] = []
+        intervals: dict[int, tuple[int, int]] = {}
+        starts: dict[int, int] = {}
+        # Racines: enfants d'un parent inconnu (dont 0), puis les catégories
+        # restantes, prises dans un cycle de parent_cid
+        roots = [
+            cid
+            for parent, children in self.category_tree.items()
+            if parent not in self.categories
+            for cid in children
+        ]
+        for root in chain(roots, self.categories):
+            stack = [(root, False)]
+            while stack:
+                cid, leaving = stack.pop()
+                if leaving:
+                    intervals[cid] = (starts[cid], len(preorder))
+                    continue
+                if cid in starts or cid not in self.categories:
+                    continue
+                starts[cid] = len(preorder)
+                preorder.append(cid)
+                stack.append((cid, True))
+                children = self.category_tree.get(cid, [])
+                stack.extend((child, False) for child in reversed(children))
+        self.category_preorder = preorder
+        self.category_intervals = intervals
+
+    def _build_category_aggregates(self) -> None:
+        """Store direct and per-subtree topic/post counts on the category records.
+
+        Each category adds its own figures to every ancestor, so that categories
+        whose parent is unknown still get their own aggregates.
+        """
+        direct: dict[int, tuple[int, int, datetime | None]] = {}
+        for cid in self.categories:
+            topic_ids = self.category_topics.get(cid, [])
+            posts = 0
+            last_post: datetime | None = None
+            for tid in topic_ids:
+                topic = self.topics[tid]
+                posts += topic.post_count
+                if topic.last_post is not None and (
+                    last_post is None or topic.last_post > last_post
+                ):
+                    last_post = topic.last_post
+            direct[cid] = (len(topic_ids), posts, last_post)
+
+        totals = dict(direct)
+        for cid, (count, posts, last_post) in direct.items():
+            seen = {cid}
+            parent = self.categories[cid].parent_cid
+            # seen protège contre un cycle de parent_cid dans les données
+            while parent in totals and parent not in seen:
+                total_count, total_posts, total_last = totals[parent]
+                if last_post is not None and (
+                    total_last is None or last_post > total_last
+                ):
+                    total_last = last_post
+                totals[parent] = (total_count + count, total_posts + posts, total_last)
+                seen.add(parent)
+                parent = self.categories[parent].parent_cid
+
+        for cid, (total_count, total_posts, last_post) in totals.items():
+            self.categories[cid] = replace(
+                self.categories[cid],
+                topic_count=direct[cid][0],
+                post_count=direct[cid][1],
+                total_topic_count=total_count,
+                total_post_count=total_posts,
+                last_post=last_post,
+            )
+
+    def _build_topic_orderings(self) -> None:
+        for sort_by in SORT_FIELDS:
+            for order in SORT_ORDERS:
+                self.topic_orderings[sort_by, order] = sort_topic_ids(
+                    self.topics, self.topics, sort_by, order
+                )
+
+    def _build_facets(self) -> None:
+        self.facets = FacetIndex(self.topics, self.topic_orderings)
+
+    def _build_archive(self) -> None:
+        """Split the creation-date ordering into month buckets (index ranges)."""
+        archive: dict[tuple[int, int], tuple[int, int]] = {}
+        current: tuple[int, int] | None = None
+        start = stop = 0
+        for tid in self.topic_orderings.get(("created", "asc"), []):
+            created = self.topics[tid].created
+            if created is None:
+                # Topics sans date en fin de tri, hors archives
+                break
+            month = (created.year, created.month)
+            if month != current:
+                if current is not None:
+                    archive[current] = (start, stop)
+                current, start = month, stop
+            stop += 1
+        if current is not None:
+            archive[current] = (start, stop)
+        self.archive = archive
+
+    def _build_orderings(
+        self,
+        index: dict[K, list[int]],
+        orderings: dict[tuple[K, str, str], list[int]],
+        keys: Iterable[K],
+        pinned_first: bool = False,
+    ) -> None:
+        """Re-sort the topics of the given index keys for every sort and order."""
+        for key in keys:
+            topic_ids = index.get(key)
+            for sort_by in SORT_FIELDS:
+                for order in SORT_ORDERS:
+                    if topic_ids:
+                        orderings[key, sort_by, order] = sort_topic_ids(
+                            topic_ids, self.topics, sort_by, order, pinned_first
+                        )
+                    else:
+                        orderings.pop((key, sort_by, order), None)
+
+    def _build_category_orderings(self, category_ids: Iterable[int]) -> None:
+        self._build_orderings(
+            self.category_topics, self.category_orderings, category_ids, True
+        )
+
+    def _build_tag_orderings(self, tags: Iterable[str]) -> None:
+        self._build_orderings(self.tag_topics, self.tag_orderings, tags)
+        self.tag_counts = sorted(
+            ((tag, len(ids)) for tag, ids in self.tag_topics.items()),
+            key=lambda item: (-item[1], item[0]),
+        )
+
+    def _build_author_index(self, author_ids: Iterable[int]) -> None:
+        """Refresh the orderings and statistics of the given authors."""
+        author_ids = list(author_ids)
+        self._build_orderings(self.author_topics, self.author_orderings, author_ids)
+        for author_id in author_ids:
+            topic_ids = self.author_topics.get(author_id)
+            if topic_ids:
+                topics = [self.topics[tid] for tid in topic_ids]
+                self.author_stats[author_id] = AuthorStats.from_topics(
+                    author_id, topics
+                )
+            else:
+                self.author_stats.pop(author_id, None)
+
+    def subscribe(self, listener: TopicListener) -> None:
+        """Register a bound method called as listener(old, new) on topic changes.
+
+        The listener is held weakly so that a discarded service is not kept alive
+        by the store.
+        """
+        self._listeners.append(weakref.WeakMethod(listener))
+
+    def _notify(self, old: Topic | None, new: Topic | None) -> None:
+        for ref in list(self._listeners):
+            listener = ref()
+            if listener is None:
+                self._listeners.remove(ref)
+            else:
+                listener(old, new)
+
+    def apply_file_changes(self, changed: set[Path], removed: set[Path]) -> None:
+        """Patch the store in place for source files modified or deleted."""
+        for path in removed:
+            kind = classify_file(path.name)
+            if kind is FileKind.CATEGORY:
+                self._remove_category_file(path)
+            elif kind is FileKind.TOPIC:
+                self._remove_topic_file(path)
+        for path in changed:
+            kind = classify_file(path.name)
+            if kind is FileKind.EXPORT:
+                self._load_export_info()
+            elif kind is FileKind.CATEGORY:
+                self._update_category_file(path)
+            elif kind is FileKind.TOPIC:
+                self._update_topic_file(path)
+        # Tris des catégories touchées recalculés une fois par lot de changements
+        self._build_category_orderings(self._dirty_categories)
+        self._dirty_categories.clear()
+        # Tris globaux et bitmaps déjà déplacés topic par topic (_reorder_topic)
+        if self._topics_dirty:
+            self._build_archive()
+            self._topics_dirty = False
+        if self._dirty_tags:
+            self._build_tag_orderings(self._dirty_tags)
+            self._dirty_tags.clear()
+        self._build_author_index(self._dirty_authors)
+        self._dirty_authors.clear()
+        if changed or removed:
+            self._build_category_ancestors()
+            self._build_category_intervals()
+            self._build_category_aggregates()
+
+    def _topic_path_index(self) -> dict[str, int]:
+        if self._topic_paths is None:
+            self._topic_paths = {t.path: tid for tid, t in self.topics.items()}
+        return self._topic_paths
+
+    def _update_topic_file(self, md_file: Path) -> None:
+        try:
+            topic_data = parse_topic_file(md_file, self._md, not self.lazy_bodies)
+        except Exception:
+            # Fichier en cours d'écriture ou invalide: on garde la version connue
+            return
+
+        paths = self._topic_path_index()
+        previous_tid = paths.get(str(md_file))
+        if topic_data is None:
+            if previous_tid is not None:
+                self._remove_topic(previous_tid)
+            return
+
+        tid = topic_data.topic_id
+        if previous_tid is not None and previous_tid != tid:
+            self._remove_topic(previous_tid)
+
+        old = self.topics.get(tid)
+        old_cat_id = old.category_id if old is not None else None
+        new_cat_id = topic_data.category_id
+        if old is not None and old_cat_id != new_cat_id:
+            self._unlink_topic(tid, old_cat_id)
+        self.topics[tid] = topic_data
+        self._reorder_topic(old, topic_data)
+        paths[str(md_file)] = tid
+        if self.body_cache is not None:
+            self.body_cache.discard(tid)
+        if new_cat_id is not None and (old is None or old_cat_id != new_cat_id):
+            self.category_topics.setdefault(new_cat_id, []).append(tid)
+        if new_cat_id is not None:
+            self._dirty_categories.add(new_cat_id)
+        self._reindex_topic(old, topic_data)
+        self._topics_dirty = True
+        self._notify(old, topic_data)
+
+    def _remove_topic_file(self, md_file: Path) -> None:
+        tid = self._topic_path_index().get(str(md_file))
+        if tid is not None:
+            self._remove_topic(tid)
+
+    def _remove_topic(self, tid: int) -> None:
+        topic = self.topics.pop(tid)
+        self._reorder_topic(topic, None)
+        self._topic_path_index().pop(topic.path, None)
+        if self.body_cache is not None:
+            self.body_cache.discard(tid)
+        self._unlink_topic(tid, topic.category_id)
+        self._reindex_topic(topic, None)
+        self._topics_dirty = True
+        self._notify(topic, None)
+
+    def _reorder_topic(self, old: Topic | None, new: Topic | None) -> None:
+        """Move a changed topic in the global orderings and the facet bitmaps.
+
+        ``self.topics`` already holds ``new``; the old record stands in for it
+        while the topic is taken out of the orderings.
+        """
+        old_ranks: dict[tuple[str, str], int] = {}
+        new_ranks: dict[tuple[str, str], int] = {}
+        if old is not None:
+            topics = ChainMap({old.topic_id: old}, self.topics)
+            for (sort_by, order), topic_ids in self.topic_orderings.items():
+                old_ranks[sort_by, order] = remove_ordered(
+                    topic_ids, topics, old, sort_by, order
+                )
+        if new is not None:
+            for (sort_by, order), topic_ids in self.topic_orderings.items():
+                new_ranks[sort_by, order] = insert_ordered(
+                    topic_ids, self.topics, new, sort_by, order
+                )
+        self.facets.move(old, new, self.topic_orderings, old_ranks, new_ranks)
+
+    def _reindex_topic(self, old: Topic | None, new: Topic | None) -> None:
+        """Move a changed topic in the tag and author indices."""
+        topic = new or old
+        if topic is None:
+            return
+        old_tags = old.tags if old is not None else ()
+        new_tags = new.tags if new is not None else ()
+        _move_in_index(self.tag_topics, topic.topic_id, old_tags, new_tags)
+        old_authors = _author_key(old)
+        new_authors = _author_key(new)
+        _move_in_index(self.author_topics, topic.topic_id, old_authors, new_authors)
+        # Les tris dépendent aussi des valeurs du topic, clés conservées comprises
+        self._dirty_tags.update(old_tags, new_tags)
+        self._dirty_authors.update(old_authors, new_authors)
+
+    def _unlink_topic(self, tid: int, cat_id: int | None) -> None:
+        if cat_id is None:
+            return
+        self._dirty_categories.add(cat_id)
+        topic_ids = self.category_topics.get(cat_id)
+        if topic_ids is None or tid not in topic_ids:
+            return
+        topic_ids.remove(tid)
+        if not topic_ids:
+            del self.category_topics[cat_id]
+
+    def _category_id_by_path(self, cat_file: Path) -> int | None:
+        cat_path = str(cat_file.parent)
+        for cid, cat in self.categories.items():
+            if cat.path == cat_path:
+                return cid
+        return None
+
+    def _update_category_file(self, cat_file: Path) -> None:
+        try:
+            cat_data = parse_category_file(cat_file)
+        except Exception:
+            return
+
+        previous_cid = self._category_id_by_path(cat_file)
+        if cat_data is None:
+            if previous_cid is not None:
+                self._remove_category(previous_cid)
+            return
+
+        cid = cat_data.id
+        if previous_cid is not None and previous_cid != cid:
+            self._remove_category(previous_cid)
+
+        old = self.categories.get(cid)
+        if old is not None:
+            self._detach_category(cid, old.parent_cid)
+        self.categories[cid] = cat_data
+        siblings = self.category_tree.setdefault(cat_data.parent_cid, [])
+        siblings.append(cid)
+        siblings.sort(key=lambda c: self.categories[c].order)
+
+    def _remove_category_file(self, cat_file: Path) -> None:
+        cid = self._category_id_by_path(cat_file)
+        if cid is not None:
+            self._remove_category(cid)
+
+    def _remove_category(self, cid: int) -> None:
+        cat = self.categories.pop(cid)
+        self._detach_category(cid, cat.parent_cid)
+
+    def _detach_category(self, cid: int, parent_id: int) -> None:
+        siblings = self.category_tree.get(parent_id)
+        if siblings is None or cid not in siblings:
+            return
+        siblings.remove(cid)
+        if not siblings:
+            del self.category_tree[parent_id]
+
+    def get_root_categories(self) -> list[Category]:
         root_ids = self.category_tree.get(0, [])
         return [self.categories[cid] for cid in root_ids if cid in self.categories]
 
-    def get_category(self, category_id: int) -> dict[str, Any] | None:
+    def get_category(self, category_id: int) -> Category | None:
         return self.categories.get(category_id)
 
-    def get_subcategories(self, category_id: int) -> list[dict[str, Any]]:
+    def get_subcategories(self, category_id: int) -> list[Category]:
         sub_ids = self.category_tree.get(category_id, [])
         return [self.categories[cid] for cid in sub_ids if cid in self.categories]
 
@@ -160,30 +950,188 @@ class DataStore:
         page_size: int = 20,
         sort_by: str = "created",
         order: str = "desc",
-    ) -> tuple[list[dict[str, Any]], int]:
-        topic_ids = self.category_topics.get(category_id, [])
-        topics = [self.topics[tid] for tid in topic_ids if tid in self.topics]
+        after: tuple[Any, ...] | None = None,
+        topic_filter: TopicFilter | None = None,
+        include_descendants: bool = False,
+    ) -> tuple[list[Topic], int]:
+        """Page of a category's topics, pinned first.
+
+        With ``after`` (the sort key of the last topic already seen, see
+        topic_sort_key) the page starts right after it and ``page`` is ignored.
+        ``topic_filter`` restricts the page and the total to matching topics.
+        With ``include_descendants`` the topics of the whole subtree are listed,
+        merging the precomputed orderings of its categories.
+        """
+        category_ids = (
+            self.get_subtree_category_ids(category_id)
+            if include_descendants
+            else [category_id]
+        )
+        runs = [
+            topic_ids
+            for cid in category_ids
+            if (topic_ids := self.category_orderings.get((cid, sort_by, order)))
+        ]
+        if topic_filter is not None and not topic_filter.is_empty():
+            mask = self.facets.mask(topic_filter, category_ids)
+            return self._filtered_page(
+                mask, runs, page, page_size, sort_by, order, after, True
+            )
+        if len(runs) > 1:
+            return self._merged_page(runs, page, page_size, sort_by, order, after)
+        topic_ids = runs[0] if runs else []
+        return self._page(topic_ids, page, page_size, sort_by, order, after, True)
+
+    def get_subtree_category_ids(self, category_id: int) -> list[int]:
+        """A category followed by all its descendants, in pre-order."""
+        bounds = self.category_intervals.get(category_id)
+        if bounds is None:
+            return []
+        return self.category_preorder[bounds[0] : bounds[1]]
+
+    def _ordered_after(
+        self,
+        runs: list[list[int]],
+        sort_by: str,
+        order: str,
+        after: tuple[Any, ...] | None,
+        pinned_first: bool = False,
+    ) -> Iterator[int]:
+        """Lazily merge orderings of the same sort, from after a sort key."""
+        iterators = []
+        for topic_ids in runs:
+            start = 0
+            if after is not None:
+                start = seek_after(
+                    topic_ids, self.topics, after, sort_by, order, pinned_first
+                )
+            iterators.append(map(topic_ids.__getitem__, range(start, len(topic_ids))))
+        if len(iterators) == 1:
+            return iterators[0]
+        descending = order == "desc"
+        topics = self.topics
+        return merge(
+            *iterators,
+            key=lambda tid: topic_sort_key(
+                topics[tid], sort_by, descending, pinned_first
+            ),
+            reverse=descending,
+        )
+
+    def _merged_page(
+        self,
+        runs: list[list[int]],
+        page: int,
+        page_size: int,
+        sort_by: str,
+        order: str,
+        after: tuple[Any, ...] | None,
+    ) -> tuple[list[Topic], int]:
+        """Page of several category orderings merged, pinned first."""
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+        skip = (page - 1) * page_size if after is None else 0
+        merged = self._ordered_after(runs, sort_by, order, after, True)
+        page_ids = list(islice(merged, skip, skip + page_size))
+        return [self.topics[tid] for tid in page_ids], sum(map(len, runs))
+
+    def _page(
+        self,
+        topic_ids: list[int],
+        page: int,
+        page_size: int,
+        sort_by: str,
+        order: str,
+        after: tuple[Any, ...] | None,
+        pinned_first: bool = False,
+    ) -> tuple[list[Topic], int]:
+        """Slice a precomputed ordering by page number or after a sort key."""
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+        if after is None:
+            start = (page - 1) * page_size
+        else:
+            start = seek_after(
+                topic_ids, self.topics, after, sort_by, order, pinned_first
+            )
+        page_ids = topic_ids[start : start + page_size]
+        return [self.topics[tid] for tid in page_ids], len(topic_ids)
+
+    def _filtered_page(
+        self,
+        mask: int,
+        runs: list[list[int]],
+        page: int,
+        page_size: int,
+        sort_by: str,
+        order: str,
+        after: tuple[Any, ...] | None,
+        pinned_first: bool = False,
+    ) -> tuple[list[Topic], int]:
+        """Page of the topics of a facet mask, in the (merged) order of ``runs``."""
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+        total = mask.bit_count()
+        if not total:
+            return [], 0
+        descending = order == "desc"
+        skip = (page - 1) * page_size if after is None else 0
 
-        reverse = order == "desc"
+        if sort_by == "created":
+            # Positions des bitmaps = ordre de création: page lue dans les bits
+            after_position = None
+            if after is not None:
+                topic = self.topics.get(after[-1])
+                # Topic modifié depuis l'émission du curseur: recherche par clé
+                if topic is not None and after == topic_sort_key(
+                    topic, sort_by, descending, pinned_first
+                ):
+                    after_position = self.facets.positions.get(topic.topic_id)
+            if after is None or after_position is not None:
+                created_ids = self.facets.created_page(
+                    mask, descending, pinned_first, skip, page_size, after_position
+                )
+                return [self.topics[tid] for tid in created_ids], total
 
-        def sort_key(t: dict[str, Any]) -> Any:
-            val = t.get(sort_by)
-            if val is None:
-                return datetime.min if reverse else datetime.max
-            return val
+        # Parcours attendu du tri précalculé pour remplir la page, comparé au
+        # coût d'un tri des résultats par leurs rangs
+        if sort_by != "created":
+            expected_scan = (skip + page_size) * sum(map(len, runs)) / total
+            if expected_scan > FILTER_SCAN_RATIO * total:
+                matched = self.facets.sorted_ids(mask, sort_by, order, pinned_first)
+                return self._page(
+                    matched, page, page_size, sort_by, order, after, pinned_first
+                )
 
-        # Tri en deux étapes: d'abord par le critère demandé, puis épinglés en premier
-        topics.sort(key=sort_key, reverse=reverse)
-        # Tri stable: les épinglés restent triés entre eux mais passent en premier
-        topics.sort(key=lambda t: not t.get("pinned", False))
+        # Parcours du tri précalculé jusqu'à remplir la page
+        members = self.facets.membership(mask)
+        page_ids: list[int] = []
+        for tid in self._ordered_after(runs, sort_by, order, after, pinned_first):
+            if tid not in members:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            page_ids.append(tid)
+            if len(page_ids) == page_size:
+                break
+        return [self.topics[tid] for tid in page_ids], total
 
-        total = len(topics)
-        start = (page - 1) * page_size
-        end = start + page_size
-        return topics[start:end], total
+    def get_topic(self, topic_id: int) -> Topic | None:
+        topic = self.topics.get(topic_id)
+        if topic is None or self.body_cache is None:
+            return topic
 
-    def get_topic(self, topic_id: int) -> dict[str, Any] | None:
-        return self.topics.get(topic_id)
+        body = self.body_cache.get(topic_id)
+        if body is None:
+            try:
+                body = load_topic_body(Path(topic.path), self._md)
+            except Exception:
+                logger.warning("Could not read body of topic %s", topic_id)
+                body = ("", "")
+            else:
+                self.body_cache.put(topic_id, *body)
+        return replace(topic, content=body[0], content_html=body[1])
 
     def get_all_topics(
         self,
@@ -191,57 +1139,201 @@ class DataStore:
         page_size: int = 20,
         sort_by: str = "created",
         order: str = "desc",
-    ) -> tuple[list[dict[str, Any]], int]:
-        topics = list(self.topics.values())
+        after: tuple[Any, ...] | None = None,
+        topic_filter: TopicFilter | None = None,
+    ) -> tuple[list[Topic], int]:
+        """Page of all topics; ``after`` and ``topic_filter`` as for categories."""
+        topic_ids = self.topic_orderings.get((sort_by, order), [])
+        if topic_filter is not None and not topic_filter.is_empty():
+            mask = self.facets.mask(topic_filter)
+            return self._filtered_page(
+                mask, [topic_ids], page, page_size, sort_by, order, after
+            )
+        return self._page(topic_ids, page, page_size, sort_by, order, after)
 
-        reverse = order == "desc"
+    def get_tag_topics(
+        self,
+        tag: str,
+        page: int = 1,
+        page_size: int = 20,
+        sort_by: str = "created",
+        order: str = "desc",
+        after: tuple[Any, ...] | None = None,
+    ) -> tuple[list[Topic], int]:
+        """Page of the topics carrying a tag; ``after`` as in get_category_topics."""
+        topic_ids = self.tag_orderings.get((tag, sort_by, order), [])
+        return self._page(topic_ids, page, page_size, sort_by, order, after)
 
-        def sort_key(t: dict[str, Any]) -> Any:
-            val = t.get(sort_by)
-            if val is None:
-                return datetime.min if reverse else datetime.max
-            return val
+    def get_author_topics(
+        self,
+        author_id: int,
+        page: int = 1,
+        page_size: int = 20,
+        sort_by: str = "created",
+        order: str = "desc",
+        after: tuple[Any, ...] | None = None,
+    ) -> tuple[list[Topic], int]:
+        """Page of the topics started by an author; ``after`` as above."""
+        topic_ids = self.author_orderings.get((author_id, sort_by, order), [])
+        return self._page(topic_ids, page, page_size, sort_by, order, after)
 
-        topics.sort(key=sort_key, reverse=reverse)
+    def get_archive_topics(
+        self,
+        year: int,
+        month: int,
+        page: int = 1,
+        page_size: int = 20,
+        order: str = "desc",
+        after: tuple[Any, ...] | None = None,
+    ) -> tuple[list[Topic], int]:
+        """Page of the topics created in a month, sorted by creation date.
 
-        total = len(topics)
-        start = (page - 1) * page_size
-        end = start + page_size
-        return topics[start:end], total
+        ``after`` is a created sort key, as in get_category_topics.
+        """
+        bounds = self.archive.get((year, month))
+        if bounds is None:
+            return [], 0
+        start, stop = bounds
+        if order == "desc":
+            # Partie datée du tri décroissant = tri croissant inversé
+            dated = next(reversed(self.archive.values()))[1]
+            start, stop = dated - stop, dated - start
+        topic_ids = self.topic_orderings.get(("created", order), [])
+        if after is None:
+            first = start + (page - 1) * page_size
+        else:
+            first = seek_after(
+                topic_ids, self.topics, after, "created", order, lo=start, hi=stop
+            )
+        page_ids = topic_ids[first : min(first + page_size, stop)]
+        return [self.topics[tid] for tid in page_ids], stop - start
 
-    def get_recent_topics(self, limit: int = 10) -> list[dict[str, Any]]:
-        topics = sorted(
-            self.topics.values(),
-            key=lambda t: t.get("created") or datetime.min,
-            reverse=True,
-        )
-        return topics[:limit]
+    def get_recent_topics(self, limit: int = 10) -> list[Topic]:
+        topic_ids = self.topic_orderings.get(("created", "desc"), [])
+        return [self.topics[tid] for tid in topic_ids[:limit]]
 
     def build_category_tree(self, parent_id: int = 0) -> list[dict[str, Any]]:
         result = []
         for cid in self.category_tree.get(parent_id, []):
             cat = self.categories.get(cid)
             if cat:
-                node = dict(cat)
+                node = asdict(cat)
                 node["children"] = self.build_category_tree(cid)
-                node["topic_count"] = len(self.category_topics.get(cid, []))
                 result.append(node)
         return result
 
 
+class LoadState(StrEnum):
+    IDLE = "idle"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class StoreNotReadyError(RuntimeError):
+    """The data store is still loading in the background, or failed to load."""
+
+
+@dataclass
+class LoadStatus:
+    state: LoadState = LoadState.IDLE
+    # Store en cours de chargement, pour le compteur de progression
+    store: DataStore | None = None
+    error: str | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        status: dict[str, Any] = {"state": self.state, "error": self.error}
+        if self.store is not None:
+            status["topics_done"] = self.store.topic_files_done
+            status["topics_total"] = self.store.topic_files_total
+        if self.started_at is not None:
+            end = self.finished_at or time.monotonic()
+            status["elapsed_seconds"] = round(end - self.started_at, 3)
+        return status
+
+
 data_store: DataStore | None = None
+load_status = LoadStatus()
 
 
-def get_data_store() -> DataStore:
+def _create_data_store() -> DataStore:
+    if settings.STORE_BACKEND == "mmap":
+        # Imports locaux: ces backends dépendent de ce module
+        from app.services.mapped_store import MappedDataStore
+
+        if settings.CACHE_PATH is None:
+            raise ValueError("STORE_BACKEND=mmap requires CACHE_PATH")
+        return MappedDataStore(
+            settings.DATA_PATH,
+            settings.CACHE_PATH,
+            load_workers=settings.LOAD_WORKERS,
+        )
+    if settings.STORE_BACKEND == "sqlite":
+        from app.services.sqlite_store import SqliteDataStore
+
+        if settings.SQLITE_PATH is None:
+            raise ValueError("STORE_BACKEND=sqlite requires SQLITE_PATH")
+        return SqliteDataStore(settings.DATA_PATH, settings.SQLITE_PATH)
+    return DataStore(
+        settings.DATA_PATH,
+        load_workers=settings.LOAD_WORKERS,
+        cache_path=settings.CACHE_PATH,
+        lazy_bodies=settings.LAZY_BODIES,
+        body_cache_bytes=settings.BODY_CACHE_BYTES,
+    )
+
+
+def _load_data_store() -> DataStore:
     global data_store
-    if data_store is None:
-        data_store = DataStore(settings.DATA_PATH)
-        data_store.load_all()
-    return data_store
+    load_status.state = LoadState.LOADING
+    load_status.error = None
+    load_status.started_at = time.monotonic()
+    load_status.finished_at = None
+    try:
+        store = _create_data_store()
+        load_status.store = store
+        store.load_all()
+    except Exception as exc:
+        load_status.state = LoadState.FAILED
+        load_status.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        load_status.finished_at = time.monotonic()
+    store.load_report.log(logger)
+    # Publié seulement une fois complet
+    data_store = store
+    load_status.state = LoadState.READY
+    return store
+
+
+def get_data_store() -> DataStore:
+    if data_store is not None:
+        return data_store
+    # Pas de second chargement pendant (ou après l'échec) du chargement de fond
+    if load_status.state in (LoadState.LOADING, LoadState.FAILED):
+        raise StoreNotReadyError(load_status.state)
+    return _load_data_store()
 
 
 def init_data_store() -> DataStore:
-    global data_store
-    data_store = DataStore(settings.DATA_PATH)
-    data_store.load_all()
-    return data_store
+    return _load_data_store()
+
+
+def start_background_load() -> threading.Thread:
+    """Load the store in a daemon thread; progress is tracked in load_status."""
+    # État positionné avant le démarrage: aucun appel ne peut relancer un chargement
+    load_status.state = LoadState.LOADING
+    thread = threading.Thread(
+        target=_background_load, name="data-store-load", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def _background_load() -> None:
+    try:
+        _load_data_store()
+    except Exception:
+        logger.exception("Data store loading failed")
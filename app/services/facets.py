@@ -0,0 +1,394 @@
+"""Bitmap indexes answering topic filters by intersection instead of scans.
+
+Every topic gets a dense position, in creation order, and each facet value
+(flag, tag, author, category) is a Python int with one bit per matching
+position. A filter is the AND of the bitmaps of its criteria; creation date
+bounds are a bisect on the sorted creation dates, i.e. a contiguous range of
+positions. Pages sorted by creation date are read straight from the bits;
+other sorts use per-ordering rank arrays. A changed topic is moved in place
+(FacetIndex.move) rather than rebuilding the index.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from app.services.records import Topic
+
+# Drapeaux booléens filtrables
+FLAGS = ("pinned", "locked", "deleted")
+# Écart initial entre deux rangs consécutifs d'un tri
+RANK_GAP = 1 << 16
+
+
+@dataclass(frozen=True, slots=True)
+class TopicFilter:
+    """Listing filters; None (or no tags) means the criterion is not applied.
+
+    All tags must be present. ``created_after`` is inclusive and
+    ``created_before`` exclusive; topics without a creation date never match
+    a date bound.
+    """
+
+    pinned: bool | None = None
+    locked: bool | None = None
+    deleted: bool | None = None
+    tags: tuple[str, ...] = ()
+    author_id: int | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+
+    def is_empty(self) -> bool:
+        return self == _NO_FILTER
+
+
+_NO_FILTER = TopicFilter()
+
+
+def _bitmap(positions: Iterable[int], size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _insert_bit(bits: int, position: int) -> int:
+    """Insert a clear bit at ``position``, shifting the higher bits up."""
+    low = bits & ((1 << position) - 1)
+    return (bits >> position << (position + 1)) | low
+
+
+def _remove_bit(bits: int, position: int) -> int:
+    """Remove the bit at ``position``, shifting the higher bits down."""
+    low = bits & ((1 << position) - 1)
+    return (bits >> (position + 1) << position) | low
+
+
+def _moved_range(old: int | None, new: int | None, length: int) -> range:
+    """Indexes renumbered when an item moves from ``old`` to ``new`` in a list.
+
+    An added (``old`` None) or removed (``new`` None) item shifts the end of
+    the list.
+    """
+    if old is None:
+        return range(length if new is None else new, length)
+    if new is None:
+        return range(old, length)
+    return range(min(old, new), max(old, new) + 1)
+
+
+def _drop_highest(bits: int, count: int) -> int:
+    """Clear the ``count`` highest set bits."""
+    if count >= bits.bit_count():
+        return 0
+    # Plus grande position q telle que les bits >= q en contiennent count
+    low, high = 0, bits.bit_length()
+    while low < high:
+        middle = (low + high + 1) // 2
+        if (bits >> middle).bit_count() >= count:
+            low = middle
+        else:
+            high = middle - 1
+    return bits & ((1 << low) - 1)
+
+
+def _drop_lowest(bits: int, count: int) -> int:
+    """Clear the ``count`` lowest set bits."""
+    if count >= bits.bit_count():
+        return 0
+    # Plus petite position q telle que les bits <= q en contiennent count
+    low, high = 0, bits.bit_length()
+    while low < high:
+        middle = (low + high) // 2
+        if (bits & ((2 << middle) - 1)).bit_count() >= count:
+            high = middle
+        else:
+            low = middle + 1
+    return bits >> (low + 1) << (low + 1)
+
+
+class FacetIndex:
+    """Per-facet bitmaps over the topic positions of a store."""
+
+    def __init__(
+        self,
+        topics: Mapping[int, Topic],
+        orderings: Mapping[tuple[str, str], list[int]],
+    ) -> None:
+        """Index ``topics`` given the store's global orderings.
+
+        Positions follow the ("created", "asc") ordering: dated topics first.
+        ``ids`` is that ordering itself, which the store patches in place.
+        """
+        self.ids = orderings.get(("created", "asc"), [])
+        self.positions = {tid: pos for pos, tid in enumerate(self.ids)}
+        self.size = len(self.ids)
+        self.all = (1 << self.size) - 1
+        self.created: list[datetime] = []
+        flags: dict[str, list[int]] = {flag: [] for flag in FLAGS}
+        tags: dict[str, list[int]] = {}
+        authors: dict[int, list[int]] = {}
+        categories: dict[int, list[int]] = {}
+        for pos, tid in enumerate(self.ids):
+            topic = topics[tid]
+            if topic.created is not None:
+                self.created.append(topic.created)
+            for flag in FLAGS:
+                if getattr(topic, flag):
+                    flags[flag].append(pos)
+            for tag in topic.tags:
+                tags.setdefault(tag, []).append(pos)
+            if topic.author_id is not None:
+                authors.setdefault(topic.author_id, []).append(pos)
+            if topic.category_id is not None:
+                categories.setdefault(topic.category_id, []).append(pos)
+        self.dated = (1 << len(self.created)) - 1
+        self.flags = {key: _bitmap(pos, self.size) for key, pos in flags.items()}
+        self.tags = {key: _bitmap(pos, self.size) for key, pos in tags.items()}
+        self.authors = {key: _bitmap(pos, self.size) for key, pos in authors.items()}
+        self.categories = {
+            key: _bitmap(pos, self.size) for key, pos in categories.items()
+        }
+        # Rang de chaque position dans les autres tris (tri des petits résultats),
+        # espacés de RANK_GAP pour placer un topic déplacé entre ses voisins
+        self.ranks: dict[tuple[str, str], array[int]] = {}
+        for key, topic_ids in orderings.items():
+            if key[0] == "created":
+                continue
+            ranks = array("q", bytes(8 * self.size))
+            self._number(ranks, topic_ids)
+            self.ranks[key] = ranks
+
+    def _number(self, ranks: "array[int]", topic_ids: list[int]) -> None:
+        for rank, tid in enumerate(topic_ids):
+            ranks[self.positions[tid]] = rank * RANK_GAP
+
+    def _facet_bitmaps(self, topic: Topic) -> Iterator[tuple[dict[Any, int], Any]]:
+        """(bitmaps, key) of every facet value of a topic."""
+        for flag in FLAGS:
+            if getattr(topic, flag):
+                yield self.flags, flag
+        for tag in dict.fromkeys(topic.tags):
+            yield self.tags, tag
+        if topic.author_id is not None:
+            yield self.authors, topic.author_id
+        if topic.category_id is not None:
+            yield self.categories, topic.category_id
+
+    def move(
+        self,
+        old: Topic | None,
+        new: Topic | None,
+        orderings: Mapping[tuple[str, str], list[int]],
+        old_ranks: Mapping[tuple[str, str], int],
+        new_ranks: Mapping[tuple[str, str], int],
+    ) -> None:
+        """Follow a topic changed, added (``old`` None) or removed (``new`` None).
+
+        ``orderings`` are already patched; the ranks are the topic's indexes in
+        each ordering before and after the change, positions being the ranks
+        in ("created", "asc"). Only the bits between the old and new positions
+        move; the topic's rank is taken between the ranks of its neighbours.
+        """
+        created_key = ("created", "asc")
+        old_position = old_ranks.get(created_key)
+        new_position = new_ranks.get(created_key)
+        if old_position is None and new_position is None:
+            return
+        self.ids = orderings[created_key]
+        if old is not None and old_position is not None:
+            bit = 1 << old_position
+            for bitmaps, key in self._facet_bitmaps(old):
+                bits = bitmaps[key] & ~bit
+                if bits or bitmaps is self.flags:
+                    bitmaps[key] = bits
+                else:
+                    del bitmaps[key]
+            if old.created is not None:
+                del self.created[old_position]
+        if old_position != new_position:
+            # Décalage des positions suivantes, seulement dans les bitmaps
+            # qui ont des bits au-delà
+            all_bitmaps: tuple[dict[Any, int], ...] = (
+                self.flags,
+                self.tags,
+                self.authors,
+                self.categories,
+            )
+            for bitmaps in all_bitmaps:
+                for key, bits in bitmaps.items():
+                    if old_position is not None and bits.bit_length() > old_position:
+                        bits = _remove_bit(bits, old_position)
+                    if new_position is not None and bits.bit_length() > new_position:
+                        bits = _insert_bit(bits, new_position)
+                    bitmaps[key] = bits
+            for ranks in self.ranks.values():
+                if old_position is not None:
+                    del ranks[old_position]
+                if new_position is not None:
+                    ranks.insert(new_position, 0)
+            if old is not None:
+                del self.positions[old.topic_id]
+            self.size = len(self.ids)
+            self.all = (1 << self.size) - 1
+            for position in _moved_range(old_position, new_position, self.size):
+                self.positions[self.ids[position]] = position
+        if new is not None and new_position is not None:
+            bit = 1 << new_position
+            for bitmaps, key in self._facet_bitmaps(new):
+                bitmaps[key] = bitmaps.get(key, 0) | bit
+            if new.created is not None:
+                self.created.insert(new_position, new.created)
+            for key, ranks in self.ranks.items():
+                self._rank(ranks, orderings[key], new_ranks[key], new_position)
+        self.dated = (1 << len(self.created)) - 1
+
+    def _rank(
+        self, ranks: "array[int]", topic_ids: list[int], rank: int, position: int
+    ) -> None:
+        """Give the topic at ``rank`` a rank value between its neighbours'."""
+        positions = self.positions
+        lower = ranks[positions[topic_ids[rank - 1]]] if rank else None
+        upper = None
+        if rank + 1 < len(topic_ids):
+            upper = ranks[positions[topic_ids[rank + 1]]]
+        if lower is None:
+            ranks[position] = 0 if upper is None else upper - RANK_GAP
+        elif upper is None:
+            ranks[position] = lower + RANK_GAP
+        elif upper - lower > 1:
+            ranks[position] = (lower + upper) // 2
+        else:
+            # Plus de place entre les voisins: tri renuméroté
+            self._number(ranks, topic_ids)
+
+    def mask(
+        self, topic_filter: TopicFilter, category_ids: Iterable[int] | None = None
+    ) -> int:
+        """Bitmap of the positions matching the filter (and one of the categories)."""
+        mask = self.all
+        if category_ids is not None:
+            categories = 0
+            for category_id in category_ids:
+                categories |= self.categories.get(category_id, 0)
+            mask &= categories
+        for flag in FLAGS:
+            wanted = getattr(topic_filter, flag)
+            if wanted is not None:
+                bits = self.flags[flag]
+                mask &= bits if wanted else self.all ^ bits
+        for tag in topic_filter.tags:
+            mask &= self.tags.get(tag, 0)
+        if topic_filter.author_id is not None:
+            mask &= self.authors.get(topic_filter.author_id, 0)
+        after, before = topic_filter.created_after, topic_filter.created_before
+        if after is not None or before is not None:
+            start = bisect_left(self.created, after) if after is not None else 0
+            stop = len(self.created)
+            if before is not None:
+                stop = bisect_left(self.created, before)
+            if start >= stop:
+                return 0
+            mask &= ((1 << stop) - 1) ^ ((1 << start) - 1)
+        return mask
+
+    def matching_positions(self, mask: int) -> Iterator[int]:
+        """Positions of the set bits of a mask, from the highest."""
+        bits = bin(mask)
+        last = len(bits) - 1
+        index = bits.find("1", 2)
+        while index != -1:
+            yield last - index
+            index = bits.find("1", index + 1)
+
+    def sorted_ids(
+        self, mask: int, sort_by: str, order: str, pinned_first: bool = False
+    ) -> list[int]:
+        """Ids of a mask in a sort other than creation date (small masks)."""
+        rank = self.ranks[sort_by, order].__getitem__
+        groups = [mask]
+        if pinned_first:
+            pinned = self.flags["pinned"]
+            groups = [mask & pinned, mask & (self.all ^ pinned)]
+        ids = self.ids
+        return [
+            ids[pos]
+            for group in groups
+            for pos in sorted(self.matching_positions(group), key=rank)
+        ]
+
+    def created_page(
+        self,
+        mask: int,
+        descending: bool,
+        pinned_first: bool,
+        skip: int,
+        count: int,
+        after_position: int | None = None,
+    ) -> list[int]:
+        """Ids of a page of a mask sorted by creation date, as topic_sort_key.
+
+        ``after_position`` is the position of the last topic already seen
+        (keyset paging); ``skip`` matching topics are skipped after it.
+        """
+        # Segments successifs du tri: datés puis non datés, épinglés d'abord
+        bases = [self.dated, self.all ^ self.dated]
+        if pinned_first:
+            pinned = self.flags["pinned"]
+            unpinned = self.all ^ pinned
+            bases = [b & pinned for b in bases] + [b & unpinned for b in bases]
+        segments = [mask & base for base in bases]
+
+        if after_position is not None:
+            bit = 1 << after_position
+            index = next(i for i, base in enumerate(bases) if base & bit)
+            segments[:index] = [0] * index
+            if descending:
+                segments[index] &= bit - 1
+            else:
+                shift = after_position + 1
+                segments[index] = segments[index] >> shift << shift
+
+        page: list[int] = []
+        for segment in segments:
+            available = segment.bit_count()
+            if skip >= available:
+                skip -= available
+                continue
+            if skip:
+                segment = (
+                    _drop_highest(segment, skip)
+                    if descending
+                    else _drop_lowest(segment, skip)
+                )
+                skip = 0
+            while segment and len(page) < count:
+                if descending:
+                    pos = segment.bit_length() - 1
+                else:
+                    pos = (segment & -segment).bit_length() - 1
+                page.append(self.ids[pos])
+                segment ^= 1 << pos
+            if len(page) == count:
+                break
+        return page
+
+    def membership(self, mask: int) -> "Membership":
+        return Membership(self.positions, mask.to_bytes((self.size + 7) // 8, "little"))
+
+
+class Membership:
+    """Constant-time membership test of topic ids in a mask."""
+
+    __slots__ = ("_bits", "_positions")
+
+    def __init__(self, positions: dict[int, int], bits: bytes) -> None:
+        self._positions = positions
+        self._bits = bits
+
+    def __contains__(self, topic_id: int) -> bool:
+        pos = self._positions.get(topic_id)
+        return pos is not None and bool(self._bits[pos >> 3] >> (pos & 7) & 1)
@@ -0,0 +1,165 @@
+import re
+from pathlib import Path
+from typing import Any
+
+import frontmatter
+import yaml
+
+# Loader C (libyaml) si disponible, sinon le loader Python
+SafeLoader: type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Clés des frontmatters de topics et des _category.yml produits par l'export
+KNOWN_KEYS = frozenset(
+    {
+        # topics
+        "topic_id",
+        "title",
+        "author_id",
+        "category_id",
+        "created",
+        "last_post",
+        "deleted",
+        "locked",
+        "pinned",
+        "post_count",
+        "rating",
+        "view_count",
+        "tags",
+        # catégories
+        "id",
+        "name",
+        "slug",
+        "description",
+        "parent_cid",
+        "icon",
+        "bgColor",
+        "color",
+        "order",
+        "disabled",
+        "is_subcategory",
+        "postcount",
+        "topiccount",
+    }
+)
+
+FM_BOUNDARY = re.compile(r"^-{3,}\s*$", re.MULTILINE)
+_KEY_LINE = re.compile(r"([A-Za-z_][A-Za-z0-9_]*):(?: (.*))?")
+_LIST_ITEM = re.compile(r"( *)- (.*)")
+_INT = re.compile(r"-?(?:0|[1-9][0-9]*)")
+_PLAIN = re.compile(r"[^\W_][^:#]*")
+# Scalaires non quotés que YAML 1.1 ne lit pas comme des chaînes
+_RESERVED_PLAIN = frozenset(
+    "yes Yes YES no No NO true True TRUE false False FALSE "
+    "on On ON off Off OFF null Null NULL y Y n N".split()
+)
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def load_yaml(text: str) -> Any:
+    """Generic YAML parsing with the C-accelerated safe loader when available."""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def _parse_scalar(value: str) -> Any:
+    value = value.strip()
+    if value in ("", "~", "null"):
+        return None
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    if value == "[]":
+        return []
+    if _INT.fullmatch(value):
+        return int(value)
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        inner = value[1:-1]
+        if "'" in inner.replace("''", ""):
+            raise _Unsupported
+        return inner.replace("''", "'")
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        inner = value[1:-1]
+        if '"' in inner or "\\" in inner:
+            raise _Unsupported
+        return inner
+    # Un "/" exclut nombres et dates (slugs "12/nom-de-categorie")
+    if (
+        _PLAIN.fullmatch(value)
+        and value not in _RESERVED_PLAIN
+        and (not value[0].isdigit() or "/" in value)
+    ):
+        return value
+    raise _Unsupported
+
+
+def parse_simple_mapping(text: str) -> dict[str, Any] | None:
+    """Parse the restricted YAML written by the export, or return None.
+
+    Only top-level known keys with int, bool, null, simple quoted or plain
+    string values and block lists of such scalars are accepted. Anything else
+    returns None and must go through load_yaml, which gives the same result.
+    """
+    data: dict[str, Any] = {}
+    list_key: str | None = None
+    list_indent = ""
+    try:
+        for line in text.split("\n"):
+            if not line.strip():
+                continue
+            if not line.isprintable():
+                return None
+            item = _LIST_ITEM.fullmatch(line)
+            if item is not None:
+                if list_key is None:
+                    return None
+                if not data[list_key]:
+                    list_indent = item.group(1)
+                elif item.group(1) != list_indent:
+                    return None
+                data[list_key].append(_parse_scalar(item.group(2)))
+                continue
+            if list_key is not None and not data[list_key]:
+                # "tags:" sans élément: null en YAML
+                data[list_key] = None
+            list_key = None
+
+            match = _KEY_LINE.fullmatch(line)
+            if match is None or match.group(1) not in KNOWN_KEYS:
+                return None
+            key, value = match.group(1), match.group(2)
+            if value is None or not value.strip():
+                data[key] = []
+                list_key = key
+            else:
+                data[key] = _parse_scalar(value)
+    except _Unsupported:
+        return None
+    if list_key is not None and not data[list_key]:
+        data[list_key] = None
+    return data
+
+
+def parse_frontmatter(text: str) -> tuple[dict[str, Any], str]:
+    """Split and parse a topic file like frontmatter.loads: (metadata, content)."""
+    text = text.strip()
+    if not FM_BOUNDARY.match(text):
+        post = frontmatter.loads(text)
+        return dict(post.metadata), post.content
+    try:
+        _, fm, content = FM_BOUNDARY.split(text, 2)
+    except ValueError:
+        return {}, text
+
+    metadata = parse_simple_mapping(fm)
+    if metadata is None:
+        data = load_yaml(fm)
+        metadata = data if isinstance(data, dict) else {}
+    return metadata, content.strip()
+
+
+def read_frontmatter(path: Path) -> tuple[dict[str, Any], str]:
+    with open(path, encoding="utf-8") as f:
+        return parse_frontmatter(f.read())
@@ -0,0 +1,114 @@
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from app.services.fast_yaml import read_frontmatter
+from app.services.records import Topic
+
+if TYPE_CHECKING:
+    from app.services.data_loader import DataStore
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE topics_fts USING fts5(
+    title, tags, body,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+# Poids bm25 par colonne: titre, tags, contenu
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+_SEARCH_SQL = (
+    "SELECT rowid FROM topics_fts WHERE topics_fts MATCH ?"
+    f" ORDER BY bm25(topics_fts, {', '.join(map(str, BM25_WEIGHTS))}) LIMIT ?"
+)
+
+
+def fts_row(topic: Topic, body: str) -> tuple[int, str, str, str]:
+    return topic.topic_id, topic.title, " ".join(topic.tags), body
+
+
+def fill_fts_index(
+    conn: sqlite3.Connection, rows: Iterable[tuple[int, str, str, str]]
+) -> None:
+    conn.executemany(
+        "INSERT INTO topics_fts (rowid, title, tags, body) VALUES (?, ?, ?, ?)", rows
+    )
+
+
+def match_expression(query: str) -> str | None:
+    """FTS5 query requiring every word of the query as a prefix."""
+    words = re.findall(r"\w+", query.lower(), re.UNICODE)
+    if not words:
+        return None
+    # Mots entre guillemets: pas d'opérateurs FTS5 venant de l'utilisateur
+    return " AND ".join(f'"{word}"*' for word in words)
+
+
+class Fts5SearchService:
+    """Full-text search over titles, tags and bodies, ranked with bm25.
+
+    With the sqlite store backend the index compiled into the database file
+    is used as is; otherwise it is built in memory and kept up to date with
+    the store changes.
+    """
+
+    def __init__(self, data_store: "DataStore") -> None:
+        from app.services.sqlite_store import SqliteDataStore
+
+        self.store = data_store
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        # Index précompilé par python -m app.compile
+        self._compiled = data_store if isinstance(data_store, SqliteDataStore) else None
+        if self._compiled is None:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._conn.execute(FTS_SCHEMA)
+            self._build_index()
+            data_store.subscribe(self._on_topic_changed)
+
+    def _build_index(self) -> None:
+        assert self._conn is not None
+        rows = (fts_row(t, self._body(t)) for t in self.store.topics.values())
+        with self._lock:
+            fill_fts_index(self._conn, rows)
+
+    def _body(self, topic: Topic) -> str:
+        if topic.content is not None:
+            return topic.content
+        if self.store.body_cache is not None:
+            # LAZY_BODIES: lecture du Markdown sans rendu ni passage par le cache
+            try:
+                return read_frontmatter(Path(topic.path))[1]
+            except OSError:
+                return ""
+        full = self.store.get_topic(topic.topic_id)
+        return full.content or "" if full is not None else ""
+
+    def _on_topic_changed(self, old: Topic | None, new: Topic | None) -> None:
+        assert self._conn is not None
+        with self._lock:
+            if old is not None:
+                self._conn.execute(
+                    "DELETE FROM topics_fts WHERE rowid = ?", (old.topic_id,)
+                )
+            if new is not None:
+                fill_fts_index(self._conn, [fts_row(new, self._body(new))])
+
+    def search(self, query: str, limit: int = 20) -> list[Topic]:
+        expression = match_expression(query)
+        if expression is None:
+            return []
+
+        params = (expression, limit)
+        if self._compiled is not None:
+            rows = self._compiled.connection().execute(_SEARCH_SQL, params).fetchall()
+        else:
+            assert self._conn is not None
+            with self._lock:
+                rows = self._conn.execute(_SEARCH_SQL, params).fetchall()
+        topics = self.store.topics
+        return [topics[tid] for (tid,) in rows if tid in topics]
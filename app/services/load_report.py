@@ -0,0 +1,133 @@
+import heapq
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Nombre de fichiers les plus lents conservés dans le rapport
+SLOWEST_FILES = 10
+
+
+@dataclass(slots=True)
+class FileStats:
+    """Parse counters for a set of files; picklable for the process pool."""
+
+    files: int = 0
+    bytes_read: int = 0
+    yaml_seconds: float = 0.0
+    render_seconds: float = 0.0
+    # (secondes, chemin), tas borné à SLOWEST_FILES
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+    skipped: list[tuple[str, str]] = field(default_factory=list)
+
+    def record(self, path: Path, size: int, yaml_s: float, render_s: float) -> None:
+        self.files += 1
+        self.bytes_read += size
+        self.yaml_seconds += yaml_s
+        self.render_seconds += render_s
+        entry = (yaml_s + render_s, str(path))
+        if len(self.slowest) < SLOWEST_FILES:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+
+    def skip(self, path: Path, error: BaseException | str) -> None:
+        if isinstance(error, BaseException):
+            error = f"{type(error).__name__}: {error}"
+        self.skipped.append((str(path), error))
+
+    def merge(self, other: "FileStats") -> None:
+        self.files += other.files
+        self.bytes_read += other.bytes_read
+        self.yaml_seconds += other.yaml_seconds
+        self.render_seconds += other.render_seconds
+        self.slowest = heapq.nlargest(SLOWEST_FILES, self.slowest + other.slowest)
+        heapq.heapify(self.slowest)
+        self.skipped.extend(other.skipped)
+
+
+@dataclass
+class LoadReport:
+    """Where a DataStore load spent its time and which files it skipped.
+
+    Phase times are wall clock, except yaml and render which are summed over
+    files (so across processes when LOAD_WORKERS > 1).
+    """
+
+    source: str = "parse"
+    phases: dict[str, float] = field(default_factory=dict)
+    categories: FileStats = field(default_factory=FileStats)
+    topics: FileStats = field(default_factory=FileStats)
+    topics_loaded: int = 0
+    categories_loaded: int = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (
+                time.perf_counter() - start
+            )
+
+    def merge(self, other: "LoadReport") -> None:
+        """Add the phases and file counters of a load done on our behalf."""
+        for name, seconds in other.phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+        self.categories.merge(other.categories)
+        self.topics.merge(other.topics)
+
+    def as_dict(self, root: Path | None = None) -> dict[str, Any]:
+        """Report as JSON-ready dict; file paths are made relative to root."""
+
+        def rel(path: str) -> str:
+            if root is None:
+                return path
+            try:
+                return Path(path).relative_to(root).as_posix()
+            except ValueError:
+                return path
+
+        files = self.categories.files + self.topics.files
+        phases = dict(self.phases)
+        if files:
+            phases["yaml"] = self.categories.yaml_seconds + self.topics.yaml_seconds
+            phases["render"] = self.topics.render_seconds
+        return {
+            "source": self.source,
+            "phases_seconds": {name: round(s, 4) for name, s in phases.items()},
+            "files": {
+                "categories": self.categories.files,
+                "topics": self.topics.files,
+                "skipped": len(self.categories.skipped) + len(self.topics.skipped),
+            },
+            "bytes_read": self.categories.bytes_read + self.topics.bytes_read,
+            "topics_loaded": self.topics_loaded,
+            "categories_loaded": self.categories_loaded,
+            "slowest_files": [
+                {"path": rel(path), "seconds": round(seconds, 4)}
+                for seconds, path in sorted(self.topics.slowest, reverse=True)
+            ],
+            "skipped_files": [
+                {"path": rel(path), "error": error}
+                for path, error in self.categories.skipped + self.topics.skipped
+            ],
+        }
+
+    def log(self, logger: logging.Logger) -> None:
+        report = self.as_dict()
+        phases = ", ".join(f"{k}={v:.3f}s" for k, v in report["phases_seconds"].items())
+        logger.info(
+            "Loaded %d topics, %d categories from %s (%d bytes): %s",
+            self.topics_loaded,
+            self.categories_loaded,
+            self.source,
+            report["bytes_read"],
+            phases,
+        )
+        for skipped in report["skipped_files"]:
+            logger.warning("Skipped %s: %s", skipped["path"], skipped["error"])
@@ -0,0 +1,432 @@
+import copy
+import fcntl
+import logging
+import mmap
+import os
+import pickle
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Hashable, Iterator, Mapping, Sequence
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, BinaryIO, overload
+
+from app.services.data_loader import SORT_FIELDS, SORT_ORDERS, DataStore
+from app.services.facets import FacetIndex
+from app.services.records import Topic
+from app.services.scanner import scan_data_tree
+from app.services.snapshot import Manifest, snapshot_file, snapshot_key
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VEAFMAP2"
+_HEADER_LEN = struct.Struct("<Q")
+_ITEM_SIZE = array("q").itemsize
+
+# Format du fichier:
+#   MAGIC | longueur de l'en-tête | en-tête (pickle: clé, manifeste, index)
+#   | ids triés | offsets des métadonnées | offsets des contenus
+#   | sections (tris, rangs et bitmaps des facettes, alignées sur 8 octets)
+#   | métadonnées des topics (un pickle chacun) | contenus (un pickle chacun)
+
+# Index dont les tris sont des sections du fichier plutôt que des listes de
+# l'en-tête, dupliquées en mémoire privée par chaque worker
+ORDERING_ATTRS = (
+    "category_orderings",
+    "topic_orderings",
+    "tag_orderings",
+    "author_orderings",
+)
+# Tris d'une même clé d'index, consécutifs dans une section
+_SLOTS = {
+    (sort_by, order): slot
+    for slot, (sort_by, order) in enumerate(
+        (sort_by, order) for sort_by in SORT_FIELDS for order in SORT_ORDERS
+    )
+}
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+Span = tuple[int, int]
+
+
+class MappedTopics(Mapping[int, Topic]):
+    """Read-only topic mapping decoded on access from a memory-mapped file.
+
+    The file pages are shared by every process mapping it; only the topics a
+    request actually touches are turned into Python objects.
+    """
+
+    def __init__(self, mm: mmap.mmap, count: int, start: int) -> None:
+        self._mm = mm
+        view = memoryview(mm)
+        ids_end = start + count * _ITEM_SIZE
+        meta_end = ids_end + (count + 1) * _ITEM_SIZE
+        body_end = meta_end + (count + 1) * _ITEM_SIZE
+        self._ids = view[start:ids_end].cast("q")
+        self._meta_offsets = view[ids_end:meta_end].cast("q")
+        self._body_offsets = view[meta_end:body_end].cast("q")
+
+    def _position(self, topic_id: object) -> int | None:
+        if not isinstance(topic_id, int):
+            return None
+        i = bisect_left(self._ids, topic_id)
+        if i < len(self._ids) and self._ids[i] == topic_id:
+            return i
+        return None
+
+    def __getitem__(self, topic_id: int) -> Topic:
+        i = self._position(topic_id)
+        if i is None:
+            raise KeyError(topic_id)
+        topic: Topic = pickle.loads(
+            self._mm[self._meta_offsets[i] : self._meta_offsets[i + 1]]
+        )
+        return topic
+
+    def __contains__(self, topic_id: object) -> bool:
+        return self._position(topic_id) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def body(self, topic_id: int) -> tuple[str, str]:
+        i = self._position(topic_id)
+        if i is None:
+            raise KeyError(topic_id)
+        body: tuple[str, str] = pickle.loads(
+            self._mm[self._body_offsets[i] : self._body_offsets[i + 1]]
+        )
+        return body
+
+
+class MappedOrderings(Mapping[tuple[Any, ...], memoryview]):
+    """Orderings of an index, as slices of a section of the mapped file.
+
+    Keys are ``(*key, sort_by, order)``; the orderings of one index key are
+    stored one after the other, all of the same length.
+    """
+
+    def __init__(self, items: memoryview, spans: dict[tuple[Any, ...], Span]):
+        self._items = items
+        self._spans = spans
+
+    def __getitem__(self, key: tuple[Any, ...]) -> memoryview:
+        *prefix, sort_by, order = key
+        span = self._spans.get(tuple(prefix))
+        slot = _SLOTS.get((sort_by, order))
+        if span is None or slot is None:
+            raise KeyError(key)
+        start, count = span
+        start += slot * count
+        return self._items[start : start + count]
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        for prefix in self._spans:
+            for sort_by, order in _SLOTS:
+                yield (*prefix, sort_by, order)
+
+    def __len__(self) -> int:
+        return len(self._spans) * len(_SLOTS)
+
+
+class MappedBitmaps(Mapping[Hashable, int]):
+    """Facet bitmaps stored as bytes, turned into ints on access."""
+
+    def __init__(self, data: memoryview, spans: dict[Hashable, Span]) -> None:
+        self._data = data
+        self._spans = spans
+
+    def __getitem__(self, key: Hashable) -> int:
+        start, stop = self._spans[key]
+        return int.from_bytes(self._data[start:stop], "little")
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._spans)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+
+class MappedPositions(Mapping[int, int]):
+    """Facet position of each topic id, aligned on the sorted ids of the file."""
+
+    def __init__(self, topics: "MappedTopics", positions: memoryview) -> None:
+        self._topics = topics
+        self._positions = positions
+
+    def __getitem__(self, topic_id: int) -> int:
+        i = self._topics._position(topic_id)
+        if i is None:
+            raise KeyError(topic_id)
+        position: int = self._positions[i]
+        return position
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._topics)
+
+    def __len__(self) -> int:
+        return len(self._topics)
+
+
+class MappedDates(Sequence[datetime]):
+    """Sorted creation dates, stored as microseconds since 1970."""
+
+    def __init__(self, values: memoryview) -> None:
+        self._values = values
+
+    @overload
+    def __getitem__(self, index: int) -> datetime: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[datetime]: ...
+
+    def __getitem__(self, index: int | slice) -> datetime | list[datetime]:
+        if isinstance(index, slice):
+            return [_EPOCH + v * _MICROSECOND for v in self._values[index]]
+        value: int = self._values[index]
+        return _EPOCH + value * _MICROSECOND
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class _Sections:
+    """Binary sections written after the topic offsets, 8-byte aligned."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def add(self, data: bytes) -> Span:
+        start = len(self.data)
+        self.data += data
+        self.data += b"\0" * (-len(self.data) % _ITEM_SIZE)
+        return start, start + len(data)
+
+
+def _pack_orderings(
+    orderings: Mapping[tuple[Any, ...], list[int]], sections: _Sections
+) -> dict[tuple[Any, ...], Span]:
+    """Write the orderings of each index key; (first item, length) per key."""
+    spans: dict[tuple[Any, ...], Span] = {}
+    for key, topic_ids in orderings.items():
+        prefix = key[:-2]
+        if prefix in spans:
+            continue
+        spans[prefix] = (len(sections.data) // _ITEM_SIZE, len(topic_ids))
+        for sort_by, order in _SLOTS:
+            sections.add(array("q", orderings[(*prefix, sort_by, order)]).tobytes())
+    return spans
+
+
+def _pack_facets(
+    facets: FacetIndex, ids: Sequence[int], sections: _Sections
+) -> FacetIndex:
+    """Shallow copy of the index whose large parts point to file sections."""
+    packed = copy.copy(facets)
+    packed.ids = []
+    positions = array("q", (facets.positions[tid] for tid in ids))
+    dates = array("q", ((d - _EPOCH) // _MICROSECOND for d in facets.created))
+    parts: dict[str, Any] = {
+        "positions": sections.add(positions.tobytes()),
+        "created": sections.add(dates.tobytes()),
+        "ranks": {
+            key: sections.add(ranks.tobytes()) for key, ranks in facets.ranks.items()
+        },
+    }
+    size = (facets.size + 7) // 8
+    for name in ("tags", "authors", "categories"):
+        bitmaps: dict[Hashable, int] = getattr(facets, name)
+        parts[name] = {
+            key: sections.add(bits.to_bytes(size, "little"))
+            for key, bits in bitmaps.items()
+        }
+    vars(packed).update(parts)
+    return packed
+
+
+def _unpack_facets(
+    packed: FacetIndex, ids: Sequence[int], topics: "MappedTopics", data: memoryview
+) -> FacetIndex:
+    """Point the parts written by _pack_facets to the mapped sections."""
+    spans: dict[str, Any] = vars(packed)
+    parts: dict[str, Any] = {
+        "ids": ids,
+        "positions": MappedPositions(
+            topics, data[slice(*spans["positions"])].cast("q")
+        ),
+        "created": MappedDates(data[slice(*spans["created"])].cast("q")),
+        "ranks": {
+            key: data[slice(*span)].cast("q") for key, span in spans["ranks"].items()
+        },
+    }
+    for name in ("tags", "authors", "categories"):
+        parts[name] = MappedBitmaps(data, spans[name])
+    vars(packed).update(parts)
+    return packed
+
+
+def write_mapped_store(
+    path: Path, manifest: Manifest, state: dict[str, Any], topics: Mapping[int, Topic]
+) -> None:
+    """Write the mapped store file atomically."""
+    ids = sorted(topics)
+    meta_blobs = []
+    body_blobs = []
+    for tid in ids:
+        topic = topics[tid]
+        metadata = replace(topic, content=None, content_html=None)
+        body = (topic.content or "", topic.content_html or "")
+        meta_blobs.append(pickle.dumps(metadata, pickle.HIGHEST_PROTOCOL))
+        body_blobs.append(pickle.dumps(body, pickle.HIGHEST_PROTOCOL))
+
+    sections = _Sections()
+    state = dict(state)
+    for name in ORDERING_ATTRS:
+        state[name] = _pack_orderings(state[name], sections)
+    state["facets"] = _pack_facets(state["facets"], ids, sections)
+    header = pickle.dumps(
+        {
+            "key": snapshot_key(),
+            "manifest": manifest,
+            "state": state,
+            "count": len(ids),
+            "sections": len(sections.data),
+        },
+        pickle.HIGHEST_PROTOCOL,
+    )
+    padding = -(len(MAGIC) + _HEADER_LEN.size + len(header)) % _ITEM_SIZE
+    start = len(MAGIC) + _HEADER_LEN.size + len(header) + padding
+    blobs_start = start + (3 * len(ids) + 2) * _ITEM_SIZE + len(sections.data)
+
+    meta_offsets = _offsets(blobs_start, meta_blobs)
+    body_offsets = _offsets(meta_offsets[-1], body_blobs)
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LEN.pack(len(header)))
+        f.write(header)
+        f.write(b"\0" * padding)
+        f.write(array("q", ids).tobytes())
+        f.write(meta_offsets.tobytes())
+        f.write(body_offsets.tobytes())
+        f.write(sections.data)
+        _write_all(f, meta_blobs)
+        _write_all(f, body_blobs)
+    os.replace(tmp_path, path)
+
+
+def _offsets(start: int, blobs: list[bytes]) -> "array[int]":
+    offsets = array("q", [start])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    return offsets
+
+
+def _write_all(f: BinaryIO, blobs: list[bytes]) -> None:
+    for blob in blobs:
+        f.write(blob)
+
+
+def open_mapped_store(
+    path: Path, manifest: Manifest
+) -> tuple[dict[str, Any], MappedTopics] | None:
+    """Map the file read-only; None if it is missing, invalid or stale."""
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    try:
+        if mm[: len(MAGIC)] != MAGIC:
+            raise ValueError("bad magic")
+        (header_len,) = _HEADER_LEN.unpack_from(mm, len(MAGIC))
+        header_start = len(MAGIC) + _HEADER_LEN.size
+        header = pickle.loads(mm[header_start : header_start + header_len])
+    except Exception:
+        logger.warning("Ignoring unreadable mapped store %s", path, exc_info=True)
+        mm.close()
+        return None
+
+    if header["key"] != snapshot_key() or header["manifest"] != manifest:
+        mm.close()
+        return None
+
+    start = header_start + header_len
+    start += -start % _ITEM_SIZE
+    count = header["count"]
+    topics = MappedTopics(mm, count, start)
+    sections_start = start + (3 * count + 2) * _ITEM_SIZE
+    data = memoryview(mm)[sections_start : sections_start + header["sections"]]
+    items = data.cast("q")
+    state = header["state"]
+    for name in ORDERING_ATTRS:
+        state[name] = MappedOrderings(items, state[name])
+    ids = state["topic_orderings"].get(("created", "asc"), [])
+    state["facets"] = _unpack_facets(state["facets"], ids, topics, data)
+    return state, topics
+
+
+class MappedDataStore(DataStore):
+    """DataStore served from a memory-mapped file shared by all workers.
+
+    The first worker to find the file missing or stale parses the export and
+    writes it under an exclusive lock; the others wait, then only map it.
+    Topics are decoded on access and never patched in place.
+    """
+
+    live_reload = False
+
+    def __init__(self, data_path: Path, cache_path: Path, load_workers: int = 1):
+        super().__init__(data_path, load_workers=load_workers, cache_path=cache_path)
+        self._mapped: MappedTopics | None = None
+
+    def _load(self) -> None:
+        assert self.cache_path is not None
+        report = self.load_report
+        report.source = "mmap"
+        with report.phase("walk"):
+            manifest = scan_data_tree(self.data_path, fingerprint=True)
+        path = snapshot_file(self.cache_path, self.data_path, "mapped", ".bin")
+        with report.phase("map"):
+            opened = open_mapped_store(path, manifest.fingerprints)
+        if opened is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path.with_suffix(".lock"), "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                opened = open_mapped_store(path, manifest.fingerprints)
+                if opened is None:
+                    self._compile(path, manifest.fingerprints)
+                    opened = open_mapped_store(path, manifest.fingerprints)
+        if opened is None:
+            raise RuntimeError(f"Could not map data store file {path}")
+
+        state, self._mapped = opened
+        self.restore_state({**state, "topics": self._mapped})
+
+    def _compile(self, path: Path, manifest: Manifest) -> None:
+        builder = DataStore(self.data_path, load_workers=self.load_workers)
+        builder.load_all()
+        # Le rapport garde les phases déjà mesurées et y ajoute le parsing
+        # effectué pour écrire le fichier
+        self.load_report.merge(builder.load_report)
+        self.load_report.source = "mmap (rebuilt)"
+        state = builder.export_state()
+        topics = state.pop("topics")
+        with self.load_report.phase("mmap_write"):
+            write_mapped_store(path, manifest, state, topics)
+
+    def get_topic(self, topic_id: int) -> Topic | None:
+        topic = self.topics.get(topic_id)
+        if topic is None or self._mapped is None:
+            return topic
+        content, content_html = self._mapped.body(topic_id)
+        return replace(topic, content=content, content_html=content_html)
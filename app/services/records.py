@@ -0,0 +1,169 @@
+import sys
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from app.services.urls import category_url_path, topic_url_path
+
+
+class _ReadOnlyMapping:
+    """Read-only dict-style access (record["title"], record.get("title"))."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(frozen=True, slots=True)
+class Topic(_ReadOnlyMapping):
+    topic_id: int
+    title: str
+    author_id: int | None
+    category_id: int | None
+    created: datetime | None
+    last_post: datetime | None
+    deleted: bool
+    locked: bool
+    pinned: bool
+    post_count: int
+    rating: int
+    view_count: int
+    tags: tuple[str, ...]
+    slug: str
+    path: str
+    url_path: str
+    # Absents en mode LAZY_BODIES
+    content: str | None = None
+    content_html: str | None = None
+
+    @classmethod
+    def from_metadata(
+        cls,
+        data: dict[str, Any],
+        *,
+        created: datetime | None,
+        last_post: datetime | None,
+        slug: str,
+        path: str,
+        content: str | None = None,
+        content_html: str | None = None,
+    ) -> "Topic":
+        """Build a topic from its frontmatter and the fields derived at load."""
+        return cls(
+            topic_id=data["topic_id"],
+            title=data.get("title", ""),
+            author_id=data.get("author_id"),
+            category_id=data.get("category_id"),
+            created=created,
+            last_post=last_post,
+            deleted=data.get("deleted", False),
+            locked=data.get("locked", False),
+            pinned=data.get("pinned", False),
+            post_count=data.get("post_count", 0),
+            rating=data.get("rating", 0),
+            view_count=data.get("view_count", 0),
+            tags=tuple(_intern(tag) for tag in data.get("tags") or ()),
+            slug=slug,
+            path=path,
+            url_path=topic_url_path(data["topic_id"], slug),
+            content=content,
+            content_html=content_html,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Category(_ReadOnlyMapping):
+    id: int
+    name: str
+    slug: str
+    parent_cid: int
+    order: int
+    disabled: bool
+    is_subcategory: bool
+    icon: str | None
+    bgColor: str | None
+    color: str | None
+    # postcount / topiccount: valeurs statiques de NodeBB, non utilisées
+    # (post_count et topic_count calculés à la construction des index)
+    postcount: int
+    topiccount: int
+    path: str
+    url_path: str
+    description: str | None = None
+    # Agrégats calculés à la construction des index (sous-catégories incluses
+    # pour les champs total_* et last_post)
+    topic_count: int = 0
+    post_count: int = 0
+    total_topic_count: int = 0
+    total_post_count: int = 0
+    last_post: datetime | None = None
+    # Catégories parentes, de la racine au parent direct (fil d'Ariane)
+    ancestors: tuple[int, ...] = ()
+
+    @classmethod
+    def from_metadata(cls, data: dict[str, Any], path: str) -> "Category":
+        parent_cid = data.get("parent_cid", 0)
+        slug = data.get("slug", "")
+        return cls(
+            id=data["id"],
+            name=data.get("name", ""),
+            slug=slug,
+            parent_cid=parent_cid,
+            order=data.get("order", 0),
+            disabled=data.get("disabled", False),
+            is_subcategory=data.get("is_subcategory", parent_cid != 0),
+            icon=_intern(data.get("icon")),
+            bgColor=_intern(data.get("bgColor")),
+            color=_intern(data.get("color")),
+            postcount=data.get("postcount", 0),
+            topiccount=data.get("topiccount", 0),
+            path=path,
+            url_path=category_url_path(data["id"], slug),
+            description=data.get("description"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class AuthorStats(_ReadOnlyMapping):
+    author_id: int
+    topic_count: int
+    view_count: int
+    post_count: int
+    # Premier topic créé et dernière activité (dernier post ou création)
+    first_activity: datetime | None
+    last_activity: datetime | None
+
+    @classmethod
+    def from_topics(cls, author_id: int, topics: Iterable[Topic]) -> "AuthorStats":
+        topic_count = view_count = post_count = 0
+        created = []
+        active = []
+        for topic in topics:
+            topic_count += 1
+            view_count += topic.view_count
+            post_count += topic.post_count
+            if topic.created is not None:
+                created.append(topic.created)
+            last = topic.last_post or topic.created
+            if last is not None:
+                active.append(last)
+        return cls(
+            author_id=author_id,
+            topic_count=topic_count,
+            view_count=view_count,
+            post_count=post_count,
+            first_activity=min(created, default=None),
+            last_activity=max(active, default=None),
+        )
@@ -0,0 +1,103 @@
+import os
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+
+# Répertoire d'images à la racine de l'export: jamais parcouru
+IMAGES_DIR = "images"
+IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg"})
+
+
+class FileKind(StrEnum):
+    EXPORT = "export"
+    CATEGORY = "category"
+    TOPIC = "topic"
+    INDEX = "index"
+    IMAGE = "image"
+
+
+def classify_file(name: str) -> FileKind | None:
+    if name == "_export.yml":
+        return FileKind.EXPORT
+    if name == "_category.yml":
+        return FileKind.CATEGORY
+    if name == "index.md":
+        return FileKind.INDEX
+    if name.endswith(".md"):
+        return FileKind.TOPIC
+    if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+        return FileKind.IMAGE
+    return None
+
+
+def is_source_file(name: str) -> bool:
+    """Whether a file contributes to the store (export info, category or topic)."""
+    return classify_file(name) in (FileKind.EXPORT, FileKind.CATEGORY, FileKind.TOPIC)
+
+
+@dataclass
+class DataManifest:
+    export_file: Path | None = None
+    category_files: list[Path] = field(default_factory=list)
+    topic_files: list[Path] = field(default_factory=list)
+    index_files: list[Path] = field(default_factory=list)
+    image_files: list[Path] = field(default_factory=list)
+    # Chemin relatif -> (mtime_ns, taille) des fichiers sources
+    fingerprints: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+
+def scan_data_tree(data_path: Path, fingerprint: bool = False) -> DataManifest:
+    """Walk the export once with os.scandir and classify every file.
+
+    Directories are visited depth-first with entries sorted by name, so the
+    result does not depend on the filesystem's listing order. Source files are
+    only stat'ed when fingerprint is set.
+    """
+    manifest = DataManifest()
+    root = str(data_path)
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            # Liens symboliques vers des dossiers non suivis (comme rglob),
+            # une boucle de liens ferait tourner le parcours sans fin
+            if entry.is_dir(follow_symlinks=False):
+                if not (directory == root and entry.name == IMAGES_DIR):
+                    subdirs.append(entry.path)
+                continue
+            if entry.is_symlink() and entry.is_dir():
+                continue
+
+            kind = classify_file(entry.name)
+            if kind is None:
+                continue
+            path = Path(entry.path)
+            if kind is FileKind.EXPORT:
+                if directory != root:
+                    continue
+                manifest.export_file = path
+            elif kind is FileKind.CATEGORY:
+                manifest.category_files.append(path)
+            elif kind is FileKind.TOPIC:
+                manifest.topic_files.append(path)
+            elif kind is FileKind.INDEX:
+                manifest.index_files.append(path)
+                continue
+            else:
+                manifest.image_files.append(path)
+                continue
+
+            if fingerprint:
+                st = entry.stat()
+                relative = os.path.relpath(entry.path, root)
+                manifest.fingerprints[relative] = (st.st_mtime_ns, st.st_size)
+
+        stack.extend(reversed(subdirs))
+    return manifest
@@ -1,39 +1,252 @@
 import re
-from typing import TYPE_CHECKING, Any
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Protocol
+
+from app.config import settings
+from app.services.records import Topic
 
 if TYPE_CHECKING:
     from app.services.data_loader import DataStore
 
 
+# Nombre de mots de requête dont l'expansion est gardée en mémoire
+EXPANSION_CACHE_SIZE = 1024
+# Longueur des n-grammes de l'index des sous-chaînes
+NGRAM_SIZE = 3
+# Majorant de tout caractère, pour borner une plage de préfixe
+_MAX_CHAR = chr(0x10FFFF)
+# Parties lettres / chiffres d'un mot composé (mirage2000 -> mirage, 2000)
+_COMPOUND_PARTS = re.compile(r"[^\W\d_]+|\d+")
+
+
+def title_words(title: str) -> list[str]:
+    words = re.findall(r"\w+", title.lower(), re.UNICODE)
+    return [word for word in words if len(word) >= 2]
+
+
+def word_ngrams(word: str) -> set[str]:
+    """Distinct substrings of NGRAM_SIZE characters of a word."""
+    return {word[i : i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1)}
+
+
+def compound_parts(word: str) -> list[str]:
+    """Letter and digit runs of a word mixing both, else an empty list."""
+    parts = _COMPOUND_PARTS.findall(word)
+    if len(parts) < 2 or any(len(part) < 2 for part in parts):
+        return []
+    return parts
+
+
+def starts_consecutive(words: list[str], parts: list[str]) -> bool:
+    """Whether ``parts`` start consecutive ``words``, in order (mir, 2000)."""
+    return any(
+        all(words[i + k].startswith(part) for k, part in enumerate(parts))
+        for i in range(len(words) - len(parts) + 1)
+    )
+
+
+class SearchBackend(Protocol):
+    def search(self, query: str, limit: int = 20) -> list[Topic]: ...
+
+
+def create_search_service(data_store: "DataStore") -> SearchBackend:
+    """Search backend selected by SEARCH_BACKEND."""
+    if settings.SEARCH_BACKEND == "fts5":
+        from app.services.fts_search import Fts5SearchService
+
+        return Fts5SearchService(data_store)
+    return SearchService(data_store)
+
+
+_search_service: SearchBackend | None = None
+_search_lock = threading.Lock()
+
+
+def get_search_service() -> SearchBackend:
+    """Search backend of the data store, shared by the API and web routers."""
+    global _search_service
+    if _search_service is None:
+        from app.services.data_loader import get_data_store
+
+        # Un seul index par processus, même si les deux routeurs le demandent
+        # en même temps
+        with _search_lock:
+            if _search_service is None:
+                _search_service = create_search_service(get_data_store())
+    return _search_service
+
+
 class SearchService:
+    """Title search: every query word must occur in a word of the title.
+
+    A query word matches the indexed words it is a prefix of, found by
+    bisecting the sorted vocabulary, and those containing it further in,
+    found by intersecting the trigram postings of the vocabulary. A word
+    mixing letters and digits (mirage2000) also matches titles where its
+    parts, in order, start consecutive words. Expansions are memoised until
+    the vocabulary changes.
+    """
+
     def __init__(self, data_store: "DataStore") -> None:
         self.store = data_store
         self.title_index: dict[str, list[int]] = {}
+        # Mots indexés, triés: un préfixe couvre une plage contiguë
+        self.vocabulary: list[str] = []
+        # Trigramme -> mots indexés qui le contiennent
+        self.ngram_index: dict[str, set[str]] = {}
+        # Mot de requête -> mots indexés qui le contiennent (LRU)
+        self._expansions: OrderedDict[str, list[str]] = OrderedDict()
         self._build_index()
+        data_store.subscribe(self._on_topic_changed)
 
     def _build_index(self) -> None:
         for tid, topic in self.store.topics.items():
-            title = topic.get("title", "").lower()
-            words = re.findall(r"\w+", title, re.UNICODE)
-            for word in words:
-                if len(word) < 2:
-                    continue
-                if word not in self.title_index:
-                    self.title_index[word] = []
-                self.title_index[word].append(tid)
-
-    def search(self, query: str, limit: int = 20) -> list[dict[str, Any]]:
+            self._index_topic(tid, topic.title)
+        self.vocabulary = sorted(self.title_index)
+        for word in self.vocabulary:
+            self._index_ngrams(word)
+
+    def _index_ngrams(self, word: str) -> None:
+        for ngram in word_ngrams(word):
+            self.ngram_index.setdefault(ngram, set()).add(word)
+
+    def _unindex_ngrams(self, word: str) -> None:
+        for ngram in word_ngrams(word):
+            words = self.ngram_index.get(ngram)
+            if words is not None:
+                words.discard(word)
+                if not words:
+                    del self.ngram_index[ngram]
+
+    def _index_topic(self, tid: int, title: str) -> None:
+        for word in title_words(title):
+            if word not in self.title_index:
+                self.title_index[word] = []
+            self.title_index[word].append(tid)
+
+    def _unindex_topic(self, tid: int, title: str) -> None:
+        for word in set(title_words(title)):
+            tids = self.title_index.get(word)
+            if tids is None:
+                continue
+            tids[:] = [t for t in tids if t != tid]
+            if not tids:
+                del self.title_index[word]
+
+    def _on_topic_changed(self, old: Topic | None, new: Topic | None) -> None:
+        words: set[str] = set()
+        if old is not None:
+            self._unindex_topic(old.topic_id, old.title)
+            words.update(title_words(old.title))
+        if new is not None:
+            self._index_topic(new.topic_id, new.title)
+            words.update(title_words(new.title))
+        self._update_vocabulary(words)
+
+    def _update_vocabulary(self, words: set[str]) -> None:
+        """Add or drop words that entered or left the index."""
+        changed = False
+        for word in words:
+            pos = bisect_left(self.vocabulary, word)
+            listed = pos < len(self.vocabulary) and self.vocabulary[pos] == word
+            if word in self.title_index and not listed:
+                insort(self.vocabulary, word)
+                self._index_ngrams(word)
+                changed = True
+            elif word not in self.title_index and listed:
+                del self.vocabulary[pos]
+                self._unindex_ngrams(word)
+                changed = True
+        if changed:
+            # Nouveau cache plutôt que clear(): une recherche en cours garde le sien
+            self._expansions = OrderedDict()
+
+    def prefix_words(self, prefix: str) -> list[str]:
+        """Indexed words starting with ``prefix``, in O(log V + matches)."""
+        start = bisect_left(self.vocabulary, prefix)
+        stop = bisect_left(self.vocabulary, prefix + _MAX_CHAR, start)
+        return self.vocabulary[start:stop]
+
+    def expand(self, word: str) -> list[str]:
+        """Indexed words containing ``word``, prefixed ones first."""
+        expansions = self._expansions
+        cached = expansions.get(word)
+        if cached is not None:
+            expansions.move_to_end(word)
+            return cached
+
+        prefixed = self.prefix_words(word)
+        found = set(prefixed)
+        # Un début du mot déjà développé (saisie en cours) contient déjà tous
+        # les mots cherchés: on filtre son expansion
+        for end in range(len(word) - 1, 0, -1):
+            base = expansions.get(word[:end])
+            if base is not None:
+                candidates: Iterable[str] = base
+                break
+        else:
+            if len(word) >= NGRAM_SIZE:
+                candidates = self._ngram_candidates(word)
+            else:
+                # Mot trop court pour les trigrammes: parcours du vocabulaire
+                candidates = self.vocabulary
+        infixed = [
+            indexed
+            for indexed in candidates
+            if word in indexed and indexed not in found
+        ]
+        if candidates is not self.vocabulary:
+            infixed.sort()
+        expansion = prefixed + infixed
+
+        expansions[word] = expansion
+        if len(expansions) > EXPANSION_CACHE_SIZE:
+            expansions.popitem(last=False)
+        return expansion
+
+    def _ngram_candidates(self, word: str) -> set[str]:
+        """Indexed words holding every trigram of ``word`` (to be verified)."""
+        postings = sorted(
+            (self.ngram_index.get(ngram, set()) for ngram in word_ngrams(word)),
+            key=len,
+        )
+        return postings[0].intersection(*postings[1:])
+
+    def _prefix_ids(self, prefix: str) -> set[int]:
+        """Topics with a title word starting with ``prefix``."""
+        ids: set[int] = set()
+        for indexed_word in self.prefix_words(prefix):
+            ids.update(self.title_index[indexed_word])
+        return ids
+
+    def _matching_ids(self, word: str) -> set[int]:
+        matching_ids: set[int] = set()
+        for indexed_word in self.expand(word):
+            matching_ids.update(self.title_index.get(indexed_word, ()))
+        parts = compound_parts(word)
+        if parts:
+            # Mot composé: aussi les titres dont des mots consécutifs commencent
+            # par ses parties, dans l'ordre (pas ge20 ni 2000mirage pour
+            # "Mirage 2000"); l'index ne garde pas les positions, on vérifie
+            # les titres candidats
+            topics = self.store.topics
+            matching_ids.update(
+                tid
+                for tid in set.intersection(*map(self._prefix_ids, parts))
+                if tid in topics
+                and starts_consecutive(title_words(topics[tid].title), parts)
+            )
+        return matching_ids
+
+    def search(self, query: str, limit: int = 20) -> list[Topic]:
         words = re.findall(r"\w+", query.lower(), re.UNICODE)
         if not words:
             return []
 
-        result_sets = []
-        for word in words:
-            matching_ids = set()
-            for indexed_word, tids in self.title_index.items():
-                if word in indexed_word or indexed_word.startswith(word):
-                    matching_ids.update(tids)
-            result_sets.append(matching_ids)
+        result_sets = [self._matching_ids(word) for word in words]
 
         if not result_sets:
             return []
@@ -45,6 +258,6 @@ class SearchService:
         results = [
             self.store.topics[tid] for tid in matching_ids if tid in self.store.topics
         ]
-        results.sort(key=lambda t: t.get("view_count", 0), reverse=True)
+        results.sort(key=lambda t: t.view_count, reverse=True)
 
         return results[:limit]
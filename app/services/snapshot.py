@@ -0,0 +1,68 @@
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any
+
+import markdown
+
+from app.services.scanner import scan_data_tree
+
+logger = logging.getLogger(__name__)
+
+# A incrémenter dès que le format des topics/catégories ou le rendu change
+SNAPSHOT_VERSION = 12
+
+Manifest = dict[str, tuple[int, int]]
+
+
+def build_manifest(data_path: Path) -> Manifest:
+    """Fingerprint every source file of the export: relative path -> (mtime, size)."""
+    return scan_data_tree(data_path, fingerprint=True).fingerprints
+
+
+def snapshot_file(
+    cache_path: Path, data_path: Path, variant: str = "full", suffix: str = ".pickle"
+) -> Path:
+    """Snapshot location for a data directory, so several exports can share a cache."""
+    key = hashlib.sha1(str(data_path.resolve()).encode()).hexdigest()[:12]
+    return cache_path / f"datastore-{key}-{variant}{suffix}"
+
+
+def snapshot_key() -> tuple[int, str]:
+    return SNAPSHOT_VERSION, markdown.__version__
+
+
+def load_snapshot(path: Path, manifest: Manifest) -> dict[str, Any] | None:
+    """Return the stored state if the snapshot matches the manifest, else None."""
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.warning("Ignoring unreadable snapshot %s", path, exc_info=True)
+        return None
+
+    if snapshot.get("key") != snapshot_key() or snapshot.get("manifest") != manifest:
+        return None
+    state: dict[str, Any] = snapshot["state"]
+    return state
+
+
+def write_snapshot(path: Path, manifest: Manifest, state: dict[str, Any]) -> None:
+    """Write the snapshot atomically; failures are logged, never raised."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                {"key": snapshot_key(), "manifest": manifest, "state": state},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, path)
+    except OSError:
+        logger.warning("Could not write snapshot %s", path, exc_info=True)
+        tmp_path.unlink(missing_ok=True)
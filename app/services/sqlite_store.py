@@ -0,0 +1,657 @@
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+from collections.abc import Iterator, Mapping
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from app.services.data_loader import DataStore
+from app.services.facets import FLAGS, TopicFilter
+from app.services.fts_search import FTS_SCHEMA, fill_fts_index, fts_row
+from app.services.records import Category, Topic
+from app.services.snapshot import snapshot_key
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE state (name TEXT PRIMARY KEY, value BLOB NOT NULL);
+CREATE TABLE categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    parent_cid INTEGER NOT NULL,
+    "order" INTEGER NOT NULL,
+    disabled INTEGER NOT NULL,
+    is_subcategory INTEGER NOT NULL,
+    icon TEXT,
+    bgColor TEXT,
+    color TEXT,
+    postcount INTEGER NOT NULL,
+    topiccount INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    url_path TEXT NOT NULL,
+    description TEXT,
+    topic_count INTEGER NOT NULL,
+    post_count INTEGER NOT NULL,
+    total_topic_count INTEGER NOT NULL,
+    total_post_count INTEGER NOT NULL,
+    last_post TEXT,
+    ancestors TEXT NOT NULL
+);
+CREATE TABLE topics (
+    topic_id INTEGER PRIMARY KEY,
+    ord INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    author_id INTEGER,
+    category_id INTEGER,
+    created TEXT,
+    last_post TEXT,
+    deleted INTEGER NOT NULL,
+    locked INTEGER NOT NULL,
+    pinned INTEGER NOT NULL,
+    post_count INTEGER NOT NULL,
+    rating INTEGER NOT NULL,
+    view_count INTEGER NOT NULL,
+    tags TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    path TEXT NOT NULL,
+    url_path TEXT NOT NULL,
+    created_desc TEXT GENERATED ALWAYS AS (COALESCE(created, '')) VIRTUAL,
+    created_asc TEXT GENERATED ALWAYS AS (COALESCE(created, '~')) VIRTUAL,
+    last_post_desc TEXT GENERATED ALWAYS AS (COALESCE(last_post, '')) VIRTUAL,
+    last_post_asc TEXT GENERATED ALWAYS AS (COALESCE(last_post, '~')) VIRTUAL,
+    unpinned INTEGER GENERATED ALWAYS AS (NOT pinned) VIRTUAL
+);
+CREATE TABLE topic_bodies (
+    topic_id INTEGER PRIMARY KEY,
+    content TEXT NOT NULL,
+    content_html TEXT NOT NULL
+);
+CREATE TABLE topic_tags (
+    tag TEXT NOT NULL,
+    topic_id INTEGER NOT NULL,
+    PRIMARY KEY (tag, topic_id)
+) WITHOUT ROWID;
+CREATE INDEX topics_author_id ON topics (author_id);
+CREATE INDEX topics_created ON topics (created);
+CREATE INDEX topics_created_desc ON topics (created_desc);
+CREATE INDEX topics_created_asc ON topics (created_asc);
+CREATE INDEX topics_last_post_desc ON topics (last_post_desc);
+CREATE INDEX topics_last_post_asc ON topics (last_post_asc);
+CREATE INDEX topics_view_count ON topics (view_count);
+CREATE INDEX topics_rating ON topics (rating);
+CREATE INDEX topics_category_created_desc
+    ON topics (category_id, pinned, created_desc);
+CREATE INDEX topics_category_created_asc
+    ON topics (category_id, unpinned, created_asc);
+CREATE INDEX topics_category_last_post_desc
+    ON topics (category_id, pinned, last_post_desc);
+CREATE INDEX topics_category_last_post_asc
+    ON topics (category_id, unpinned, last_post_asc);
+CREATE INDEX topics_category_view_count_desc
+    ON topics (category_id, pinned, view_count);
+CREATE INDEX topics_category_view_count_asc
+    ON topics (category_id, unpinned, view_count);
+CREATE INDEX topics_category_rating_desc ON topics (category_id, pinned, rating);
+CREATE INDEX topics_category_rating_asc ON topics (category_id, unpinned, rating);
+"""
+
+CATEGORY_COLUMNS = (
+    "id",
+    "name",
+    "slug",
+    "parent_cid",
+    "order",
+    "disabled",
+    "is_subcategory",
+    "icon",
+    "bgColor",
+    "color",
+    "postcount",
+    "topiccount",
+    "path",
+    "url_path",
+    "description",
+    "topic_count",
+    "post_count",
+    "total_topic_count",
+    "total_post_count",
+    "last_post",
+    "ancestors",
+)
+TOPIC_COLUMNS = (
+    "topic_id",
+    "title",
+    "author_id",
+    "category_id",
+    "created",
+    "last_post",
+    "deleted",
+    "locked",
+    "pinned",
+    "post_count",
+    "rating",
+    "view_count",
+    "tags",
+    "slug",
+    "path",
+    "url_path",
+)
+# Colonnes autorisées dans ORDER BY (valeurs venant des paramètres de requête)
+SORT_COLUMNS = frozenset({"created", "last_post", "view_count", "rating"})
+# Dates manquantes dans les clés générées {colonne}_{ordre}: '' avant et '~'
+# après tout texte ISO 8601, pour les garder en dernier dans les deux sens
+DATE_SORT_COLUMNS = frozenset({"created", "last_post"})
+MISSING_DATES = {"desc": "", "asc": "~"}
+
+_TOPIC_SELECT = "SELECT " + ", ".join(TOPIC_COLUMNS) + " FROM topics"
+_CATEGORY_SELECT = (
+    "SELECT " + ", ".join(f'"{col}"' for col in CATEGORY_COLUMNS) + " FROM categories"
+)
+# État du store hors catégories et topics, stocké en pickle
+_STATE_NAMES = (
+    "key",
+    "export_info",
+    "category_tree",
+    "category_preorder",
+    "category_intervals",
+    "category_topics",
+    "tag_topics",
+    "tag_counts",
+    "author_stats",
+    "archive",
+)
+
+
+def _format_datetime(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _topic_row(topic: Topic, position: int) -> tuple[Any, ...]:
+    return (
+        topic.topic_id,
+        position,
+        topic.title,
+        topic.author_id,
+        topic.category_id,
+        _format_datetime(topic.created),
+        _format_datetime(topic.last_post),
+        topic.deleted,
+        topic.locked,
+        topic.pinned,
+        topic.post_count,
+        topic.rating,
+        topic.view_count,
+        json.dumps(topic.tags),
+        topic.slug,
+        topic.path,
+        topic.url_path,
+    )
+
+
+def _topic_from_row(row: tuple[Any, ...]) -> Topic:
+    (
+        topic_id,
+        title,
+        author_id,
+        category_id,
+        created,
+        last_post,
+        deleted,
+        locked,
+        pinned,
+        post_count,
+        rating,
+        view_count,
+        tags,
+        slug,
+        path,
+        url_path,
+    ) = row
+    return Topic(
+        topic_id=topic_id,
+        title=title,
+        author_id=author_id,
+        category_id=category_id,
+        created=datetime.fromisoformat(created) if created else None,
+        last_post=datetime.fromisoformat(last_post) if last_post else None,
+        deleted=bool(deleted),
+        locked=bool(locked),
+        pinned=bool(pinned),
+        post_count=post_count,
+        rating=rating,
+        view_count=view_count,
+        tags=tuple(json.loads(tags)),
+        slug=slug,
+        path=path,
+        url_path=url_path,
+    )
+
+
+def _category_from_row(row: tuple[Any, ...]) -> Category:
+    data = dict(zip(CATEGORY_COLUMNS, row, strict=True))
+    for flag in ("disabled", "is_subcategory"):
+        data[flag] = bool(data[flag])
+    last_post = data["last_post"]
+    data["last_post"] = datetime.fromisoformat(last_post) if last_post else None
+    data["ancestors"] = tuple(json.loads(data["ancestors"]))
+    return Category(**data)
+
+
+def _category_row(cat: Category) -> tuple[Any, ...]:
+    row = {
+        **{col: getattr(cat, col) for col in CATEGORY_COLUMNS},
+        "last_post": _format_datetime(cat.last_post),
+        "ancestors": json.dumps(cat.ancestors),
+    }
+    return tuple(row.values())
+
+
+def write_sqlite_store(path: Path, store: DataStore) -> None:
+    """Compile a loaded (non lazy) DataStore into a SQLite file, atomically."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        state = {"key": snapshot_key(), **store.export_state()}
+        conn.executemany(
+            "INSERT INTO state VALUES (?, ?)",
+            [(name, pickle.dumps(state[name])) for name in _STATE_NAMES],
+        )
+        conn.executemany(
+            f"INSERT INTO categories VALUES ({', '.join('?' * len(CATEGORY_COLUMNS))})",
+            [_category_row(cat) for cat in store.categories.values()],
+        )
+        conn.executemany(
+            f"INSERT INTO topics VALUES ({', '.join('?' * (len(TOPIC_COLUMNS) + 1))})",
+            [_topic_row(t, i) for i, t in enumerate(store.topics.values())],
+        )
+        conn.executemany(
+            "INSERT INTO topic_bodies VALUES (?, ?, ?)",
+            [
+                (tid, t.content or "", t.content_html or "")
+                for tid, t in store.topics.items()
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO topic_tags VALUES (?, ?)",
+            [
+                (tag, tid)
+                for tag, topic_ids in store.tag_topics.items()
+                for tid in topic_ids
+            ],
+        )
+        conn.execute(FTS_SCHEMA)
+        fill_fts_index(
+            conn, (fts_row(t, t.content or "") for t in store.topics.values())
+        )
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+
+class _Connections:
+    """One read-only connection per thread and per process (fork safe)."""
+
+    def __init__(self, path: Path) -> None:
+        self.uri = f"{path.resolve().as_uri()}?mode=ro"
+        self._local = threading.local()
+
+    def get(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            self._local.conn = sqlite3.connect(
+                self.uri, uri=True, check_same_thread=False
+            )
+            self._local.pid = pid
+        conn: sqlite3.Connection = self._local.conn
+        return conn
+
+
+class SqliteTopics(Mapping[int, Topic]):
+    """Read-only topic mapping backed by the topics table (metadata only)."""
+
+    def __init__(self, connections: _Connections) -> None:
+        self._connections = connections
+
+    def __getitem__(self, topic_id: int) -> Topic:
+        row = (
+            self._connections.get()
+            .execute(f"{_TOPIC_SELECT} WHERE topic_id = ?", (topic_id,))
+            .fetchone()
+        )
+        if row is None:
+            raise KeyError(topic_id)
+        return _topic_from_row(row)
+
+    def __contains__(self, topic_id: object) -> bool:
+        if not isinstance(topic_id, int):
+            return False
+        row = (
+            self._connections.get()
+            .execute("SELECT 1 FROM topics WHERE topic_id = ?", (topic_id,))
+            .fetchone()
+        )
+        return row is not None
+
+    def __iter__(self) -> Iterator[int]:
+        rows = self._connections.get().execute(
+            "SELECT topic_id FROM topics ORDER BY ord"
+        )
+        return (tid for (tid,) in rows)
+
+    def __len__(self) -> int:
+        (count,) = (
+            self._connections.get().execute("SELECT COUNT(*) FROM topics").fetchone()
+        )
+        return int(count)
+
+    def values(self) -> Iterator[Topic]:  # type: ignore[override]
+        rows = self._connections.get().execute(f"{_TOPIC_SELECT} ORDER BY ord")
+        return (_topic_from_row(row) for row in rows)
+
+    def items(self) -> Iterator[tuple[int, Topic]]:  # type: ignore[override]
+        return ((t.topic_id, t) for t in self.values())
+
+
+class SqliteDataStore(DataStore):
+    """DataStore served from a file compiled by ``python -m app.compile``.
+
+    Only categories and the small indices are loaded; topics are queried on
+    demand and listings are sorted by SQLite using the column indexes.
+    """
+
+    live_reload = False
+
+    def __init__(self, data_path: Path, sqlite_path: Path) -> None:
+        super().__init__(data_path)
+        self.sqlite_path = sqlite_path
+        self._connections = _Connections(sqlite_path)
+
+    def connection(self) -> sqlite3.Connection:
+        """Read-only connection to the compiled file for the calling thread."""
+        return self._connections.get()
+
+    def _load(self) -> None:
+        self.load_report.source = "sqlite"
+        with self.load_report.phase("open"):
+            self._open()
+
+    def _open(self) -> None:
+        if not self.sqlite_path.exists():
+            raise FileNotFoundError(
+                f"{self.sqlite_path} not found, run: python -m app.compile"
+            )
+        conn = self._connections.get()
+        state = {
+            name: pickle.loads(value)
+            for name, value in conn.execute("SELECT name, value FROM state")
+        }
+        if state["key"] != snapshot_key():
+            logger.warning("%s was compiled by another version", self.sqlite_path)
+
+        rows = conn.execute(_CATEGORY_SELECT)
+        self.categories = {row[0]: _category_from_row(row) for row in rows}
+        self.export_info = state["export_info"]
+        self.category_tree = state["category_tree"]
+        self.category_preorder = state["category_preorder"]
+        self.category_intervals = state["category_intervals"]
+        self.category_topics = state["category_topics"]
+        self.tag_topics = state["tag_topics"]
+        self.tag_counts = state["tag_counts"]
+        self.author_stats = state["author_stats"]
+        self.archive = state["archive"]
+        self.topics = SqliteTopics(self._connections)  # type: ignore[assignment]
+
+    def _query_topics(
+        self,
+        where: list[str],
+        params: list[Any],
+        order_by: str,
+        limit: int,
+        offset: int,
+    ) -> list[Topic]:
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        rows = self._connections.get().execute(
+            f"{_TOPIC_SELECT} {where_sql} ORDER BY {order_by} LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        )
+        return [_topic_from_row(row) for row in rows]
+
+    def _count_topics(self, where: list[str], params: list[Any]) -> int:
+        (count,) = (
+            self._connections.get()
+            .execute(f"SELECT COUNT(*) FROM topics WHERE {' AND '.join(where)}", params)
+            .fetchone()
+        )
+        return int(count)
+
+    @staticmethod
+    def _filter(topic_filter: TopicFilter) -> tuple[list[str], list[Any]]:
+        """WHERE conditions equivalent to the in-memory facet masks."""
+        where: list[str] = []
+        params: list[Any] = []
+        for flag in FLAGS:
+            wanted = getattr(topic_filter, flag)
+            if wanted is not None:
+                where.append(f"{flag} = ?")
+                params.append(wanted)
+        for tag in topic_filter.tags:
+            where.append("topic_id IN (SELECT topic_id FROM topic_tags WHERE tag = ?)")
+            params.append(tag)
+        if topic_filter.author_id is not None:
+            where.append("author_id = ?")
+            params.append(topic_filter.author_id)
+        if topic_filter.created_after is not None:
+            where.append("created >= ?")
+            params.append(_format_datetime(topic_filter.created_after))
+        if topic_filter.created_before is not None:
+            where.append("created < ?")
+            params.append(_format_datetime(topic_filter.created_before))
+        return where, params
+
+    @staticmethod
+    def _sort_columns(sort_by: str, order: str, pinned_first: bool) -> list[str]:
+        """Non NULL columns sorted like topic_sort_key, topic_id excepted.
+
+        Each combination has an index (prefixed by category_id for the pinned
+        first listings) serving both the ORDER BY and the row-value seek.
+        """
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Unsupported sort column: {sort_by}")
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unsupported sort order: {order}")
+        columns = [f"{sort_by}_{order}" if sort_by in DATE_SORT_COLUMNS else sort_by]
+        if pinned_first:
+            columns.insert(0, "pinned" if order == "desc" else "unpinned")
+        return columns
+
+    @classmethod
+    def _order_by(cls, sort_by: str, order: str, pinned_first: bool = False) -> str:
+        direction = "DESC" if order == "desc" else "ASC"
+        columns = [*cls._sort_columns(sort_by, order, pinned_first), "topic_id"]
+        return ", ".join(f"{column} {direction}" for column in columns)
+
+    @classmethod
+    def _seek(
+        cls, after: tuple[Any, ...], sort_by: str, order: str, pinned_first: bool
+    ) -> tuple[str, list[Any]]:
+        """Row-value condition selecting the topics after a topic_sort_key."""
+        columns = [*cls._sort_columns(sort_by, order, pinned_first), "topic_id"]
+        # Clé: ([épinglé,] présence, valeur, topic_id); la présence est portée
+        # par la valeur de remplacement des dates manquantes
+        value = after[-2]
+        if isinstance(value, datetime):
+            value = _format_datetime(value)
+        elif value is None and sort_by in DATE_SORT_COLUMNS:
+            value = MISSING_DATES[order]
+        params = [*after[: len(columns) - 2], value, after[-1]]
+        operator = "<" if order == "desc" else ">"
+        placeholders = ", ".join("?" * len(params))
+        return f"({', '.join(columns)}) {operator} ({placeholders})", params
+
+    def get_category_topics(
+        self,
+        category_id: int,
+        page: int = 1,
+        page_size: int = 20,
+        sort_by: str = "created",
+        order: str = "desc",
+        after: tuple[Any, ...] | None = None,
+        topic_filter: TopicFilter | None = None,
+        include_descendants: bool = False,
+    ) -> tuple[list[Topic], int]:
+        category_ids = (
+            self.get_subtree_category_ids(category_id)
+            if include_descendants
+            else [category_id]
+        )
+        if not category_ids:
+            return [], 0
+        where = [f"category_id IN ({', '.join('?' * len(category_ids))})"]
+        params: list[Any] = list(category_ids)
+        if topic_filter is not None and not topic_filter.is_empty():
+            conditions, filter_params = self._filter(topic_filter)
+            where.extend(conditions)
+            params.extend(filter_params)
+            total = self._count_topics(where, params)
+        else:
+            total = sum(len(self.category_topics.get(cid, [])) for cid in category_ids)
+        order_by = self._order_by(sort_by, order, pinned_first=True)
+        offset = (page - 1) * page_size
+        if after is not None:
+            condition, seek_params = self._seek(after, sort_by, order, True)
+            where.append(condition)
+            params.extend(seek_params)
+            offset = 0
+        topics = self._query_topics(where, params, order_by, page_size, offset)
+        return topics, total
+
+    def get_topic(self, topic_id: int) -> Topic | None:
+        row = (
+            self._connections.get()
+            .execute(
+                f"SELECT {', '.join(f't.{c}' for c in TOPIC_COLUMNS)},"
+                " b.content, b.content_html FROM topics t"
+                " JOIN topic_bodies b USING (topic_id) WHERE topic_id = ?",
+                (topic_id,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        topic = _topic_from_row(row[: len(TOPIC_COLUMNS)])
+        return replace(topic, content=row[-2], content_html=row[-1])
+
+    def get_all_topics(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        sort_by: str = "created",
+        order: str = "desc",
+        after: tuple[Any, ...] | None = None,
+        topic_filter: TopicFilter | None = None,
+    ) -> tuple[list[Topic], int]:
+        where: list[str] = []
+        params: list[Any] = []
+        if topic_filter is not None and not topic_filter.is_empty():
+            where, params = self._filter(topic_filter)
+            total = self._count_topics(where, params)
+        else:
+            total = len(self.topics)
+        order_by = self._order_by(sort_by, order)
+        offset = (page - 1) * page_size
+        if after is not None:
+            condition, seek_params = self._seek(after, sort_by, order, False)
+            where.append(condition)
+            params.extend(seek_params)
+            offset = 0
+        topics = self._query_topics(where, params, order_by, page_size, offset)
+        return topics, total
+
+    def get_tag_topics(
+        self,
+        tag: str,
+        page: int = 1,
+        page_size: int = 20,
+        sort_by: str = "created",
+        order: str = "desc",
+        after: tuple[Any, ...] | None = None,
+    ) -> tuple[list[Topic], int]:
+        total = len(self.tag_topics.get(tag, []))
+        where = ["topic_id IN (SELECT topic_id FROM topic_tags WHERE tag = ?)"]
+        params: list[Any] = [tag]
+        order_by = self._order_by(sort_by, order)
+        offset = (page - 1) * page_size
+        if after is not None:
+            condition, seek_params = self._seek(after, sort_by, order, False)
+            where.append(condition)
+            params.extend(seek_params)
+            offset = 0
+        topics = self._query_topics(where, params, order_by, page_size, offset)
+        return topics, total
+
+    def get_author_topics(
+        self,
+        author_id: int,
+        page: int = 1,
+        page_size: int = 20,
+        sort_by: str = "created",
+        order: str = "desc",
+        after: tuple[Any, ...] | None = None,
+    ) -> tuple[list[Topic], int]:
+        stats = self.author_stats.get(author_id)
+        total = stats.topic_count if stats is not None else 0
+        where, params = ["author_id = ?"], [author_id]
+        order_by = self._order_by(sort_by, order)
+        offset = (page - 1) * page_size
+        if after is not None:
+            condition, seek_params = self._seek(after, sort_by, order, False)
+            where.append(condition)
+            params.extend(seek_params)
+            offset = 0
+        topics = self._query_topics(where, params, order_by, page_size, offset)
+        return topics, total
+
+    def get_archive_topics(
+        self,
+        year: int,
+        month: int,
+        page: int = 1,
+        page_size: int = 20,
+        order: str = "desc",
+        after: tuple[Any, ...] | None = None,
+    ) -> tuple[list[Topic], int]:
+        bounds = self.archive.get((year, month))
+        if bounds is None:
+            return [], 0
+        next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        # Bornes sur la clé de tri pour parcourir le mois dans son index
+        (column,) = self._sort_columns("created", order, False)
+        where = [f"{column} >= ?", f"{column} < ?"]
+        params: list[Any] = [
+            _format_datetime(datetime(year, month, 1)),
+            _format_datetime(datetime(*next_month, 1)),
+        ]
+        order_by = self._order_by("created", order)
+        offset = (page - 1) * page_size
+        if after is not None:
+            condition, seek_params = self._seek(after, "created", order, False)
+            where.append(condition)
+            params.extend(seek_params)
+            offset = 0
+        topics = self._query_topics(where, params, order_by, page_size, offset)
+        return topics, bounds[1] - bounds[0]
+
+    def get_recent_topics(self, limit: int = 10) -> list[Topic]:
+        return self._query_topics([], [], self._order_by("created", "desc"), limit, 0)
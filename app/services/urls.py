@@ -0,0 +1,59 @@
+"""Canonical URL paths of categories and topics (NodeBB format: {id}/{slug})."""
+
+from collections.abc import Callable
+from typing import Protocol, TypeVar
+
+
+class _Addressable(Protocol):
+    @property
+    def url_path(self) -> str: ...
+
+
+R = TypeVar("R", bound=_Addressable)
+
+
+def parse_id_from_path(path: str) -> int:
+    """Extract ID from path like '20/some-slug', '20-some-slug' (legacy), or '20'."""
+    # Nouveau format: id/slug
+    if "/" in path:
+        return int(path.split("/", 1)[0])
+    # Ancien format (legacy): id-slug
+    if "-" in path:
+        return int(path.split("-", 1)[0])
+    # ID seul
+    return int(path)
+
+
+def category_url_path(category_id: int, slug: str) -> str:
+    """URL path of a category, computed once when its record is built."""
+    # Le slug peut contenir un chemin (ex: "parent/child"), on prend la derniere partie
+    slug_part = slug.split("/")[-1] if "/" in slug else slug
+    return f"{category_id}/{slug_part}" if slug_part else str(category_id)
+
+
+def topic_url_path(topic_id: int, slug: str) -> str:
+    """URL path of a topic, computed once when its record is built."""
+    if slug:
+        # slug contient "{id}-{title}", on extrait juste le titre
+        parts = slug.split("-", 1)
+        title_slug = parts[1] if len(parts) > 1 else ""
+        return f"{topic_id}/{title_slug}" if title_slug else str(topic_id)
+    return str(topic_id)
+
+
+def resolve_path(path: str, lookup: Callable[[int], R | None]) -> tuple[R, str | None]:
+    """Find the record addressed by a URL path and its canonical path if different.
+
+    Returns (record, None) when the path is canonical and should be served, or
+    (record, canonical_path) when the client should be redirected. Raises
+    LookupError when the path does not address a known record.
+    """
+    try:
+        record_id = parse_id_from_path(path)
+    except ValueError:
+        raise LookupError(path) from None
+    record = lookup(record_id)
+    if record is None:
+        raise LookupError(path)
+    canonical = record.url_path
+    return record, None if path == canonical else canonical
@@ -0,0 +1,71 @@
+import asyncio
+import importlib.util
+import logging
+from pathlib import Path
+
+from app.services.data_loader import DataStore
+from app.services.scanner import is_source_file
+from app.services.snapshot import Manifest, build_manifest
+
+logger = logging.getLogger(__name__)
+
+
+async def watch_data_store(store: DataStore, poll_interval: float = 2.0) -> None:
+    """Apply changes under the store's data path until cancelled.
+
+    Uses inotify (through watchfiles) when available and falls back to polling
+    file fingerprints. Changes are applied on the event loop, between requests,
+    so handlers never see a half-patched store.
+    """
+    if importlib.util.find_spec("watchfiles") is None:
+        await _poll_changes(store, poll_interval)
+    else:
+        await _watch_changes(store)
+
+
+async def _watch_changes(store: DataStore) -> None:
+    from watchfiles import Change, awatch
+
+    def source_filter(change: Change, path: str) -> bool:
+        return is_source_file(Path(path).name)
+
+    async for changes in awatch(store.data_path, watch_filter=source_filter):
+        changed: set[Path] = set()
+        removed: set[Path] = set()
+        for change, raw_path in changes:
+            path = Path(raw_path)
+            if change == Change.deleted:
+                removed.add(path)
+                changed.discard(path)
+            else:
+                changed.add(path)
+                removed.discard(path)
+        _apply(store, changed, removed)
+
+
+async def _poll_changes(store: DataStore, poll_interval: float) -> None:
+    manifest = await asyncio.to_thread(build_manifest, store.data_path)
+    while True:
+        await asyncio.sleep(poll_interval)
+        current = await asyncio.to_thread(build_manifest, store.data_path)
+        changed, removed = diff_manifests(manifest, current)
+        manifest = current
+        _apply(
+            store,
+            {store.data_path / name for name in changed},
+            {store.data_path / name for name in removed},
+        )
+
+
+def diff_manifests(old: Manifest, new: Manifest) -> tuple[set[str], set[str]]:
+    """Return (added or modified, deleted) relative paths between two manifests."""
+    changed = {name for name, stamp in new.items() if old.get(name) != stamp}
+    removed = old.keys() - new.keys()
+    return changed, removed
+
+
+def _apply(store: DataStore, changed: set[Path], removed: set[Path]) -> None:
+    if not changed and not removed:
+        return
+    store.apply_file_changes(changed, removed)
+    logger.info("Reloaded %d changed and %d deleted files", len(changed), len(removed))
@@ -1,6 +1,9 @@
 #!/bin/sh
 
 if [ $# -eq 0 ]; then
+    if [ "$SERVER_MODE" = "prefork" ]; then
+        exec python -m app.server --host 0.0.0.0 --port 8080
+    fi
     exec uvicorn app.main:app --host 0.0.0.0 --port 8080
 else
     exec "$@"
@@ -9,9 +9,7 @@ from httpx import ASGITransport, AsyncClient
 
 from app.config import settings
 from app.main import app
-from app.routers import api as api_router
-from app.routers import web as web_router
-from app.services import data_loader
+from app.services import data_loader, search
 
 
 @pytest.fixture(scope="session")
@@ -191,9 +189,8 @@ def mock_data_store(test_data_store, monkeypatch):
     monkeypatch.setattr(data_loader, "get_data_store", mock_get_data_store)
     monkeypatch.setattr(data_loader, "init_data_store", mock_init_data_store)
 
-    # Reset search service caches in routers
-    monkeypatch.setattr(web_router, "_search_service", None)
-    monkeypatch.setattr(api_router, "_search_service", None)
+    # Reset the shared search service
+    monkeypatch.setattr(search, "_search_service", None)
 
     return test_data_store
 
@@ -236,8 +233,7 @@ def real_client(real_data_store, monkeypatch) -> TestClient:
     monkeypatch.setattr(data_loader, "get_data_store", mock_get_data_store)
     monkeypatch.setattr(data_loader, "init_data_store", mock_init_data_store)
 
-    # Reset search service caches in routers
-    monkeypatch.setattr(web_router, "_search_service", None)
-    monkeypatch.setattr(api_router, "_search_service", None)
+    # Reset the shared search service
+    monkeypatch.setattr(search, "_search_service", None)
 
     return TestClient(app)
@@ -1,7 +1,16 @@
 """Integration tests for API endpoints."""
 
+from pathlib import Path
+
+import pytest
 from fastapi.testclient import TestClient
 
+from app.config import settings
+from app.main import app
+from app.services import data_loader
+from app.services.cursor import encode_cursor
+from app.services.data_loader import LoadState
+
 
 class TestHealthEndpoint:
     """Tests for health check endpoint."""
@@ -16,6 +25,55 @@ class TestHealthEndpoint:
         assert "categories_loaded" in data
 
 
+class TestReadiness:
+    """Tests for /health, /ready and data routes while loading."""
+
+    @pytest.fixture
+    def loading_client(self, monkeypatch: pytest.MonkeyPatch) -> TestClient:
+        monkeypatch.setattr(data_loader, "data_store", None)
+        monkeypatch.setattr(
+            data_loader,
+            "load_status",
+            data_loader.LoadStatus(state=data_loader.LoadState.LOADING),
+        )
+        return TestClient(app)
+
+    def test_health_live_while_loading(self, loading_client: TestClient):
+        """Test that /health answers before the store is ready."""
+        response = loading_client.get("/health")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "healthy"
+        assert data["state"] == "loading"
+        assert data["topics_loaded"] == 0
+
+    def test_ready_reports_loading(self, loading_client: TestClient):
+        """Test that /ready is 503 with Retry-After while loading."""
+        response = loading_client.get("/ready")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+        assert response.json()["state"] == "loading"
+
+    @pytest.mark.parametrize("url", ["/api/v1/info", "/api/v1/topics", "/"])
+    def test_data_routes_unavailable(self, loading_client: TestClient, url: str):
+        """Test that data routes return a fast 503 without loading."""
+        response = loading_client.get(url)
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+        assert data_loader.data_store is None
+
+    def test_ready_when_loaded(self, monkeypatch: pytest.MonkeyPatch, mock_data_store):
+        """Test that /ready is 200 once the store is loaded."""
+        monkeypatch.setattr(
+            data_loader,
+            "load_status",
+            data_loader.LoadStatus(state=data_loader.LoadState.READY),
+        )
+        response = TestClient(app).get("/ready")
+        assert response.status_code == 200
+        assert response.json()["state"] == "ready"
+
+
 class TestInfoEndpoint:
     """Tests for info endpoint."""
 
@@ -65,6 +123,23 @@ class TestCategoriesAPI:
         assert "subcategories" in data
         assert len(data["subcategories"]) == 1
 
+    def test_category_aggregates(self, client: TestClient):
+        """Test that categories expose direct and subtree aggregates."""
+        data = client.get("/api/v1/categories/1").json()
+        assert data["topic_count"] == 2
+        assert data["post_count"] == 8
+        assert data["total_topic_count"] == 3
+        assert data["total_post_count"] == 15
+        assert data["last_post"] == "2024-01-21T16:00:00"
+        [sub] = data["subcategories"]
+        assert sub["total_topic_count"] == 1
+        # Catégorie feuille: chiffres directs et de la sous-arborescence égaux
+        assert sub["post_count"] == sub["total_post_count"] == 7
+
+        tree = client.get("/api/v1/categories/tree").json()
+        assert tree[0]["total_topic_count"] == 3
+        assert tree[0]["children"][0]["topic_count"] == 1
+
     def test_get_category_not_found(self, client: TestClient):
         """Test getting non-existent category."""
         response = client.get("/api/v1/categories/999")
@@ -160,6 +235,162 @@ class TestTopicsAPI:
         assert "tags" in data
 
 
+class TestCategorySubtreeAPI:
+    """Tests for category listings including subcategories."""
+
+    def test_include_descendants(self, client: TestClient):
+        """Test that the parent listing merges the subcategory topics."""
+        data = client.get("/api/v1/categories/1/topics").json()
+        assert data["total"] == 2
+        data = client.get("/api/v1/categories/1/topics?include_descendants=true").json()
+        assert data["total"] == 3
+        # Épinglés d'abord, puis par date de création décroissante
+        assert [t["topic_id"] for t in data["items"]] == [100, 102, 101]
+
+    def test_include_descendants_cursor(self, client: TestClient):
+        """Test keyset paging through a subtree listing."""
+        params: dict[str, str | int] = {"include_descendants": "true", "page_size": 2}
+        first = client.get("/api/v1/categories/1/topics", params=params).json()
+        second = client.get(
+            "/api/v1/categories/1/topics",
+            params={**params, "cursor": first["next_cursor"]},
+        ).json()
+        ids = [t["topic_id"] for t in first["items"] + second["items"]]
+        assert ids == [100, 102, 101]
+
+
+class TestTopicFilters:
+    """Tests for faceted filters on topic listings."""
+
+    def test_filter_by_flag(self, client: TestClient):
+        """Test boolean filters on the global listing."""
+        data = client.get("/api/v1/topics?locked=true").json()
+        assert [t["topic_id"] for t in data["items"]] == [101]
+        assert data["total"] == 1
+
+    def test_filter_by_tags_and_author(self, client: TestClient):
+        """Test that all tags and the author must match."""
+        data = client.get("/api/v1/topics?tags=test&tags=important&author_id=1").json()
+        assert [t["topic_id"] for t in data["items"]] == [100]
+        data = client.get("/api/v1/topics?tags=test&author_id=2").json()
+        assert data["items"] == []
+        assert data["total"] == 0
+
+    def test_filter_by_date_range(self, client: TestClient):
+        """Test inclusive after and exclusive before bounds, with time zones."""
+        data = client.get(
+            "/api/v1/topics",
+            params={
+                "created_after": "2024-01-10T08:00:00",
+                "created_before": "2024-01-20T13:00:00+01:00",
+            },
+        ).json()
+        assert [t["topic_id"] for t in data["items"]] == [100, 101]
+
+    def test_filter_category_listing(self, client: TestClient):
+        """Test filters on a category listing."""
+        data = client.get("/api/v1/categories/1/topics?pinned=false").json()
+        assert [t["topic_id"] for t in data["items"]] == [101]
+
+    def test_filter_with_cursor(self, client: TestClient):
+        """Test keyset paging through a filtered listing."""
+        first = client.get("/api/v1/topics?deleted=false&page_size=2").json()
+        assert first["total"] == 3
+        second = client.get(
+            "/api/v1/topics",
+            params={"deleted": "false", "page_size": 2, "cursor": first["next_cursor"]},
+        ).json()
+        ids = [t["topic_id"] for t in first["items"] + second["items"]]
+        assert ids == [102, 100, 101]
+        assert second["next_cursor"] is None
+
+
+class TestTagsAPI:
+    """Tests for tag endpoints."""
+
+    def test_list_tags(self, client: TestClient):
+        """Test that tags are listed with their topic counts."""
+        response = client.get("/api/v1/tags")
+        assert response.status_code == 200
+        data = response.json()
+        assert {"name": "training", "topic_count": 1} in data
+        assert len(data) == 3
+
+    def test_list_tag_topics(self, client: TestClient):
+        """Test the paginated topics of a tag."""
+        response = client.get("/api/v1/tags/important/topics")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["items"][0]["topic_id"] == 100
+
+    def test_list_tag_topics_not_found(self, client: TestClient):
+        """Test that an unknown tag returns 404."""
+        response = client.get("/api/v1/tags/unknown/topics")
+        assert response.status_code == 404
+
+
+class TestAuthorsAPI:
+    """Tests for author endpoints."""
+
+    def test_get_author(self, client: TestClient):
+        """Test that author statistics are returned."""
+        response = client.get("/api/v1/authors/1")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["topic_count"] == 2
+        assert data["view_count"] == 350
+        assert data["first_activity"] == "2024-01-15T10:30:00"
+        assert data["last_activity"] == "2024-01-21T16:00:00"
+
+    def test_list_author_topics(self, client: TestClient):
+        """Test the paginated topics of an author."""
+        response = client.get("/api/v1/authors/1/topics?page_size=1")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert data["items"][0]["topic_id"] == 102
+        assert data["next_cursor"] is not None
+
+    def test_author_not_found(self, client: TestClient):
+        """Test that an unknown author returns 404."""
+        assert client.get("/api/v1/authors/999").status_code == 404
+        assert client.get("/api/v1/authors/999/topics").status_code == 404
+
+
+class TestArchiveAPI:
+    """Tests for archive endpoints."""
+
+    def test_archive_histogram(self, client: TestClient):
+        """Test topic counts per year and month."""
+        response = client.get("/api/v1/archive")
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "year": 2024,
+                "topic_count": 3,
+                "months": [{"year": 2024, "month": 1, "topic_count": 3}],
+            }
+        ]
+
+    def test_list_archive_topics(self, client: TestClient):
+        """Test the topics of a month with a cursor to the next page."""
+        data = client.get("/api/v1/archive/2024/1?order=asc&page_size=2").json()
+        assert data["total"] == 3
+        assert [t["topic_id"] for t in data["items"]] == [101, 100]
+        data = client.get(
+            "/api/v1/archive/2024/1",
+            params={"order": "asc", "page_size": 2, "cursor": data["next_cursor"]},
+        ).json()
+        assert [t["topic_id"] for t in data["items"]] == [102]
+        assert data["next_cursor"] is None
+
+    def test_empty_month_not_found(self, client: TestClient):
+        """Test that a month without topics returns 404."""
+        assert client.get("/api/v1/archive/2023/12").status_code == 404
+        assert client.get("/api/v1/archive/2024/13").status_code == 404
+
+
 class TestSearchAPI:
     """Tests for search API endpoint."""
 
@@ -191,6 +422,15 @@ class TestSearchAPI:
         data = response.json()
         assert len(data) <= 1
 
+    def test_search_fts5_backend(self, client: TestClient, monkeypatch):
+        """Test that the FTS5 backend returns the same response shape."""
+        monkeypatch.setattr(settings, "SEARCH_BACKEND", "fts5")
+        response = client.get("/api/v1/search?q=belongs")
+        assert response.status_code == 200
+        data = response.json()
+        assert [t["topic_id"] for t in data] == [102]
+        assert data[0]["title"] == "Subcategory Topic"
+
 
 class TestAPIValidation:
     """Tests for API input validation."""
@@ -219,3 +459,125 @@ class TestAPIValidation:
         """Test invalid order parameter."""
         response = client.get("/api/v1/topics?order=invalid")
         assert response.status_code == 422
+
+
+class TestCursorPagination:
+    """Tests for keyset pagination of the topic listings."""
+
+    def walk(self, client: TestClient, url: str) -> list[int]:
+        seen: list[int] = []
+        cursor = None
+        for _ in range(10):
+            params = {"page_size": 1, "sort_by": "view_count", "order": "desc"}
+            if cursor is not None:
+                params["cursor"] = cursor
+            response = client.get(url, params=params)
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(t["topic_id"] for t in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return seen
+        raise AssertionError("cursor pagination did not end")
+
+    def test_walk_all_topics(self, client: TestClient):
+        """Test that following next_cursor returns every topic once."""
+        assert self.walk(client, "/api/v1/topics") == [102, 100, 101]
+
+    def test_walk_category_topics(self, client: TestClient):
+        """Test cursor pagination on a category, pinned topics first."""
+        assert self.walk(client, "/api/v1/categories/1/topics") == [100, 101]
+
+    def test_last_page_has_no_cursor(self, client: TestClient):
+        """Test that next_cursor is absent when the listing is complete."""
+        response = client.get("/api/v1/topics?page_size=3")
+        assert response.json()["next_cursor"] is None
+
+    def test_invalid_cursor(self, client: TestClient):
+        """Test that a malformed or mismatched cursor is a 400."""
+        response = client.get("/api/v1/topics?cursor=garbage")
+        assert response.status_code == 400
+        first = client.get("/api/v1/topics?page_size=1").json()
+        response = client.get(
+            "/api/v1/topics",
+            params={"cursor": first["next_cursor"], "order": "asc"},
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        ("url", "values"),
+        [
+            ("/api/v1/topics", [True, "2020-01-01", 5]),
+            ("/api/v1/topics", [True, {"a": 1}, 5]),
+            ("/api/v1/topics", [True, None, 5]),
+            ("/api/v1/categories/1/topics", [True, 5]),
+        ],
+    )
+    def test_wrong_cursor_key(self, client: TestClient, url: str, values: list):
+        """Test that a cursor key of the wrong shape is a 400, not a 500."""
+        cursor = encode_cursor("view_count", "desc", tuple(values))
+        response = client.get(
+            url, params={"cursor": cursor, "sort_by": "view_count", "order": "desc"}
+        )
+        assert response.status_code == 400
+
+    def test_cursor_with_timezone(self, client: TestClient):
+        """Test that an offset-aware date in a cursor is a 400."""
+        cursor = encode_cursor(
+            "created", "desc", (True, "2024-01-15T10:30:00+02:00", 1)
+        )
+        response = client.get("/api/v1/topics", params={"cursor": cursor})
+        assert response.status_code == 400
+
+
+class TestLoadReportEndpoint:
+    """Tests for the admin load report endpoint."""
+
+    URL = "/api/v1/admin/load-report"
+
+    @pytest.fixture
+    def admin_token(self, monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+        """Enable the admin routes and return the matching headers."""
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+        return {"Authorization": "Bearer s3cret"}
+
+    def test_load_report(self, client: TestClient, admin_token: dict[str, str]):
+        """Test that the report of the current store is served."""
+        response = client.get(self.URL, headers=admin_token)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["source"] == "parse"
+        assert data["topics_loaded"] == 3
+        assert data["files"]["skipped"] == 0
+        assert "walk" in data["phases_seconds"]
+        assert all(not Path(f["path"]).is_absolute() for f in data["slowest_files"])
+
+    def test_disabled_without_token(self, client: TestClient):
+        """Test that the admin routes do not exist unless ADMIN_TOKEN is set."""
+        assert client.get(self.URL).status_code == 404
+
+    def test_requires_matching_token(
+        self, client: TestClient, admin_token: dict[str, str]
+    ):
+        """Test that a missing or wrong bearer token is rejected."""
+        assert client.get(self.URL).status_code == 401
+        response = client.get(self.URL, headers={"Authorization": "Bearer nope"})
+        assert response.status_code == 401
+
+    def test_served_while_loading(
+        self,
+        client: TestClient,
+        admin_token: dict[str, str],
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test that the report of the store being loaded bypasses the 503."""
+        store = data_loader.data_store
+        monkeypatch.setattr(data_loader, "data_store", None)
+        monkeypatch.setattr(data_loader.load_status, "state", LoadState.LOADING)
+        monkeypatch.setattr(data_loader.load_status, "store", store)
+        assert client.get("/api/v1/topics").status_code == 503
+        response = client.get(self.URL, headers=admin_token)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"]["state"] == "loading"
+        assert data["topics_loaded"] == 3
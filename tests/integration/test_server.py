@@ -0,0 +1,163 @@
+"""Integration tests for the preforking server entry point."""
+
+import gc
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from itertools import pairwise
+from pathlib import Path
+
+import httpx
+import pytest
+import uvicorn
+
+from app import server as server_module
+from app.routers import api as api_router
+from app.routers import web as web_router
+from app.server import PreforkServer, preload
+from app.services import search
+from app.services.data_loader import DataStore
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def _wait_healthy(url: str, timeout: float = 20.0) -> dict[str, object]:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            response = httpx.get(f"{url}/health", timeout=1.0)
+            if response.status_code == 200:
+                data: dict[str, object] = response.json()
+                return data
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            raise AssertionError("server did not become healthy")
+        time.sleep(0.1)
+
+
+@pytest.fixture
+def server(test_data_dir: Path) -> Iterator[tuple[subprocess.Popen[bytes], str]]:
+    """Preforking server on a free port, serving the test data."""
+    port = _free_port()
+    env = {**os.environ, "DATA_PATH": str(test_data_dir)}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--host", "127.0.0.1"]
+        + ["--port", str(port), "--workers", "2"],
+        env=env,
+        cwd=Path(__file__).parents[2],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    yield process, f"http://127.0.0.1:{port}"
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+class TestPreload:
+    """Tests for the master process preloading."""
+
+    def test_preload_shares_search_index(self, mock_data_store: DataStore):
+        """Test that both routers get the same warmed search service."""
+        try:
+            preload()
+        finally:
+            gc.unfreeze()
+        shared = search._search_service
+        assert shared is not None
+        assert shared.store is mock_data_store
+        assert api_router.get_search_service() is shared
+        assert web_router.get_search_service() is shared
+
+
+class TestPreforkServer:
+    """Tests for the forked workers."""
+
+    def test_serves_requests(self, server: tuple[subprocess.Popen[bytes], str]):
+        """Test that the workers serve the data loaded by the master."""
+        _, url = server
+        health = _wait_healthy(url)
+        assert health["topics_loaded"] == 3
+        response = httpx.get(f"{url}/api/v1/search", params={"q": "first"})
+        assert response.status_code == 200
+
+    def test_rolling_restart_and_shutdown(
+        self, server: tuple[subprocess.Popen[bytes], str]
+    ):
+        """Test that SIGHUP keeps serving and SIGTERM stops cleanly."""
+        process, url = server
+        _wait_healthy(url)
+
+        process.send_signal(signal.SIGHUP)
+        for _ in range(20):
+            assert _wait_healthy(url)["topics_loaded"] == 3
+
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=20) == 0
+
+
+class _CrashingServer:
+    """uvicorn.Server stand-in failing at startup."""
+
+    def __init__(self, config: uvicorn.Config) -> None:
+        self.config = config
+
+    def run(self, sockets: list[socket.socket]) -> None:
+        raise RuntimeError("startup failed")
+
+
+class TestWorkerCrashes:
+    """Tests for workers exiting with an error."""
+
+    @pytest.fixture
+    def prefork(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[PreforkServer]:
+        """Server whose workers crash at startup, with short restart delays."""
+        monkeypatch.setattr(server_module.uvicorn, "Server", _CrashingServer)
+        monkeypatch.setattr(server_module, "RESTART_BACKOFF", 0.01)
+        monkeypatch.setattr(server_module, "MAX_RESTARTS", 3)
+        prefork = PreforkServer(uvicorn.Config("app.main:app"), workers=1)
+        yield prefork
+        for pid in prefork.pids:
+            if pid:
+                prefork._terminate(pid)
+
+    def test_crash_exits_non_zero(self, prefork: PreforkServer):
+        """Test that a worker dying from an exception is not a clean exit."""
+        with socket.socket() as sock:
+            pid = prefork._spawn(sock)
+            _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 1
+
+    def test_crash_loop_backs_off_then_stops(self, prefork: PreforkServer):
+        """Test that crashing workers are restarted later and later, then given up."""
+        spawned: list[float] = []
+        spawn = prefork._spawn
+
+        def counting_spawn(sock: socket.socket) -> int:
+            spawned.append(time.monotonic())
+            return spawn(sock)
+
+        prefork._spawn = counting_spawn  # type: ignore[method-assign]
+        with socket.socket() as sock:
+            prefork.pids = [prefork._spawn(sock)]
+            deadline = time.monotonic() + 20
+            while not prefork._stop:
+                assert time.monotonic() < deadline, "crash loop not stopped"
+                prefork._reap(sock)
+                time.sleep(0.005)
+
+        assert prefork.exit_code == 1
+        # Premier lancement puis MAX_RESTARTS relances
+        assert len(spawned) == 4
+        gaps = [b - a for a, b in pairwise(spawned)]
+        assert gaps[1] >= 0.02 and gaps[2] >= 0.04
@@ -260,3 +260,64 @@ class TestStaticFiles:
         response = client.get("/static/css/style.css")
         assert "body" in response.text
         assert "header" in response.text
+
+
+class TestCategorySubtreePage:
+    """Tests for category pages including subcategory topics."""
+
+    def test_include_descendants(self, client: TestClient):
+        """Test that the parent page can list the subcategory topics."""
+        response = client.get("/category/1/test-category")
+        assert "Subcategory Topic" not in response.text
+        assert "include_descendants=true" in response.text
+        response = client.get("/category/1/test-category?include_descendants=true")
+        assert response.status_code == 200
+        assert "Subcategory Topic" in response.text
+        assert "Topics (3)" in response.text
+
+
+class TestTagPage:
+    """Tests for tag page."""
+
+    def test_tag_page_lists_topics(self, client: TestClient):
+        """Test that the tag page lists the tagged topics."""
+        response = client.get("/tag/training")
+        assert response.status_code == 200
+        assert "Subcategory Topic" in response.text
+        assert "First Test Topic" not in response.text
+
+    def test_topic_page_links_tags(self, client: TestClient):
+        """Test that topic tags link to their tag page."""
+        response = client.get("/topic/100/first-test-topic")
+        assert 'href="/tag/important"' in response.text
+
+    def test_tag_page_not_found(self, client: TestClient):
+        """Test that an unknown tag returns an HTML 404."""
+        response = client.get("/tag/unknown")
+        assert response.status_code == 404
+        assert "text/html" in response.headers["content-type"]
+
+
+class TestArchivePages:
+    """Tests for archive pages."""
+
+    def test_archive_index(self, client: TestClient):
+        """Test that the archive index links to the months with topics."""
+        response = client.get("/archive")
+        assert response.status_code == 200
+        assert 'href="/archive/2024/1"' in response.text
+        assert "Janvier" in response.text
+
+    def test_archive_month(self, client: TestClient):
+        """Test that a month page lists its topics chronologically."""
+        response = client.get("/archive/2024/1")
+        assert response.status_code == 200
+        text = response.text
+        assert text.index("Second Test Topic") < text.index("First Test Topic")
+        assert text.index("First Test Topic") < text.index("Subcategory Topic")
+
+    def test_archive_month_not_found(self, client: TestClient):
+        """Test that an empty month returns an HTML 404."""
+        response = client.get("/archive/2023/12")
+        assert response.status_code == 404
+        assert "text/html" in response.headers["content-type"]
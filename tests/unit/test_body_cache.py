@@ -0,0 +1,55 @@
+"""Unit tests for the topic body LRU cache."""
+
+import sys
+
+from app.services.body_cache import BodyCache
+
+
+def _entry_size(content: str, content_html: str) -> int:
+    return sys.getsizeof(content) + sys.getsizeof(content_html)
+
+
+class TestBodyCache:
+    """Tests for BodyCache class."""
+
+    def test_hit_and_miss_counters(self):
+        """Test that hits and misses are counted."""
+        cache = BodyCache(10_000)
+        assert cache.get(1) is None
+        cache.put(1, "content", "<p>content</p>")
+        assert cache.get(1) == ("content", "<p>content</p>")
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_evicts_least_recently_used(self):
+        """Test that the byte budget evicts the oldest entries first."""
+        size = _entry_size("a" * 100, "b" * 100)
+        cache = BodyCache(size * 2)
+        cache.put(1, "a" * 100, "b" * 100)
+        cache.put(2, "a" * 100, "b" * 100)
+        cache.get(1)
+        cache.put(3, "a" * 100, "b" * 100)
+
+        assert cache.get(2) is None
+        assert cache.get(1) is not None
+        assert cache.get(3) is not None
+        assert cache.evictions == 1
+        assert cache.size_bytes <= cache.max_bytes
+
+    def test_oversized_entry_not_cached(self):
+        """Test that a body larger than the budget is never stored."""
+        cache = BodyCache(100)
+        cache.put(1, "a" * 1000, "b" * 1000)
+        assert len(cache) == 0
+        assert cache.size_bytes == 0
+
+    def test_discard(self):
+        """Test that discarding an entry releases its bytes."""
+        cache = BodyCache(10_000)
+        cache.put(1, "content", "<p>content</p>")
+        cache.discard(1)
+        cache.discard(2)
+        assert len(cache) == 0
+        assert cache.size_bytes == 0
@@ -0,0 +1,71 @@
+"""Unit tests for keyset pagination cursors."""
+
+from datetime import datetime
+
+import pytest
+
+from app.services.cursor import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    """Tests for cursor encoding and validation."""
+
+    def test_round_trip_with_datetime(self):
+        """Test that a date sort key survives encoding."""
+        key = (True, True, datetime(2024, 1, 15, 10, 30), 100)
+        token = encode_cursor("created", "desc", key)
+        assert "=" not in token
+        assert decode_cursor(token, "created", "desc", pinned_first=True) == key
+
+    def test_round_trip_with_missing_value(self):
+        """Test keys of topics without a value for the sort field."""
+        key = (True, None, 7)
+        token = encode_cursor("last_post", "asc", key)
+        assert decode_cursor(token, "last_post", "asc") == key
+
+    def test_other_sort_rejected(self):
+        """Test that a cursor cannot be reused with another sort."""
+        token = encode_cursor("view_count", "desc", (True, 10, 3))
+        with pytest.raises(ValueError):
+            decode_cursor(token, "view_count", "asc")
+        with pytest.raises(ValueError):
+            decode_cursor(token, "rating", "desc")
+
+    @pytest.mark.parametrize("token", ["", "not-a-cursor", "e30", "W10"])
+    def test_garbage_rejected(self, token: str):
+        """Test that malformed tokens raise ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor(token, "created", "desc")
+
+    @pytest.mark.parametrize(
+        ("sort_by", "values", "pinned_first"),
+        [
+            # Date pour un tri par compteur, et inversement
+            ("view_count", [True, "2020-01-01", 5], False),
+            ("created", [True, 12, 5], False),
+            # Valeurs d'un type inattendu
+            ("view_count", [True, {"a": 1}, 5], False),
+            ("view_count", [True, True, 5], False),
+            ("created", [True, "not a date", 5], False),
+            # Présence incohérente avec la valeur
+            ("view_count", [True, None, 5], False),
+            ("view_count", [False, 5, 5], False),
+            # Date avec fuseau, non comparable aux dates naïves de l'export
+            ("created", [True, "2024-01-15T10:30:00+00:00", 5], False),
+            # Longueur ne correspondant pas à la liste
+            ("created", [True, "2024-01-15T10:30:00", 5], True),
+            ("created", ["2024-01-15T10:30:00", 5], False),
+            ("created", [True, True, "2024-01-15T10:30:00", 5], False),
+            # Drapeaux et topic_id typés
+            ("created", [1, "2024-01-15T10:30:00", 5], False),
+            ("created", [True, 0, "2024-01-15T10:30:00", 5], True),
+            ("created", [True, "2024-01-15T10:30:00", "5"], False),
+        ],
+    )
+    def test_wrong_key_shape_rejected(
+        self, sort_by: str, values: list, pinned_first: bool
+    ):
+        """Test that keys not shaped like topic_sort_key raise ValueError."""
+        token = encode_cursor(sort_by, "desc", tuple(values))
+        with pytest.raises(ValueError):
+            decode_cursor(token, sort_by, "desc", pinned_first)
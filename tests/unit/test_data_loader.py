@@ -1,8 +1,18 @@
 """Unit tests for data_loader service."""
 
+import shutil
+import threading
+from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Any
 
-from app.services.data_loader import DataStore
+import pytest
+
+from app.config import settings
+from app.services import data_loader
+from app.services.data_loader import DataStore, sort_topic_ids, topic_sort_key
+from app.services.facets import TopicFilter
 
 
 class TestDataStore:
@@ -190,3 +200,688 @@ class TestDataStoreEmpty:
         store = DataStore(tmp_path)
         store.load_all()
         assert len(store.topics) == 0
+
+
+class TestDataStoreParallelLoad:
+    """Tests for parallel topic ingestion."""
+
+    def test_parallel_load_matches_serial(
+        self, test_data_dir: Path, test_data_store: DataStore
+    ):
+        """Test that a process pool load produces the same store as a serial one."""
+        store = DataStore(test_data_dir, load_workers=2)
+        store.load_all()
+        assert store.topics == test_data_store.topics
+        assert list(store.topics) == list(test_data_store.topics)
+        assert store.category_topics == test_data_store.category_topics
+
+    def test_parallel_load_skips_invalid_files(self, tmp_path: Path):
+        """Test that invalid files are skipped by the workers too."""
+        (tmp_path / "bad-topic.md").write_text("No frontmatter here")
+        (tmp_path / "1-ok.md").write_text("---\ntopic_id: 1\ntitle: Ok\n---\n\nBody")
+
+        store = DataStore(tmp_path, load_workers=2)
+        store.load_all()
+        assert list(store.topics) == [1]
+        assert store.topics[1]["slug"] == "1-ok"
+
+
+class TestTopicOrderings:
+    """Tests for the precomputed per-category and global topic orderings."""
+
+    @pytest.fixture
+    def store(self, tmp_path: Path) -> DataStore:
+        """Category with ties, missing dates and pinned topics."""
+        cat_dir = tmp_path / "1-cat"
+        cat_dir.mkdir()
+        for tid in range(1, 13):
+            created = (
+                f"created: '2024-01-{tid % 4 + 1:02d}T10:00:00'\n" if tid % 5 else ""
+            )
+            (cat_dir / f"{tid}-t.md").write_text(
+                f"---\ntopic_id: {tid}\ncategory_id: 1\ntitle: T{tid}\n{created}"
+                f"view_count: {tid % 3}\nrating: {tid % 2}\n"
+                f"pinned: {'true' if tid in (4, 9) else 'false'}\n---\n\nBody"
+            )
+        store = DataStore(tmp_path)
+        store.load_all()
+        return store
+
+    @staticmethod
+    def reference(
+        store: DataStore, sort_by: str, order: str, pinned_first: bool = True
+    ) -> list[int]:
+        """Straightforward sort: pinned first, missing last, ties by id."""
+        topics = list(store.topics.values())
+        present = [t for t in topics if getattr(t, sort_by) is not None]
+        missing = [t for t in topics if getattr(t, sort_by) is None]
+        reverse = order == "desc"
+        present.sort(key=lambda t: (getattr(t, sort_by), t.topic_id), reverse=reverse)
+        missing.sort(key=lambda t: t.topic_id, reverse=reverse)
+        ordered = [t.topic_id for t in present + missing]
+        if not pinned_first:
+            return ordered
+        pinned = [tid for tid in ordered if store.topics[tid].pinned]
+        return pinned + [tid for tid in ordered if tid not in pinned]
+
+    @pytest.mark.parametrize(
+        "sort_by", ["created", "last_post", "view_count", "rating"]
+    )
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_listing_matches_reference(
+        self, store: DataStore, sort_by: str, order: str
+    ):
+        """Test every ordering against a plain sort, across pages."""
+        pages = []
+        for page in range(1, 5):
+            topics, total = store.get_category_topics(1, page, 5, sort_by, order)
+            assert total == 12
+            pages.extend(t.topic_id for t in topics)
+        assert pages == self.reference(store, sort_by, order)
+
+    @pytest.mark.parametrize(
+        "sort_by", ["created", "last_post", "view_count", "rating"]
+    )
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_global_listing_matches_reference(
+        self, store: DataStore, sort_by: str, order: str
+    ):
+        """Test get_all_topics against a plain sort without pinned priority."""
+        topics, total = store.get_all_topics(1, 100, sort_by, order)
+        assert total == 12
+        assert [t.topic_id for t in topics] == self.reference(
+            store, sort_by, order, pinned_first=False
+        )
+
+    @pytest.mark.parametrize(
+        "sort_by", ["created", "last_post", "view_count", "rating"]
+    )
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_seek_after_walks_every_topic(
+        self, store: DataStore, sort_by: str, order: str
+    ):
+        """Test keyset pages chained by the sort key of the last topic."""
+        for pinned_first, listing in (
+            (True, partial(store.get_category_topics, 1)),
+            (False, store.get_all_topics),
+        ):
+            seen: list[int] = []
+            after = None
+            while True:
+                topics, _ = listing(1, 5, sort_by, order, after)
+                if not topics:
+                    break
+                seen.extend(t.topic_id for t in topics)
+                after = topic_sort_key(
+                    topics[-1], sort_by, order == "desc", pinned_first
+                )
+            assert seen == self.reference(store, sort_by, order, pinned_first)
+
+    def test_recent_topics(self, store: DataStore):
+        """Test that recent topics are the head of the created desc ordering."""
+        recent = [t.topic_id for t in store.get_recent_topics(4)]
+        assert recent == store.topic_orderings["created", "desc"][:4]
+        # Topics sans date en dernier
+        assert store.topics[recent[0]].created is not None
+        assert store.topic_orderings["created", "desc"][-1] in (5, 10)
+
+    def test_rejects_unknown_sort(self, store: DataStore):
+        """Test that an unknown sort field is an error, not an empty page."""
+        with pytest.raises(ValueError):
+            store.get_category_topics(1, sort_by="title")
+
+    def test_rebuilt_on_change(self, store: DataStore, tmp_path: Path):
+        """Test that a modified topic moves in the orderings."""
+        topic_file = tmp_path / "1-cat" / "3-t.md"
+        topic_file.write_text(
+            topic_file.read_text().replace("view_count: 0", "view_count: 99")
+        )
+        store.apply_file_changes({topic_file}, set())
+        topics, _ = store.get_category_topics(1, sort_by="view_count", order="desc")
+        # Les épinglés (4, 9) restent en tête
+        assert [t.topic_id for t in topics[:3]] == [4, 9, 3]
+        assert [t.topic_id for t in topics] == self.reference(
+            store, "view_count", "desc"
+        )
+        all_topics, _ = store.get_all_topics(sort_by="view_count", order="desc")
+        assert all_topics[0].topic_id == 3
+
+    def test_global_orderings_patched(self, store: DataStore, tmp_path: Path):
+        """Test that edits and deletions keep every global ordering sorted."""
+        cat_dir = tmp_path / "1-cat"
+        edits = {
+            3: ("view_count: 0", "view_count: 99"),
+            # Date retirée puis ajoutée: passage dans et hors des manquants
+            6: ("created: '2024-01-03T10:00:00'\n", ""),
+            10: ("title: T10\n", "title: T10\ncreated: '2023-12-01T10:00:00'\n"),
+            7: ("pinned: false", "pinned: true"),
+        }
+        for tid, (old, new) in edits.items():
+            topic_file = cat_dir / f"{tid}-t.md"
+            topic_file.write_text(topic_file.read_text().replace(old, new))
+            store.apply_file_changes({topic_file}, set())
+        removed = cat_dir / "8-t.md"
+        removed.unlink()
+        store.apply_file_changes(set(), {removed})
+
+        assert store.topics[6].created is None
+        assert store.topics[10].created is not None
+        for sort_by in ("created", "last_post", "view_count", "rating"):
+            for order in ("asc", "desc"):
+                assert store.topic_orderings[sort_by, order] == self.reference(
+                    store, sort_by, order, pinned_first=False
+                )
+
+
+class TestCategoryAggregates:
+    """Tests for the precomputed recursive category aggregates."""
+
+    def test_direct_and_subtree_counts(self, test_data_store: DataStore):
+        """Test that parents include the topics and posts of their subcategories."""
+        parent = test_data_store.categories[1]
+        assert parent.topic_count == 2
+        assert parent.post_count == 8
+        assert parent.total_topic_count == 3
+        assert parent.total_post_count == 15
+        sub = test_data_store.categories[2]
+        assert sub.topic_count == 1
+        assert sub.post_count == 7
+        assert sub.total_topic_count == 1
+        assert sub.total_post_count == 7
+
+    def test_subtree_last_post(self, test_data_store: DataStore):
+        """Test that last_post is the latest post of the whole subtree."""
+        last_post = test_data_store.categories[1].last_post
+        assert last_post is not None
+        assert last_post.isoformat() == "2024-01-21T16:00:00"
+
+    def test_category_tree_uses_aggregates(self, test_data_store: DataStore):
+        """Test that tree nodes carry the precomputed counts."""
+        [root] = test_data_store.build_category_tree(0)
+        assert root["topic_count"] == 2
+        assert root["total_topic_count"] == 3
+        assert root["children"][0]["topic_count"] == 1
+
+    def test_ancestors(self, test_data_store: DataStore):
+        """Test that categories carry their parent chain, root first."""
+        assert test_data_store.categories[1].ancestors == ()
+        assert test_data_store.categories[2].ancestors == (1,)
+
+    def test_parent_cycle(self, tmp_path: Path):
+        """Test that a parent_cid cycle does not loop forever."""
+        for cid, parent in ((1, 2), (2, 1)):
+            cat_dir = tmp_path / f"{cid}-cat"
+            cat_dir.mkdir()
+            (cat_dir / "_category.yml").write_text(
+                f"id: {cid}\nname: Cat {cid}\nparent_cid: {parent}\n"
+            )
+            (cat_dir / f"{cid}0-topic.md").write_text(
+                f"---\ntopic_id: {cid}0\ncategory_id: {cid}\npost_count: 1\n---\n"
+            )
+        store = DataStore(tmp_path)
+        store.load_all()
+        assert store.categories[1].total_topic_count == 2
+        assert store.categories[2].total_post_count == 2
+        assert sorted(store.category_preorder) == [1, 2]
+
+
+class TestCategorySubtree:
+    """Tests for subtree listings over the pre-order category intervals."""
+
+    # catégorie -> parent: 1 > (2 > 3, 4) et 5 à la racine
+    PARENTS = {1: 0, 2: 1, 3: 2, 4: 1, 5: 0}
+
+    @pytest.fixture
+    def store(self, tmp_path: Path) -> DataStore:
+        """Five categories with topics of varied dates, views and pins."""
+        for cid, parent in self.PARENTS.items():
+            cat_dir = tmp_path / f"{cid}-cat"
+            cat_dir.mkdir()
+            (cat_dir / "_category.yml").write_text(
+                f"id: {cid}\nname: Cat {cid}\nparent_cid: {parent}\norder: {cid}\n"
+            )
+            for tid in range(cid * 10, cid * 10 + cid + 1):
+                (cat_dir / f"{tid}-t.md").write_text(
+                    f"---\ntopic_id: {tid}\ncategory_id: {cid}\n"
+                    f"created: '2024-01-{tid % 28 + 1:02d}T10:00:00'\n"
+                    f"view_count: {tid % 4}\npinned: {str(tid % 7 == 0).lower()}\n---\n"
+                )
+        store = DataStore(tmp_path)
+        store.load_all()
+        return store
+
+    def expected(self, store: DataStore, cids: set[int], sort_by: str, order: str):
+        topic_ids = [t.topic_id for t in store.topics.values() if t.category_id in cids]
+        return sort_topic_ids(topic_ids, store.topics, sort_by, order, True)
+
+    def test_intervals(self, store: DataStore, test_data_store: DataStore):
+        """Test that each subtree is a contiguous slice of the pre-order."""
+        assert test_data_store.category_preorder == [1, 2]
+        assert test_data_store.get_subtree_category_ids(1) == [1, 2]
+        assert store.category_preorder == [1, 2, 3, 4, 5]
+        assert store.category_intervals == {
+            1: (0, 4),
+            2: (1, 3),
+            3: (2, 3),
+            4: (3, 4),
+            5: (4, 5),
+        }
+        assert store.get_subtree_category_ids(2) == [2, 3]
+        assert store.get_subtree_category_ids(99) == []
+
+    @pytest.mark.parametrize("sort_by", ["created", "view_count"])
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_subtree_pages(self, store: DataStore, sort_by: str, order: str):
+        """Test merged subtree pages, by offset and by cursor, pinned first."""
+        expected = self.expected(store, {1, 2, 3, 4}, sort_by, order)
+        pages = []
+        for page in range(1, 5):
+            topics, total = store.get_category_topics(
+                1, page, 4, sort_by, order, include_descendants=True
+            )
+            assert total == len(expected)
+            pages.extend(t.topic_id for t in topics)
+        assert pages == expected
+
+        key = partial(topic_sort_key, sort_by=sort_by, descending=order == "desc")
+        walked: list[int] = []
+        after = None
+        while True:
+            topics, _ = store.get_category_topics(
+                1, 1, 3, sort_by, order, after, include_descendants=True
+            )
+            if not topics:
+                break
+            walked.extend(t.topic_id for t in topics)
+            after = key(topics[-1], pinned_first=True)
+        assert walked == expected
+
+    @pytest.mark.parametrize("sort_by", ["created", "view_count"])
+    def test_filtered_subtree(self, store: DataStore, sort_by: str):
+        """Test that filters apply to the whole subtree."""
+        topic_filter = TopicFilter(pinned=False, created_after=datetime(2024, 1, 10))
+        expected = [
+            tid
+            for tid in self.expected(store, {2, 3}, sort_by, "desc")
+            if not store.topics[tid].pinned
+            and store.topics[tid].created >= datetime(2024, 1, 10)
+        ]
+        topics, total = store.get_category_topics(
+            2, 1, 20, sort_by, "desc", None, topic_filter, include_descendants=True
+        )
+        assert [t.topic_id for t in topics] == expected
+        assert total == len(expected)
+        # Pages d'un topic: parcours des tris fusionnés plutôt que tri des rangs
+        singles = [
+            store.get_category_topics(
+                2, page, 1, sort_by, "desc", None, topic_filter, True
+            )[0][0].topic_id
+            for page in range(1, total + 1)
+        ]
+        assert singles == expected
+
+    def test_leaf_and_unknown(self, store: DataStore):
+        """Test that a leaf lists its own topics and an unknown category nothing."""
+        assert store.get_category_topics(
+            3, include_descendants=True
+        ) == store.get_category_topics(3)
+        assert store.get_category_topics(99, include_descendants=True) == ([], 0)
+
+
+class TestTagIndex:
+    """Tests for the tag inverted index."""
+
+    def test_tag_topics_and_counts(self, test_data_store: DataStore):
+        """Test that each tag maps to its sorted topic ids with counts."""
+        assert test_data_store.tag_topics == {
+            "test": [100],
+            "important": [100],
+            "training": [102],
+        }
+        assert test_data_store.tag_counts == [
+            ("important", 1),
+            ("test", 1),
+            ("training", 1),
+        ]
+
+    def test_get_tag_topics(self, test_data_store: DataStore):
+        """Test that tag listings are served from the precomputed orderings."""
+        topics, total = test_data_store.get_tag_topics("training")
+        assert total == 1
+        assert [t.topic_id for t in topics] == [102]
+        assert test_data_store.get_tag_topics("missing") == ([], 0)
+        with pytest.raises(ValueError):
+            test_data_store.get_tag_topics("training", sort_by="title")
+
+
+class TestAuthorIndex:
+    """Tests for the author index and statistics."""
+
+    def test_author_topics_and_stats(self, test_data_store: DataStore):
+        """Test that authors map to their topics with aggregated figures."""
+        assert test_data_store.author_topics == {1: [100, 102], 2: [101]}
+        stats = test_data_store.author_stats[1]
+        assert stats.topic_count == 2
+        assert stats.view_count == 350
+        assert stats.post_count == 12
+        assert stats.first_activity == datetime(2024, 1, 15, 10, 30)
+        assert stats.last_activity == datetime(2024, 1, 21, 16, 0)
+
+    def test_get_author_topics(self, test_data_store: DataStore):
+        """Test that author listings are served from the precomputed orderings."""
+        topics, total = test_data_store.get_author_topics(1, sort_by="view_count")
+        assert total == 2
+        assert [t.topic_id for t in topics] == [102, 100]
+        assert test_data_store.get_author_topics(999) == ([], 0)
+
+
+class TestArchive:
+    """Tests for the month buckets of the creation-date ordering."""
+
+    @pytest.fixture
+    def store(self, tmp_path: Path) -> DataStore:
+        """Topics spread over four months, two of them on the same date."""
+        dates = {
+            1: "2023-11-30T23:59:59",
+            2: "2023-12-01T00:00:00",
+            3: "2024-02-10T08:00:00",
+            4: "2023-12-15T12:00:00",
+            5: "2024-02-10T08:00:00",
+            6: None,
+            7: "2024-02-29T18:00:00",
+        }
+        (tmp_path / "1-cat").mkdir()
+        for tid, created in dates.items():
+            line = f"created: '{created}'\n" if created else ""
+            (tmp_path / "1-cat" / f"{tid}-t.md").write_text(
+                f"---\ntopic_id: {tid}\ncategory_id: 1\ntitle: T{tid}\n{line}---\n"
+            )
+        store = DataStore(tmp_path)
+        store.load_all()
+        return store
+
+    def test_buckets(self, store: DataStore, test_data_store: DataStore):
+        """Test that months map to contiguous ranges, undated topics excluded."""
+        assert test_data_store.archive == {(2024, 1): (0, 3)}
+        assert store.archive == {
+            (2023, 11): (0, 1),
+            (2023, 12): (1, 3),
+            (2024, 2): (3, 6),
+        }
+
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_get_archive_topics(self, store: DataStore, order: str):
+        """Test that month pages follow the creation-date ordering."""
+        expected = [3, 5, 7] if order == "asc" else [7, 5, 3]
+        topics, total = store.get_archive_topics(2024, 2, order=order)
+        assert [t.topic_id for t in topics] == expected
+        assert total == 3
+        topics, _ = store.get_archive_topics(2024, 2, 2, 2, order)
+        assert [t.topic_id for t in topics] == expected[2:]
+        topics, _ = store.get_archive_topics(2023, 12, order=order)
+        assert [t.topic_id for t in topics] == ([2, 4] if order == "asc" else [4, 2])
+        assert store.get_archive_topics(2024, 1, order=order) == ([], 0)
+
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_archive_cursor(self, store: DataStore, order: str):
+        """Test that keyset paging stays within the month."""
+        key = partial(topic_sort_key, sort_by="created", descending=order == "desc")
+        seen: list[int] = []
+        after = None
+        while True:
+            topics, _ = store.get_archive_topics(2024, 2, 1, 1, order, after)
+            if not topics:
+                break
+            seen.append(topics[0].topic_id)
+            after = key(topics[0])
+        assert seen == ([3, 5, 7] if order == "asc" else [7, 5, 3])
+
+
+class TestDataStoreIncremental:
+    """Tests for in-place patching from file changes."""
+
+    @pytest.fixture
+    def data_dir(self, test_data_dir: Path, tmp_path: Path) -> Path:
+        return Path(shutil.copytree(test_data_dir, tmp_path / "data"))
+
+    @pytest.fixture
+    def store(self, data_dir: Path) -> DataStore:
+        store = DataStore(data_dir)
+        store.load_all()
+        return store
+
+    def assert_matches_full_reload(self, store: DataStore) -> None:
+        fresh = DataStore(store.data_path)
+        fresh.load_all()
+        assert store.topics == fresh.topics
+        assert store.categories == fresh.categories
+        assert store.category_tree == fresh.category_tree
+        assert store.category_preorder == fresh.category_preorder
+        assert store.category_intervals == fresh.category_intervals
+        assert {cid: sorted(ids) for cid, ids in store.category_topics.items()} == {
+            cid: sorted(ids) for cid, ids in fresh.category_topics.items()
+        }
+        assert store.category_orderings == fresh.category_orderings
+        assert store.topic_orderings == fresh.topic_orderings
+        assert store.tag_topics == fresh.tag_topics
+        assert store.tag_orderings == fresh.tag_orderings
+        assert store.tag_counts == fresh.tag_counts
+        assert store.author_topics == fresh.author_topics
+        assert store.author_orderings == fresh.author_orderings
+        assert store.author_stats == fresh.author_stats
+        assert store.archive == fresh.archive
+
+    def test_modified_topic(self, store: DataStore, data_dir: Path):
+        """Test that a modified topic file replaces the topic."""
+        topic_file = data_dir / "1-test-category" / "101-second-test-topic.md"
+        topic_file.write_text(
+            topic_file.read_text().replace("category_id: 1", "category_id: 2")
+        )
+        store.apply_file_changes({topic_file}, set())
+        assert store.topics[101]["category_id"] == 2
+        assert 101 in store.category_topics[2]
+        assert 101 not in store.category_topics[1]
+        self.assert_matches_full_reload(store)
+
+    def test_added_and_removed_topic(self, store: DataStore, data_dir: Path):
+        """Test that added and deleted topic files are applied."""
+        new_file = data_dir / "1-test-category" / "103-new-topic.md"
+        new_file.write_text(
+            "---\ntopic_id: 103\ncategory_id: 1\ntitle: New Topic\n---\n\nBody"
+        )
+        old_file = data_dir / "1-test-category" / "2-test-subcategory"
+        old_file = old_file / "102-subcategory-topic.md"
+        old_file.unlink()
+
+        store.apply_file_changes({new_file}, {old_file})
+        assert 103 in store.topics
+        assert 102 not in store.topics
+        assert 2 not in store.category_topics
+        assert store.categories[1].total_topic_count == 3
+        assert store.categories[2].total_post_count == 0
+        self.assert_matches_full_reload(store)
+
+    def test_retagged_topic(self, store: DataStore, data_dir: Path):
+        """Test that tag changes move the topic between tag listings."""
+        topic_file = data_dir / "1-test-category" / "101-second-test-topic.md"
+        topic_file.write_text(
+            topic_file.read_text().replace("tags: []", "tags:\n  - training")
+        )
+        store.apply_file_changes({topic_file}, set())
+        assert store.tag_topics["training"] == [101, 102]
+
+        topic_file.unlink()
+        store.apply_file_changes(set(), {topic_file})
+        assert store.tag_topics["training"] == [102]
+        self.assert_matches_full_reload(store)
+
+    def test_reassigned_author(self, store: DataStore, data_dir: Path):
+        """Test that an author change moves the topic and refreshes the stats."""
+        topic_file = data_dir / "1-test-category" / "101-second-test-topic.md"
+        topic_file.write_text(
+            topic_file.read_text().replace("author_id: 2", "author_id: 1")
+        )
+        store.apply_file_changes({topic_file}, set())
+        assert store.author_topics == {1: [100, 101, 102]}
+        assert store.author_stats[1].topic_count == 3
+        assert 2 not in store.author_stats
+        self.assert_matches_full_reload(store)
+
+    def test_redated_topic(self, store: DataStore, data_dir: Path):
+        """Test that a new creation date moves the topic to another month."""
+        topic_file = data_dir / "1-test-category" / "101-second-test-topic.md"
+        topic_file.write_text(
+            topic_file.read_text().replace("created: '2024-01", "created: '2023-12")
+        )
+        store.apply_file_changes({topic_file}, set())
+        assert store.archive == {(2023, 12): (0, 1), (2024, 1): (1, 3)}
+        assert store.get_archive_topics(2023, 12) == ([store.topics[101]], 1)
+        self.assert_matches_full_reload(store)
+
+    def test_modified_category(self, store: DataStore, data_dir: Path):
+        """Test that a category moved to the root is re-attached in the tree."""
+        cat_file = data_dir / "1-test-category" / "2-test-subcategory"
+        cat_file = cat_file / "_category.yml"
+        cat_file.write_text(
+            cat_file.read_text().replace("parent_cid: 1", "parent_cid: 0")
+        )
+
+        store.apply_file_changes({cat_file}, set())
+        assert store.category_tree[0] == [1, 2]
+        assert 1 not in store.category_tree
+        assert store.categories[2].ancestors == ()
+        self.assert_matches_full_reload(store)
+
+    def test_removed_category(self, store: DataStore, data_dir: Path):
+        """Test that a deleted category file removes the category."""
+        cat_file = data_dir / "1-test-category" / "2-test-subcategory"
+        cat_file = cat_file / "_category.yml"
+        cat_file.unlink()
+
+        store.apply_file_changes(set(), {cat_file})
+        assert 2 not in store.categories
+        self.assert_matches_full_reload(store)
+
+    def test_listeners_notified(self, store: DataStore, data_dir: Path):
+        """Test that subscribers receive the old and new topic."""
+        events = []
+
+        class Listener:
+            def on_change(self, old, new):
+                events.append((old, new))
+
+        listener = Listener()
+        store.subscribe(listener.on_change)
+        topic_file = data_dir / "1-test-category" / "100-first-test-topic.md"
+        store.apply_file_changes(set(), {topic_file})
+        assert len(events) == 1
+        assert events[0][0]["topic_id"] == 100
+        assert events[0][1] is None
+
+
+class TestDataStoreLazyBodies:
+    """Tests for metadata-only residency."""
+
+    @pytest.fixture
+    def lazy_store(self, test_data_dir: Path) -> DataStore:
+        store = DataStore(test_data_dir, lazy_bodies=True)
+        store.load_all()
+        return store
+
+    def test_bodies_not_resident(self, lazy_store: DataStore):
+        """Test that only metadata is kept for each topic."""
+        topic = lazy_store.topics[100]
+        assert topic.title == "First Test Topic"
+        assert topic.content is None
+        assert topic.content_html is None
+
+    def test_get_topic_loads_body(
+        self, lazy_store: DataStore, test_data_store: DataStore
+    ):
+        """Test that get_topic returns the same body as an eager load."""
+        topic = lazy_store.get_topic(100)
+        assert topic is not None
+        assert topic["content"] == test_data_store.topics[100]["content"]
+        assert topic["content_html"] == test_data_store.topics[100]["content_html"]
+        assert lazy_store.topics[100].content is None
+
+    def test_body_cache_counters(self, lazy_store: DataStore):
+        """Test that repeated reads are served from the cache."""
+        assert lazy_store.body_cache is not None
+        lazy_store.get_topic(101)
+        lazy_store.get_topic(101)
+        stats = lazy_store.body_cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+
+class TestBackgroundLoad:
+    """Tests for background loading and load states."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_state(self, test_data_dir: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(data_loader, "data_store", None)
+        monkeypatch.setattr(data_loader, "load_status", data_loader.LoadStatus())
+        monkeypatch.setattr(settings, "DATA_PATH", test_data_dir)
+        monkeypatch.setattr(settings, "STORE_BACKEND", "memory")
+        monkeypatch.setattr(settings, "CACHE_PATH", None)
+        monkeypatch.setattr(settings, "LAZY_BODIES", False)
+
+    def test_ready_after_load(self):
+        """Test that the store is published once loaded."""
+        data_loader.start_background_load().join()
+        status = data_loader.load_status.as_dict()
+        assert status["state"] == data_loader.LoadState.READY
+        assert status["topics_done"] == status["topics_total"] == 3
+        assert len(data_loader.get_data_store().topics) == 3
+
+    def test_no_reload_while_loading(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that early callers get an error instead of a second load."""
+        release = threading.Event()
+        original = DataStore.load_all
+
+        def slow_load_all(store: DataStore) -> None:
+            release.wait(5)
+            original(store)
+
+        monkeypatch.setattr(DataStore, "load_all", slow_load_all)
+        loader = data_loader.start_background_load()
+        try:
+            assert data_loader.load_status.state == data_loader.LoadState.LOADING
+            with pytest.raises(data_loader.StoreNotReadyError):
+                data_loader.get_data_store()
+        finally:
+            release.set()
+            loader.join()
+        assert data_loader.get_data_store() is data_loader.data_store
+
+    def test_failed_load(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that a loading error is reported and not retried silently."""
+
+        def broken_load_all(store: DataStore) -> None:
+            raise OSError("disk gone")
+
+        monkeypatch.setattr(DataStore, "load_all", broken_load_all)
+        data_loader.start_background_load().join()
+        assert data_loader.load_status.state == data_loader.LoadState.FAILED
+        assert data_loader.load_status.error == "OSError: disk gone"
+        with pytest.raises(data_loader.StoreNotReadyError):
+            data_loader.get_data_store()
+
+    def test_progress_counts_serial_batches(
+        self, test_data_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that the serial loader advances the counter batch by batch."""
+        monkeypatch.setattr(data_loader, "SERIAL_BATCH_SIZE", 1)
+        seen = []
+        store = DataStore(test_data_dir)
+        original = data_loader._parse_topic_batch
+
+        def recording_batch(*args: Any, **kwargs: Any) -> list:
+            seen.append(store.topic_files_done)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(data_loader, "_parse_topic_batch", recording_batch)
+        store.load_all()
+        assert seen == [0, 1, 2]
+        assert store.topic_files_done == 3
@@ -0,0 +1,214 @@
+"""Unit tests for the facet bitmaps behind filtered topic listings."""
+
+import shutil
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from app.services.data_loader import DataStore, sort_topic_ids, topic_sort_key
+from app.services.facets import FacetIndex, TopicFilter
+from app.services.records import Topic
+
+FILTERS = {
+    "locked": TopicFilter(locked=True),
+    "not_locked": TopicFilter(locked=False),
+    "pinned": TopicFilter(pinned=True),
+    "tag": TopicFilter(tags=("alpha",)),
+    "tags": TopicFilter(tags=("alpha", "beta")),
+    "author": TopicFilter(author_id=2),
+    "after": TopicFilter(created_after=datetime(2024, 1, 10)),
+    "range": TopicFilter(
+        created_after=datetime(2024, 1, 5), created_before=datetime(2024, 1, 20)
+    ),
+    "combined": TopicFilter(deleted=False, tags=("beta",), author_id=1),
+    "none": TopicFilter(tags=("missing",)),
+}
+
+
+def matches(topic: Topic, topic_filter: TopicFilter) -> bool:
+    """Plain predicate equivalent of a TopicFilter."""
+    for flag in ("pinned", "locked", "deleted"):
+        wanted = getattr(topic_filter, flag)
+        if wanted is not None and getattr(topic, flag) != wanted:
+            return False
+    if not set(topic_filter.tags) <= set(topic.tags):
+        return False
+    if topic_filter.author_id is not None and topic.author_id != topic_filter.author_id:
+        return False
+    after, before = topic_filter.created_after, topic_filter.created_before
+    if after is not None or before is not None:
+        if topic.created is None:
+            return False
+        if after is not None and topic.created < after:
+            return False
+        if before is not None and topic.created >= before:
+            return False
+    return True
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory: pytest.TempPathFactory) -> DataStore:
+    """Two categories of topics with varied flags, tags, authors and dates."""
+    root = tmp_path_factory.mktemp("facets")
+    for cid in (1, 2):
+        (root / f"{cid}-cat").mkdir()
+    for tid in range(1, 61):
+        created = f"created: '2024-01-{tid % 28 + 1:02d}T10:00:00'\n" if tid % 7 else ""
+        tags = [tag for tag, step in (("alpha", 2), ("beta", 3)) if tid % step == 0]
+        (root / f"{tid % 2 + 1}-cat" / f"{tid}-t.md").write_text(
+            f"---\ntopic_id: {tid}\ncategory_id: {tid % 2 + 1}\ntitle: T{tid}\n"
+            f"{created}author_id: {tid % 3}\nview_count: {tid % 5}\n"
+            f"pinned: {str(tid % 11 == 0).lower()}\n"
+            f"locked: {str(tid % 4 == 0).lower()}\n"
+            f"deleted: {str(tid % 9 == 0).lower()}\n"
+            f"tags: {tags}\n---\n\nBody"
+        )
+    store = DataStore(root)
+    store.load_all()
+    return store
+
+
+def expected(
+    store: DataStore,
+    topic_filter: TopicFilter,
+    sort_by: str,
+    order: str,
+    category_id: int | None,
+) -> list[int]:
+    topic_ids = [
+        tid
+        for tid, topic in store.topics.items()
+        if matches(topic, topic_filter)
+        and (category_id is None or topic.category_id == category_id)
+    ]
+    pinned_first = category_id is not None
+    return sort_topic_ids(topic_ids, store.topics, sort_by, order, pinned_first)
+
+
+class TestFilteredListings:
+    """Tests for filtered listings against a plain filter and sort."""
+
+    @pytest.mark.parametrize("name", FILTERS)
+    @pytest.mark.parametrize("sort_by", ["created", "view_count"])
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    @pytest.mark.parametrize("category_id", [None, 1])
+    def test_pages_match_reference(
+        self,
+        store: DataStore,
+        name: str,
+        sort_by: str,
+        order: str,
+        category_id: int | None,
+    ):
+        """Test page-numbered and keyset walks of every filter."""
+        topic_filter = FILTERS[name]
+        reference = expected(store, topic_filter, sort_by, order, category_id)
+        if category_id is None:
+            listing = store.get_all_topics
+        else:
+            listing = partial(store.get_category_topics, category_id)
+
+        by_page: list[int] = []
+        for page in range(1, 12):
+            topics, total = listing(page, 7, sort_by, order, None, topic_filter)
+            assert total == len(reference)
+            by_page.extend(t.topic_id for t in topics)
+        assert by_page == reference
+
+        by_cursor: list[int] = []
+        after = None
+        while True:
+            topics, _ = listing(1, 7, sort_by, order, after, topic_filter)
+            if not topics:
+                break
+            by_cursor.extend(t.topic_id for t in topics)
+            after = topic_sort_key(
+                topics[-1], sort_by, order == "desc", category_id is not None
+            )
+        assert by_cursor == reference
+
+    def test_empty_filter_is_unfiltered(self, store: DataStore):
+        """Test that an empty filter uses the plain orderings."""
+        assert store.get_all_topics(1, 5, topic_filter=TopicFilter()) == (
+            store.get_all_topics(1, 5)
+        )
+
+
+class TestFacetIndex:
+    """Tests for the facet bitmaps."""
+
+    def test_date_bounds(self, store: DataStore):
+        """Test that date bounds exclude undated topics and empty ranges."""
+        facets = store.facets
+        in_range = TopicFilter(created_after=datetime(2024, 1, 1))
+        assert facets.mask(in_range).bit_count() == len(facets.created)
+        empty = TopicFilter(
+            created_after=datetime(2024, 2, 1), created_before=datetime(2024, 1, 1)
+        )
+        assert facets.mask(empty) == 0
+
+    def test_rebuilt_on_change(self, store: DataStore):
+        """Test that watched changes refresh the bitmaps."""
+        copy = DataStore(store.data_path)
+        copy.load_all()
+        # Suppression appliquée au store seul, le fichier reste pour les autres tests
+        copy.apply_file_changes(set(), {next(store.data_path.glob("*/4-t.md"))})
+        topics, total = copy.get_all_topics(
+            1, 100, topic_filter=TopicFilter(locked=True)
+        )
+        assert 4 not in [t.topic_id for t in topics]
+        assert total == len(topics)
+
+    def test_moved_in_place(self, store: DataStore, tmp_path: Path):
+        """Test that patched bitmaps and ranks equal a rebuilt index."""
+        data_path = Path(shutil.copytree(store.data_path, tmp_path / "data"))
+        copy = DataStore(data_path)
+        copy.load_all()
+
+        def edit(tid: int, old: str, new: str) -> None:
+            topic_file = next(data_path.glob(f"*/{tid}-t.md"))
+            topic_file.write_text(topic_file.read_text().replace(old, new))
+            copy.apply_file_changes({topic_file}, set())
+
+        # Mêmes positions (vues, tags, drapeaux), puis dates déplacées,
+        # retirées et ajoutées
+        edit(5, "view_count: 0", "view_count: 9")
+        edit(6, "tags: ['alpha', 'beta']", "tags: ['gamma']")
+        edit(8, "locked: true", "locked: false")
+        edit(10, "created: '2024-01-11", "created: '2023-12-01")
+        edit(12, "created: '2024-01-13T10:00:00'\n", "")
+        edit(14, "title: T14\n", "title: T14\ncreated: '2024-02-01T10:00:00'\n")
+        new_file = data_path / "1-cat" / "61-t.md"
+        new_file.write_text(
+            "---\ntopic_id: 61\ncategory_id: 1\ntitle: T61\nauthor_id: 7\n"
+            "created: '2024-01-15T10:00:00'\ntags: ['alpha']\n---\n\nBody"
+        )
+        removed = next(data_path.glob("*/3-t.md"))
+        removed.unlink()
+        copy.apply_file_changes({new_file}, {removed})
+
+        assert copy.topics[10].created == datetime(2023, 12, 1, 10)
+        assert copy.topics[12].created is None
+        assert copy.topics[14].created is not None
+        assert 61 in copy.topics and 3 not in copy.topics
+
+        facets = copy.facets
+        fresh = FacetIndex(copy.topics, copy.topic_orderings)
+        assert facets.ids == fresh.ids
+        assert facets.positions == fresh.positions
+        assert (facets.size, facets.all, facets.dated) == (
+            fresh.size,
+            fresh.all,
+            fresh.dated,
+        )
+        assert facets.created == fresh.created
+        assert facets.flags == fresh.flags
+        assert facets.tags == fresh.tags
+        assert facets.authors == fresh.authors
+        assert facets.categories == fresh.categories
+        # Rangs espacés: seul l'ordre qu'ils donnent compte
+        for key, ranks in facets.ranks.items():
+            by_rank = sorted(range(facets.size), key=ranks.__getitem__)
+            assert [facets.ids[pos] for pos in by_rank] == copy.topic_orderings[key]
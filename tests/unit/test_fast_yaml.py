@@ -0,0 +1,110 @@
+"""Unit tests for the fast frontmatter/YAML parser."""
+
+from pathlib import Path
+
+import frontmatter
+import pytest
+import yaml
+
+from app.services.fast_yaml import (
+    load_yaml,
+    parse_frontmatter,
+    parse_simple_mapping,
+    read_frontmatter,
+)
+
+
+class TestFixtureParity:
+    """The fast path must give exactly what the generic parsers give."""
+
+    def test_topic_files(self, test_data_dir: Path):
+        """Test parity with python-frontmatter on every test topic."""
+        topic_files = sorted(test_data_dir.rglob("*.md"))
+        assert topic_files
+        for md_file in topic_files:
+            post = frontmatter.load(md_file)
+            assert read_frontmatter(md_file) == (dict(post.metadata), post.content)
+
+    def test_topic_files_use_fast_path(self, test_data_dir: Path):
+        """Test that the export's frontmatter does not need the fallback."""
+        for md_file in test_data_dir.rglob("*.md"):
+            fm = md_file.read_text().split("---")[1]
+            assert parse_simple_mapping(fm) is not None
+
+    def test_category_files(self, test_data_dir: Path):
+        """Test parity with yaml.safe_load on every category file."""
+        cat_files = sorted(test_data_dir.rglob("_category.yml"))
+        assert cat_files
+        for cat_file in cat_files:
+            text = cat_file.read_text()
+            assert parse_simple_mapping(text) == yaml.safe_load(text)
+
+    def test_export_file(self, test_data_dir: Path):
+        """Test that the generic loader matches yaml.safe_load."""
+        text = (test_data_dir / "_export.yml").read_text()
+        assert load_yaml(text) == yaml.safe_load(text)
+
+
+class TestSimpleMapping:
+    """Tests for parse_simple_mapping."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "title: Hello world",
+            "title: 'It''s here'",
+            'color: "#ffffff"',
+            "topic_id: 42\nrating: -3",
+            "pinned: true\nlocked: false",
+            "tags:\n  - one\n  - two",
+            "tags:\n- one",
+            "tags: []",
+            "tags:\ntitle: Empty tags",
+            "icon:",
+            "title: Café crème",
+            "slug: 12/some-category",
+        ],
+    )
+    def test_fast_path_matches_yaml(self, text: str):
+        """Test values handled by the fast path."""
+        parsed = parse_simple_mapping(text)
+        assert parsed is not None
+        assert parsed == yaml.safe_load(text)
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "unknown_key: value",
+            "topic_id: 010",
+            "pinned: yes",
+            "rating: 1.5",
+            "title: 2024 meeting",
+            "created: 2024-01-15 10:30:00",
+            "title: a: b",
+            "title: value # comment",
+            'title: "escaped \\" quote"',
+            "tags: [a, b]",
+            "tags:\n  - a\n    - b",
+            "title: multi\n  line",
+            "# comment",
+        ],
+    )
+    def test_unusual_yaml_falls_back(self, text: str):
+        """Test that anything outside the restricted schema is rejected."""
+        assert parse_simple_mapping(text) is None
+
+
+class TestParseFrontmatter:
+    """Tests for parse_frontmatter."""
+
+    def test_fallback_gives_same_metadata(self):
+        """Test that unusual frontmatter goes through the generic loader."""
+        text = (
+            "---\ntopic_id: 1\ncreated: 2024-01-15 10:30:00\nextra: {a: 1}\n---\nBody"
+        )
+        post = frontmatter.loads(text)
+        assert parse_frontmatter(text) == (dict(post.metadata), post.content)
+
+    def test_no_frontmatter(self):
+        """Test a file without frontmatter."""
+        assert parse_frontmatter("No frontmatter here") == ({}, "No frontmatter here")
@@ -0,0 +1,133 @@
+"""Unit tests for the SQLite FTS5 search backend."""
+
+from pathlib import Path
+
+import pytest
+
+from app.compile import main as compile_main
+from app.config import settings
+from app.services.data_loader import DataStore
+from app.services.fts_search import Fts5SearchService, match_expression
+from app.services.search import SearchService, create_search_service
+from app.services.sqlite_store import SqliteDataStore
+
+
+def _ids(topics: list) -> list[int]:
+    return [t.topic_id for t in topics]
+
+
+class TestMatchExpression:
+    """Tests for the query to FTS5 expression conversion."""
+
+    def test_words_are_quoted_prefixes(self):
+        """Test that every word becomes a required quoted prefix."""
+        assert match_expression("Mirage 2000") == '"mirage"* AND "2000"*'
+
+    def test_operators_are_not_interpreted(self):
+        """Test that FTS5 syntax in the query is neutralised."""
+        assert match_expression('a OR "b" NOT c*') == (
+            '"a"* AND "or"* AND "b"* AND "not"* AND "c"*'
+        )
+
+    def test_no_words(self):
+        """Test queries without any word."""
+        assert match_expression("  -- ") is None
+
+
+class TestFts5SearchService:
+    """Tests for Fts5SearchService on the in-memory store."""
+
+    def test_title_search_matches_memory_backend(self, test_data_store: DataStore):
+        """Test that title prefix queries find the same topics."""
+        fts = Fts5SearchService(test_data_store)
+        memory = SearchService(test_data_store)
+        for query in ("first", "sub", "test topic", "FiRsT", "xyznonexistent"):
+            assert sorted(_ids(fts.search(query))) == sorted(_ids(memory.search(query)))
+
+    def test_searches_tags_and_bodies(self, test_data_store: DataStore):
+        """Test that tags and Markdown bodies are indexed."""
+        fts = Fts5SearchService(test_data_store)
+        assert _ids(fts.search("important")) == [100]
+        assert _ids(fts.search("belongs")) == [102]
+
+    def test_title_matches_rank_first(self, tmp_path: Path):
+        """Test bm25 ranking with the title weighted above the body."""
+        (tmp_path / "1-a.md").write_text(
+            "---\ntopic_id: 1\ntitle: Notes\nview_count: 900\n---\n\n"
+            "Harrier, harrier et encore harrier."
+        )
+        (tmp_path / "2-b.md").write_text(
+            "---\ntopic_id: 2\ntitle: Harrier AV-8B\n---\n\nVol de nuit."
+        )
+        store = DataStore(tmp_path)
+        store.load_all()
+        assert _ids(Fts5SearchService(store).search("harrier")) == [2, 1]
+
+    def test_limit_and_empty_query(self, test_data_store: DataStore):
+        """Test the limit and queries without words."""
+        fts = Fts5SearchService(test_data_store)
+        assert len(fts.search("topic", limit=2)) == 2
+        assert fts.search("") == []
+
+    def test_index_follows_topic_changes(self, tmp_path: Path):
+        """Test that the index is patched when a topic file changes."""
+        topic_file = tmp_path / "1-alpha.md"
+        topic_file.write_text("---\ntopic_id: 1\ntitle: Alpha Mission\n---\n\nBody")
+        store = DataStore(tmp_path)
+        store.load_all()
+        fts = Fts5SearchService(store)
+        assert _ids(fts.search("alpha")) == [1]
+
+        topic_file.write_text("---\ntopic_id: 1\ntitle: Bravo Mission\n---\n\nBody")
+        store.apply_file_changes({topic_file}, set())
+        assert fts.search("alpha") == []
+        assert _ids(fts.search("bravo")) == [1]
+
+        store.apply_file_changes(set(), {topic_file})
+        assert fts.search("mission") == []
+
+    def test_lazy_bodies_are_indexed(self, test_data_dir: Path):
+        """Test that bodies are read from the files in LAZY_BODIES mode."""
+        store = DataStore(test_data_dir, lazy_bodies=True)
+        store.load_all()
+        fts = Fts5SearchService(store)
+        assert _ids(fts.search("belongs")) == [102]
+        assert store.body_cache is not None
+        assert store.body_cache.stats()["entries"] == 0
+
+
+class TestFts5CompiledIndex:
+    """Tests for the index compiled into the SQLite store file."""
+
+    def test_uses_compiled_index(
+        self, test_data_dir: Path, tmp_path: Path, test_data_store: DataStore
+    ):
+        """Test that the sqlite store is searched without rebuilding an index."""
+        output = tmp_path / "veaf.sqlite"
+        compile_main(["--data-path", str(test_data_dir), "--output", str(output)])
+        store = SqliteDataStore(test_data_dir, output)
+        store.load_all()
+
+        fts = Fts5SearchService(store)
+        assert fts._conn is None
+        reference = Fts5SearchService(test_data_store)
+        for query in ("first", "topic", "important", "belongs"):
+            assert _ids(fts.search(query)) == _ids(reference.search(query))
+
+
+class TestCreateSearchService:
+    """Tests for the SEARCH_BACKEND setting."""
+
+    def test_default_backend(
+        self, test_data_store: DataStore, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that the title index stays the default backend."""
+        monkeypatch.setattr(settings, "SEARCH_BACKEND", "memory")
+        assert isinstance(create_search_service(test_data_store), SearchService)
+
+    def test_fts5_backend(
+        self, test_data_store: DataStore, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test selecting the FTS5 backend."""
+        monkeypatch.setattr(settings, "SEARCH_BACKEND", "fts5")
+        assert isinstance(create_search_service(test_data_store), Fts5SearchService)
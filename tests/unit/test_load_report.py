@@ -0,0 +1,108 @@
+"""Unit tests for the loader report."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.services.data_loader import DataStore
+from app.services.load_report import SLOWEST_FILES, FileStats
+
+
+@pytest.fixture
+def data_dir(test_data_dir: Path, tmp_path: Path) -> Path:
+    """Copy of the test data with a broken topic and a topic without id."""
+    data = Path(shutil.copytree(test_data_dir, tmp_path / "data"))
+    cat_dir = data / "1-test-category"
+    (cat_dir / "103-broken.md").write_text("---\ntitle: [unclosed\n---\n\nBody")
+    (cat_dir / "104-no-id.md").write_text("---\ntitle: No id\n---\n\nBody")
+    return data
+
+
+class TestFileStats:
+    """Tests for FileStats counters."""
+
+    def test_slowest_is_bounded(self):
+        """Test that only the slowest files are kept, across merges."""
+        first, second = FileStats(), FileStats()
+        for i in range(SLOWEST_FILES * 2):
+            first.record(Path(f"a{i}.md"), 10, i / 1000, 0.0)
+            second.record(Path(f"b{i}.md"), 10, i / 100, 0.0)
+        first.merge(second)
+        assert first.files == SLOWEST_FILES * 4
+        assert first.bytes_read == 10 * SLOWEST_FILES * 4
+        assert len(first.slowest) == SLOWEST_FILES
+        assert all(path.startswith("b") for _, path in first.slowest)
+
+    def test_skip_formats_exception(self):
+        """Test that exceptions are stored with their type."""
+        stats = FileStats()
+        stats.skip(Path("x.md"), ValueError("bad date"))
+        assert stats.skipped == [("x.md", "ValueError: bad date")]
+
+
+class TestDataStoreLoadReport:
+    """Tests for the report built by DataStore.load_all."""
+
+    def test_counts_and_phases(self, data_dir: Path):
+        """Test file counts, bytes and phase timings of a full parse."""
+        store = DataStore(data_dir)
+        store.load_all()
+        report = store.load_report.as_dict()
+
+        assert report["source"] == "parse"
+        assert set(report["phases_seconds"]) >= {
+            "walk",
+            "yaml",
+            "render",
+            "index",
+        }
+        assert report["files"] == {"categories": 2, "topics": 4, "skipped": 2}
+        assert report["topics_loaded"] == 3
+        assert report["categories_loaded"] == 2
+        sizes = [p.stat().st_size for p in data_dir.rglob("*") if p.suffix != ".jpg"]
+        assert 0 < report["bytes_read"] <= sum(sizes)
+        assert len(report["slowest_files"]) == 4
+
+    def test_skipped_files_have_reasons(self, data_dir: Path):
+        """Test that every skipped file is listed with its error."""
+        store = DataStore(data_dir)
+        store.load_all()
+        skipped = {
+            Path(s["path"]).name: s["error"]
+            for s in store.load_report.as_dict()["skipped_files"]
+        }
+        assert set(skipped) == {"103-broken.md", "104-no-id.md"}
+        assert "Error" in skipped["103-broken.md"]
+        assert skipped["104-no-id.md"] == "no topic_id in frontmatter"
+
+    def test_paths_relative_to_root(self, data_dir: Path):
+        """Test that report paths can be made relative to the data directory."""
+        store = DataStore(data_dir)
+        store.load_all()
+        report = store.load_report.as_dict(root=data_dir)
+        paths = [s["path"] for s in report["skipped_files"]]
+        paths += [s["path"] for s in report["slowest_files"]]
+        assert "1-test-category/103-broken.md" in paths
+        assert not any(Path(path).is_absolute() for path in paths)
+
+    def test_parallel_report_matches_serial(self, data_dir: Path):
+        """Test that worker statistics are merged into the report."""
+        serial = DataStore(data_dir)
+        serial.load_all()
+        parallel = DataStore(data_dir, load_workers=2)
+        parallel.load_all()
+        serial_report = serial.load_report.as_dict()
+        parallel_report = parallel.load_report.as_dict()
+        for key in ("files", "bytes_read", "skipped_files", "topics_loaded"):
+            assert parallel_report[key] == serial_report[key]
+
+    def test_snapshot_source(self, data_dir: Path, tmp_path: Path):
+        """Test that a snapshot restore is reported as such."""
+        DataStore(data_dir, cache_path=tmp_path / "cache").load_all()
+        store = DataStore(data_dir, cache_path=tmp_path / "cache")
+        store.load_all()
+        report = store.load_report.as_dict()
+        assert report["source"] == "snapshot"
+        assert report["files"]["topics"] == 0
+        assert report["topics_loaded"] == 3
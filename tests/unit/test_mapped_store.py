@@ -0,0 +1,159 @@
+"""Unit tests for the memory-mapped shared DataStore."""
+
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from app.services.data_loader import DataStore, topic_sort_key
+from app.services.facets import TopicFilter
+from app.services.mapped_store import MappedDataStore, MappedOrderings
+from app.services.records import Topic
+from app.services.snapshot import snapshot_file
+
+
+@pytest.fixture
+def data_dir(test_data_dir: Path, tmp_path: Path) -> Path:
+    """Copy of the test data that tests can modify."""
+    return Path(shutil.copytree(test_data_dir, tmp_path / "data"))
+
+
+def _fail_parse(self: DataStore, *args: object) -> None:
+    raise AssertionError("data should have been mapped from the file")
+
+
+class TestMappedDataStore:
+    """Tests for the mmap store backend."""
+
+    def test_matches_memory_store(self, data_dir: Path, tmp_path: Path):
+        """Test that the mapped store serves the same data as the eager one."""
+        eager = DataStore(data_dir)
+        eager.load_all()
+        mapped = MappedDataStore(data_dir, tmp_path / "cache")
+        mapped.load_all()
+
+        assert sorted(mapped.topics) == sorted(eager.topics)
+        assert len(mapped.topics) == len(eager.topics)
+        assert mapped.categories == eager.categories
+        assert mapped.category_tree == eager.category_tree
+        assert mapped.category_topics == eager.category_topics
+        assert mapped.export_info == eager.export_info
+        for tid in eager.topics:
+            assert mapped.get_topic(tid) == eager.get_topic(tid)
+
+    def test_listings_match_memory_store(self, data_dir: Path, tmp_path: Path):
+        """Test listings, filters and cursors read from the mapped sections."""
+        eager = DataStore(data_dir)
+        eager.load_all()
+        mapped = MappedDataStore(data_dir, tmp_path / "cache")
+        mapped.load_all()
+
+        def ids(result: tuple[list[Topic], int]) -> tuple[list[int], int]:
+            return [t.topic_id for t in result[0]], result[1]
+
+        filters = [
+            None,
+            TopicFilter(locked=False),
+            TopicFilter(tags=("training",)),
+            TopicFilter(author_id=1, created_after=datetime(2024, 1, 1)),
+        ]
+        for sort_by in ("created", "last_post", "view_count", "rating"):
+            for order in ("asc", "desc"):
+                for topic_filter in filters:
+                    args = (1, 20, sort_by, order, None, topic_filter)
+                    assert ids(mapped.get_all_topics(*args)) == ids(
+                        eager.get_all_topics(*args)
+                    )
+                    assert ids(mapped.get_category_topics(1, *args, True)) == ids(
+                        eager.get_category_topics(1, *args, True)
+                    )
+                for topic in eager.topics.values():
+                    after = topic_sort_key(topic, sort_by, order == "desc")
+                    assert ids(
+                        mapped.get_all_topics(1, 20, sort_by, order, after)
+                    ) == ids(eager.get_all_topics(1, 20, sort_by, order, after))
+                for tag in eager.tag_topics:
+                    assert ids(mapped.get_tag_topics(tag, 1, 20, sort_by, order)) == (
+                        ids(eager.get_tag_topics(tag, 1, 20, sort_by, order))
+                    )
+                for author_id in eager.author_topics:
+                    assert ids(
+                        mapped.get_author_topics(author_id, 1, 20, sort_by, order)
+                    ) == ids(eager.get_author_topics(author_id, 1, 20, sort_by, order))
+        for year, month in eager.archive:
+            assert ids(mapped.get_archive_topics(year, month)) == ids(
+                eager.get_archive_topics(year, month)
+            )
+
+    def test_orderings_are_mapped(self, data_dir: Path, tmp_path: Path):
+        """Test that orderings and facet arrays are views of the file."""
+        store = MappedDataStore(data_dir, tmp_path / "cache")
+        store.load_all()
+        assert isinstance(store.topic_orderings, MappedOrderings)
+        assert isinstance(store.category_orderings[1, "created", "desc"], memoryview)
+        assert isinstance(store.facets.ids, memoryview)
+        assert all(isinstance(r, memoryview) for r in store.facets.ranks.values())
+
+    def test_rebuilt_report_keeps_phases(self, data_dir: Path, tmp_path: Path):
+        """Test that the report of a rebuild keeps the walk and map phases."""
+        store = MappedDataStore(data_dir, tmp_path / "cache")
+        store.load_all()
+        report = store.load_report.as_dict()
+        assert report["source"] == "mmap (rebuilt)"
+        assert {"walk", "map", "topics", "mmap_write"} <= set(report["phases_seconds"])
+        assert report["files"]["topics"] == 3
+        assert report["topics_loaded"] == 3
+
+    def test_listing_topics_are_metadata_only(self, data_dir: Path, tmp_path: Path):
+        """Test that mapped topics carry no body until fetched individually."""
+        store = MappedDataStore(data_dir, tmp_path / "cache")
+        store.load_all()
+        topic = store.topics[100]
+        assert topic.content is None
+        full = store.get_topic(100)
+        assert full is not None
+        assert full.content
+        assert full.content_html
+
+    def test_unknown_topic(self, data_dir: Path, tmp_path: Path):
+        """Test lookups of missing or invalid topic ids."""
+        store = MappedDataStore(data_dir, tmp_path / "cache")
+        store.load_all()
+        assert store.get_topic(99999) is None
+        assert 99999 not in store.topics
+        assert "100" not in store.topics
+        with pytest.raises(KeyError):
+            store.topics[99999]
+
+    def test_second_worker_attaches_without_parsing(
+        self, data_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that an existing file is mapped instead of reparsed."""
+        cache = tmp_path / "cache"
+        MappedDataStore(data_dir, cache).load_all()
+        assert snapshot_file(cache, data_dir, "mapped", ".bin").exists()
+
+        monkeypatch.setattr(DataStore, "_parse_all", _fail_parse)
+        store = MappedDataStore(data_dir, cache)
+        store.load_all()
+        assert 100 in store.topics
+
+    def test_rebuilt_when_export_changes(self, data_dir: Path, tmp_path: Path):
+        """Test that a modified topic file invalidates the mapped file."""
+        cache = tmp_path / "cache"
+        MappedDataStore(data_dir, cache).load_all()
+
+        topic_file = data_dir / "1-test-category" / "101-second-test-topic.md"
+        topic_file.write_text(
+            topic_file.read_text().replace("Second Test Topic", "Renamed Topic")
+        )
+
+        store = MappedDataStore(data_dir, cache)
+        store.load_all()
+        assert store.topics[101].title == "Renamed Topic"
+
+    def test_no_live_reload(self, data_dir: Path, tmp_path: Path):
+        """Test that the mapped store opts out of the file watcher."""
+        assert DataStore.live_reload
+        assert not MappedDataStore(data_dir, tmp_path / "cache").live_reload
@@ -0,0 +1,63 @@
+"""Unit tests for the compact topic and category records."""
+
+import dataclasses
+import pickle
+import sys
+
+import pytest
+
+from app.services.data_loader import DataStore
+
+
+class TestTopicRecord:
+    """Tests for Topic records."""
+
+    def test_read_only(self, test_data_store: DataStore):
+        """Test that shared topics cannot be modified by handlers."""
+        topic = test_data_store.topics[100]
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            topic.title = "Changed"  # type: ignore[misc]
+        with pytest.raises(TypeError):
+            topic["title"] = "Changed"  # type: ignore[index]
+
+    def test_no_instance_dict(self, test_data_store: DataStore):
+        """Test that records are slotted."""
+        assert not hasattr(test_data_store.topics[100], "__dict__")
+        assert not hasattr(test_data_store.categories[1], "__dict__")
+
+    def test_mapping_access(self, test_data_store: DataStore):
+        """Test dict-style read access used by templates and callers."""
+        topic = test_data_store.topics[100]
+        assert topic["title"] == topic.title
+        assert topic.get("view_count") == 150
+        assert topic.get("missing", "default") == "default"
+        with pytest.raises(KeyError):
+            topic["missing"]
+
+    def test_tags_interned(self, test_data_store: DataStore):
+        """Test that tags are stored as interned strings in a tuple."""
+        tags = test_data_store.topics[100].tags
+        assert tags == ("test", "important")
+        assert all(tag is sys.intern(tag) for tag in tags)
+
+    def test_pickle_roundtrip(self, test_data_store: DataStore):
+        """Test that records survive the snapshot and the process pool."""
+        topic = test_data_store.topics[100]
+        assert pickle.loads(pickle.dumps(topic)) == topic
+
+
+class TestCategoryRecord:
+    """Tests for Category records."""
+
+    def test_defaults(self, tmp_path):
+        """Test defaults applied to minimal category metadata."""
+        cat_dir = tmp_path / "5-minimal"
+        cat_dir.mkdir()
+        (cat_dir / "_category.yml").write_text("id: 5\nname: Minimal\nparent_cid: 1\n")
+        store = DataStore(tmp_path)
+        store.load_all()
+        cat = store.categories[5]
+        assert cat.is_subcategory is True
+        assert cat.order == 0
+        assert cat.icon is None
+        assert cat.path == str(cat_dir)
@@ -0,0 +1,91 @@
+"""Unit tests for the export directory scanner."""
+
+from pathlib import Path
+
+from app.services.scanner import FileKind, classify_file, scan_data_tree
+
+
+class TestClassifyFile:
+    """Tests for file classification."""
+
+    def test_classify_file(self):
+        """Test that each kind of export file is recognised."""
+        assert classify_file("_export.yml") is FileKind.EXPORT
+        assert classify_file("_category.yml") is FileKind.CATEGORY
+        assert classify_file("100-topic.md") is FileKind.TOPIC
+        assert classify_file("index.md") is FileKind.INDEX
+        assert classify_file("photo.JPG") is FileKind.IMAGE
+        assert classify_file("notes.txt") is None
+
+
+class TestScanDataTree:
+    """Tests for scan_data_tree."""
+
+    def test_scan_test_data(self, test_data_dir: Path):
+        """Test that a single walk finds categories and topics."""
+        manifest = scan_data_tree(test_data_dir)
+        assert manifest.export_file == test_data_dir / "_export.yml"
+        assert sorted(p.parent.name for p in manifest.category_files) == [
+            "1-test-category",
+            "2-test-subcategory",
+        ]
+        assert sorted(p.name for p in manifest.topic_files) == [
+            "100-first-test-topic.md",
+            "101-second-test-topic.md",
+            "102-subcategory-topic.md",
+        ]
+        assert manifest.fingerprints == {}
+
+    def test_images_dir_skipped(self, test_data_dir: Path):
+        """Test that the root images/ subtree is never walked."""
+        manifest = scan_data_tree(test_data_dir)
+        assert manifest.image_files == []
+
+    def test_index_and_images_classified(self, tmp_path: Path):
+        """Test index.md and images outside images/ are listed separately."""
+        cat_dir = tmp_path / "cat"
+        cat_dir.mkdir()
+        (cat_dir / "index.md").write_text("# Index")
+        (cat_dir / "diagram.png").write_bytes(b"png")
+        (tmp_path / "images").mkdir()
+        (tmp_path / "images" / "ignored.md").write_text("ignored")
+
+        manifest = scan_data_tree(tmp_path)
+        assert manifest.index_files == [cat_dir / "index.md"]
+        assert manifest.image_files == [cat_dir / "diagram.png"]
+        assert manifest.topic_files == []
+
+    def test_deterministic_order(self, tmp_path: Path):
+        """Test that files come out sorted, directories depth-first."""
+        for name in ("b", "a"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "2-y.md").write_text("")
+            (tmp_path / name / "1-x.md").write_text("")
+        (tmp_path / "0-root.md").write_text("")
+
+        manifest = scan_data_tree(tmp_path)
+        assert [str(p.relative_to(tmp_path)) for p in manifest.topic_files] == [
+            "0-root.md",
+            str(Path("a") / "1-x.md"),
+            str(Path("a") / "2-y.md"),
+            str(Path("b") / "1-x.md"),
+            str(Path("b") / "2-y.md"),
+        ]
+
+    def test_symlinked_directories_not_followed(self, tmp_path: Path):
+        """Test that a symlink loop does not make the walk recurse forever."""
+        cat_dir = tmp_path / "1-cat"
+        cat_dir.mkdir()
+        (cat_dir / "1-x.md").write_text("")
+        (cat_dir / "loop").symlink_to(tmp_path, target_is_directory=True)
+
+        manifest = scan_data_tree(tmp_path)
+        assert manifest.topic_files == [cat_dir / "1-x.md"]
+
+    def test_fingerprints(self, test_data_dir: Path):
+        """Test that source files are fingerprinted on request."""
+        manifest = scan_data_tree(test_data_dir, fingerprint=True)
+        topic = str(Path("1-test-category") / "100-first-test-topic.md")
+        st = (test_data_dir / topic).stat()
+        assert manifest.fingerprints[topic] == (st.st_mtime_ns, st.st_size)
+        assert "_export.yml" in manifest.fingerprints
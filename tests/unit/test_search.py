@@ -1,8 +1,11 @@
 """Unit tests for search service."""
 
+from pathlib import Path
+
+import pytest
 
 from app.services.data_loader import DataStore
-from app.services.search import SearchService
+from app.services.search import SearchService, compound_parts, word_ngrams
 
 
 class TestSearchService:
@@ -90,3 +93,140 @@ class TestSearchService:
         search = SearchService(test_data_store)
         # Single character words should be excluded
         assert "a" not in search.title_index
+
+
+class TestSearchPrefixIndex:
+    """Tests for the sorted vocabulary and the memoised word expansions."""
+
+    def test_vocabulary_sorted(self, test_data_store: DataStore):
+        """Test that the vocabulary lists every indexed word in order."""
+        search = SearchService(test_data_store)
+        assert search.vocabulary == sorted(search.title_index)
+
+    def test_prefix_words(self, test_data_store: DataStore):
+        """Test prefix ranges of the vocabulary."""
+        search = SearchService(test_data_store)
+        assert search.prefix_words("sub") == ["subcategory"]
+        assert search.prefix_words("zzz") == []
+        assert search.prefix_words("") == search.vocabulary
+
+    def test_expand_keeps_infix_matches(self, test_data_store: DataStore):
+        """Test that words containing the query word further in still match."""
+        search = SearchService(test_data_store)
+        assert search.expand("category") == ["subcategory"]
+        assert [t["topic_id"] for t in search.search("category")] == [102]
+
+    def test_expansion_narrowed_from_cached_prefix(self, tmp_path):
+        """Test that typing further filters a cached expansion consistently."""
+        titles = ["Mirage 2000", "Mirage2000 loadout", "Admiral Kuznetsov", "Mig 29"]
+        for tid, title in enumerate(titles, 1):
+            (tmp_path / f"{tid}-t.md").write_text(
+                f"---\ntopic_id: {tid}\ntitle: {title}\n---\n"
+            )
+        store = DataStore(tmp_path)
+        store.load_all()
+        search = SearchService(store)
+        assert search.expand("mi") == ["mig", "mirage", "mirage2000", "admiral"]
+        assert search.expand("mir") == ["mirage", "mirage2000", "admiral"]
+        assert search.expand("mirage2") == ["mirage2000"]
+        assert search.expand("2000") == ["2000", "mirage2000"]
+        fresh = SearchService(store)
+        for word in ("mir", "mirage2", "2000"):
+            assert fresh.expand(word) == search.expand(word)
+
+
+class TestSearchNgramIndex:
+    """Tests for the trigram index of substring matches."""
+
+    TITLES = [
+        "Mirage 2000 procédures",
+        "Mirage2000 loadout",
+        "Admiral Kuznetsov",
+        "Mig 29 et Mirage F1",
+        "Hornet F18",
+    ]
+
+    @pytest.fixture
+    def store(self, tmp_path: Path) -> DataStore:
+        for tid, title in enumerate(self.TITLES, 1):
+            (tmp_path / f"{tid}-t.md").write_text(
+                f"---\ntopic_id: {tid}\ntitle: {title}\nview_count: {tid}\n---\n"
+            )
+        store = DataStore(tmp_path)
+        store.load_all()
+        return store
+
+    def test_trigram_postings(self, store: DataStore):
+        """Test that trigrams map to the vocabulary words holding them."""
+        search = SearchService(store)
+        assert search.ngram_index["000"] == {"2000", "mirage2000"}
+        assert search.ngram_index["age"] == {"mirage", "mirage2000"}
+        assert word_ngrams("f1") == set()
+
+    @pytest.mark.parametrize(
+        "word", ["rag", "age2", "2000", "edure", "iral", "mi", "f1", "zzz", "é"]
+    )
+    def test_expand_matches_scan(self, store: DataStore, word: str):
+        """Test that trigram candidates give the words of a plain scan."""
+        search = SearchService(store)
+        assert set(search.expand(word)) == {
+            indexed for indexed in search.title_index if word in indexed
+        }
+
+    def test_compound_words(self, store: DataStore):
+        """Test that letter/digit compounds also match their separate parts."""
+        search = SearchService(store)
+        assert compound_parts("mirage2000") == ["mirage", "2000"]
+        assert compound_parts("f18") == []
+        assert compound_parts("mirage") == []
+        assert [t.topic_id for t in search.search("mirage2000")] == [2, 1]
+        assert [t.topic_id for t in search.search("mirage 2000")] == [2, 1]
+        assert [t.topic_id for t in search.search("ornet")] == [5]
+        assert [t.topic_id for t in search.search("mir2000")] == [1]
+
+    @pytest.mark.parametrize("word", ["ge20", "2000mirage", "mirage29"])
+    def test_compound_parts_in_order_at_word_starts(self, store: DataStore, word: str):
+        """Test that compound parts must start consecutive words, in order."""
+        search = SearchService(store)
+        # ge20 reste une sous-chaîne du mot mirage2000 (topic 2)
+        assert {1, 4}.isdisjoint(t.topic_id for t in search.search(word))
+
+    def test_index_follows_topic_changes(self, store: DataStore):
+        """Test that trigram postings follow the vocabulary."""
+        search = SearchService(store)
+        topic_file = store.data_path / "5-t.md"
+        topic_file.write_text("---\ntopic_id: 5\ntitle: Tomcat F14\n---\n")
+        store.apply_file_changes({topic_file}, set())
+        assert "hornet" not in search.ngram_index.get("orn", set())
+        assert search.ngram_index["mca"] == {"tomcat"}
+        assert [t.topic_id for t in search.search("omca")] == [5]
+
+        for tid in range(1, 6):
+            store.apply_file_changes(set(), {store.data_path / f"{tid}-t.md"})
+        assert search.ngram_index == {}
+
+
+class TestSearchServiceLiveUpdate:
+    """Tests for search index patching on store changes."""
+
+    def test_index_follows_topic_changes(self, tmp_path):
+        """Test that the title index is updated when a topic file changes."""
+        topic_file = tmp_path / "1-alpha.md"
+        topic_file.write_text("---\ntopic_id: 1\ntitle: Alpha Mission\n---\n\nBody")
+        store = DataStore(tmp_path)
+        store.load_all()
+        search = SearchService(store)
+        assert [t["topic_id"] for t in search.search("alpha")] == [1]
+
+        topic_file.write_text("---\ntopic_id: 1\ntitle: Bravo Mission\n---\n\nBody")
+        store.apply_file_changes({topic_file}, set())
+        assert search.search("alpha") == []
+        assert [t["topic_id"] for t in search.search("bravo")] == [1]
+        assert "alpha" not in search.title_index
+
+        assert "alpha" not in search.vocabulary
+        assert "bravo" in search.vocabulary
+
+        store.apply_file_changes(set(), {topic_file})
+        assert search.search("mission") == []
+        assert search.vocabulary == []
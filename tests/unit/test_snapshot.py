@@ -0,0 +1,78 @@
+"""Unit tests for the precompiled DataStore snapshot."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.services.data_loader import DataStore
+from app.services.snapshot import build_manifest, snapshot_file
+
+
+@pytest.fixture
+def data_dir(test_data_dir: Path, tmp_path: Path) -> Path:
+    """Copy of the test data that tests can modify."""
+    return Path(shutil.copytree(test_data_dir, tmp_path / "data"))
+
+
+def _fail_parse(self: DataStore, *args: object) -> None:
+    raise AssertionError("data should have been loaded from the snapshot")
+
+
+class TestSnapshot:
+    """Tests for snapshot creation and reuse."""
+
+    def test_manifest_lists_source_files(self, data_dir: Path):
+        """Test that the manifest covers yml and topic files but not images."""
+        manifest = build_manifest(data_dir)
+        assert "_export.yml" in manifest
+        assert str(Path("1-test-category") / "_category.yml") in manifest
+        assert str(Path("1-test-category") / "100-first-test-topic.md") in manifest
+        assert not any(key.startswith("images") for key in manifest)
+
+    def test_snapshot_written_after_load(self, data_dir: Path, tmp_path: Path):
+        """Test that a full load writes the snapshot file."""
+        cache = tmp_path / "cache"
+        DataStore(data_dir, cache_path=cache).load_all()
+        assert snapshot_file(cache, data_dir).exists()
+
+    def test_snapshot_reused_when_unchanged(
+        self, data_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that an unchanged export is restored without parsing."""
+        cache = tmp_path / "cache"
+        first = DataStore(data_dir, cache_path=cache)
+        first.load_all()
+
+        monkeypatch.setattr(DataStore, "_parse_all", _fail_parse)
+        second = DataStore(data_dir, cache_path=cache)
+        second.load_all()
+        assert second.topics == first.topics
+        assert second.categories == first.categories
+        assert second.category_tree == first.category_tree
+        assert second.category_topics == first.category_topics
+        assert second.export_info == first.export_info
+
+    def test_snapshot_invalidated_on_change(self, data_dir: Path, tmp_path: Path):
+        """Test that modifying a topic file triggers a full reparse."""
+        cache = tmp_path / "cache"
+        DataStore(data_dir, cache_path=cache).load_all()
+
+        topic_file = data_dir / "1-test-category" / "101-second-test-topic.md"
+        topic_file.write_text(
+            topic_file.read_text().replace("Second Test Topic", "Renamed Topic")
+        )
+
+        store = DataStore(data_dir, cache_path=cache)
+        store.load_all()
+        assert store.topics[101]["title"] == "Renamed Topic"
+
+    def test_corrupt_snapshot_ignored(self, data_dir: Path, tmp_path: Path):
+        """Test that an unreadable snapshot falls back to parsing."""
+        cache = tmp_path / "cache"
+        cache.mkdir()
+        snapshot_file(cache, data_dir).write_bytes(b"not a pickle")
+
+        store = DataStore(data_dir, cache_path=cache)
+        store.load_all()
+        assert len(store.topics) == 3
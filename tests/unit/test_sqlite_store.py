@@ -0,0 +1,251 @@
+"""Unit tests for the compiled SQLite DataStore."""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.compile import main as compile_main
+from app.services.data_loader import DataStore, topic_sort_key
+from app.services.facets import TopicFilter
+from app.services.records import Topic
+from app.services.sqlite_store import _TOPIC_SELECT, SqliteDataStore
+
+
+@pytest.fixture
+def sqlite_store(test_data_dir: Path, tmp_path: Path) -> SqliteDataStore:
+    """SQLite store compiled from the test data."""
+    output = tmp_path / "veaf.sqlite"
+    compile_main(["--data-path", str(test_data_dir), "--output", str(output)])
+    store = SqliteDataStore(test_data_dir, output)
+    store.load_all()
+    return store
+
+
+class TestSqliteDataStore:
+    """Tests for the sqlite store backend against the in-memory store."""
+
+    def test_indices_match(
+        self, sqlite_store: SqliteDataStore, test_data_store: DataStore
+    ):
+        """Test that categories and indices are restored from the file."""
+        assert sqlite_store.categories == test_data_store.categories
+        assert sqlite_store.category_tree == test_data_store.category_tree
+        assert sqlite_store.category_intervals == test_data_store.category_intervals
+        assert sqlite_store.category_topics == test_data_store.category_topics
+        assert sqlite_store.tag_topics == test_data_store.tag_topics
+        assert sqlite_store.tag_counts == test_data_store.tag_counts
+        assert sqlite_store.author_stats == test_data_store.author_stats
+        assert sqlite_store.archive == test_data_store.archive
+        assert sqlite_store.export_info == test_data_store.export_info
+        assert list(sqlite_store.topics) == list(test_data_store.topics)
+        assert len(sqlite_store.topics) == len(test_data_store.topics)
+
+    def test_get_topic_matches(
+        self, sqlite_store: SqliteDataStore, test_data_store: DataStore
+    ):
+        """Test that topics with their rendered HTML are served from SQLite."""
+        for tid in test_data_store.topics:
+            assert sqlite_store.get_topic(tid) == test_data_store.get_topic(tid)
+        assert sqlite_store.get_topic(99999) is None
+
+    def test_topics_mapping_is_metadata_only(self, sqlite_store: SqliteDataStore):
+        """Test that mapping lookups do not load bodies."""
+        assert 100 in sqlite_store.topics
+        assert 99999 not in sqlite_store.topics
+        assert sqlite_store.topics[100].content is None
+        with pytest.raises(KeyError):
+            sqlite_store.topics[99999]
+
+    @pytest.mark.parametrize(
+        "sort_by", ["created", "last_post", "view_count", "rating"]
+    )
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_listings_match(
+        self,
+        sqlite_store: SqliteDataStore,
+        test_data_store: DataStore,
+        sort_by: str,
+        order: str,
+    ):
+        """Test that SQL ordering matches the in-memory sort."""
+
+        def ids(result: tuple[list, int]) -> tuple[list[int], int]:
+            topics, total = result
+            return [t.topic_id for t in topics], total
+
+        for cid in test_data_store.categories:
+            assert ids(
+                sqlite_store.get_category_topics(cid, 1, 20, sort_by, order)
+            ) == ids(test_data_store.get_category_topics(cid, 1, 20, sort_by, order))
+            for page in (1, 2):
+                assert ids(
+                    sqlite_store.get_category_topics(
+                        cid, page, 2, sort_by, order, include_descendants=True
+                    )
+                ) == ids(
+                    test_data_store.get_category_topics(
+                        cid, page, 2, sort_by, order, include_descendants=True
+                    )
+                )
+        for page in (1, 2):
+            assert ids(sqlite_store.get_all_topics(page, 2, sort_by, order)) == ids(
+                test_data_store.get_all_topics(page, 2, sort_by, order)
+            )
+        for author_id in test_data_store.author_stats:
+            assert ids(
+                sqlite_store.get_author_topics(author_id, 1, 20, sort_by, order)
+            ) == ids(
+                test_data_store.get_author_topics(author_id, 1, 20, sort_by, order)
+            )
+        for tag in test_data_store.tag_topics:
+            assert ids(sqlite_store.get_tag_topics(tag, 1, 20, sort_by, order)) == ids(
+                test_data_store.get_tag_topics(tag, 1, 20, sort_by, order)
+            )
+
+    @pytest.mark.parametrize(
+        "topic_filter",
+        [
+            TopicFilter(locked=False),
+            TopicFilter(tags=("test",)),
+            TopicFilter(author_id=1, created_after=datetime(2024, 1, 12)),
+            TopicFilter(created_before=datetime(2024, 1, 15, 10, 30)),
+        ],
+    )
+    def test_filtered_listings_match(
+        self,
+        sqlite_store: SqliteDataStore,
+        test_data_store: DataStore,
+        topic_filter: TopicFilter,
+    ):
+        """Test that SQL filters select the same topics as the facet bitmaps."""
+
+        def ids(result: tuple[list, int]) -> tuple[list[int], int]:
+            topics, total = result
+            return [t.topic_id for t in topics], total
+
+        for order in ("asc", "desc"):
+            assert ids(
+                sqlite_store.get_all_topics(1, 20, "created", order, None, topic_filter)
+            ) == ids(
+                test_data_store.get_all_topics(
+                    1, 20, "created", order, None, topic_filter
+                )
+            )
+            assert ids(
+                sqlite_store.get_category_topics(
+                    1, 1, 20, "view_count", order, None, topic_filter
+                )
+            ) == ids(
+                test_data_store.get_category_topics(
+                    1, 1, 20, "view_count", order, None, topic_filter
+                )
+            )
+
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_seek_after_matches(
+        self,
+        sqlite_store: SqliteDataStore,
+        test_data_store: DataStore,
+        order: str,
+    ):
+        """Test keyset paging in SQL against the in-memory orderings."""
+        for sort_by in ("created", "last_post", "view_count"):
+            for topic in test_data_store.topics.values():
+                for pinned_first in (True, False):
+                    after = topic_sort_key(
+                        topic, sort_by, order == "desc", pinned_first
+                    )
+                    if pinned_first:
+                        cid = topic.category_id
+                        assert cid is not None
+                        got = sqlite_store.get_category_topics(
+                            cid, 1, 20, sort_by, order, after
+                        )
+                        want = test_data_store.get_category_topics(
+                            cid, 1, 20, sort_by, order, after
+                        )
+                    else:
+                        got = sqlite_store.get_all_topics(1, 20, sort_by, order, after)
+                        want = test_data_store.get_all_topics(
+                            1, 20, sort_by, order, after
+                        )
+                    assert [t.topic_id for t in got[0]] == [t.topic_id for t in want[0]]
+
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_archive_matches(
+        self,
+        sqlite_store: SqliteDataStore,
+        test_data_store: DataStore,
+        order: str,
+    ):
+        """Test month pages, by offset and after a key, against the buckets."""
+        for page in (1, 2):
+            got = sqlite_store.get_archive_topics(2024, 1, page, 2, order)
+            want = test_data_store.get_archive_topics(2024, 1, page, 2, order)
+            assert [t.topic_id for t in got[0]] == [t.topic_id for t in want[0]]
+            assert got[1] == want[1] == 3
+        for topic in test_data_store.topics.values():
+            after = topic_sort_key(topic, "created", order == "desc")
+            got = sqlite_store.get_archive_topics(2024, 1, 1, 20, order, after)
+            want = test_data_store.get_archive_topics(2024, 1, 1, 20, order, after)
+            assert [t.topic_id for t in got[0]] == [t.topic_id for t in want[0]]
+        assert sqlite_store.get_archive_topics(2023, 12) == ([], 0)
+
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    @pytest.mark.parametrize("sort_by", ["created", "last_post", "view_count"])
+    def test_listings_use_sort_indexes(
+        self,
+        sqlite_store: SqliteDataStore,
+        test_data_store: DataStore,
+        monkeypatch: pytest.MonkeyPatch,
+        sort_by: str,
+        order: str,
+    ):
+        """Test that seeks are served by an index, without a sort step."""
+        queries: list[tuple[Any, ...]] = []
+        query_topics = sqlite_store._query_topics
+
+        def spy(*args: Any) -> list[Topic]:
+            queries.append(args)
+            return query_topics(*args)
+
+        monkeypatch.setattr(sqlite_store, "_query_topics", spy)
+        topic = test_data_store.topics[100]
+        descending = order == "desc"
+        after = topic_sort_key(topic, sort_by, descending)
+        sqlite_store.get_all_topics(1, 20, sort_by, order, after)
+        after = topic_sort_key(topic, sort_by, descending, pinned_first=True)
+        sqlite_store.get_category_topics(1, 1, 20, sort_by, order, after)
+        sqlite_store.get_archive_topics(2024, 1, 1, 20, order)
+
+        conn = sqlite_store.connection()
+        for where, params, order_by, limit, offset in queries:
+            rows = conn.execute(
+                f"EXPLAIN QUERY PLAN {_TOPIC_SELECT} WHERE {' AND '.join(where)}"
+                f" ORDER BY {order_by} LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            )
+            plan = [row[-1] for row in rows]
+            assert plan[0].startswith("SEARCH topics USING INDEX"), plan
+            assert not any("TEMP B-TREE" in step for step in plan), plan
+
+    def test_recent_topics_match(
+        self, sqlite_store: SqliteDataStore, test_data_store: DataStore
+    ):
+        """Test the recent topics query."""
+        assert [t.topic_id for t in sqlite_store.get_recent_topics(2)] == [
+            t.topic_id for t in test_data_store.get_recent_topics(2)
+        ]
+
+    def test_rejects_unknown_sort_column(self, sqlite_store: SqliteDataStore):
+        """Test that sort columns are whitelisted before reaching SQL."""
+        with pytest.raises(ValueError):
+            sqlite_store.get_all_topics(sort_by="title; DROP TABLE topics")
+
+    def test_missing_file(self, test_data_dir: Path, tmp_path: Path):
+        """Test that a missing compiled file gives a clear error."""
+        store = SqliteDataStore(test_data_dir, tmp_path / "missing.sqlite")
+        with pytest.raises(FileNotFoundError, match="app.compile"):
+            store.load_all()
@@ -0,0 +1,64 @@
+"""Unit tests for canonical URL paths and their resolution."""
+
+import pytest
+
+from app.services.data_loader import DataStore
+from app.services.urls import (
+    category_url_path,
+    parse_id_from_path,
+    resolve_path,
+    topic_url_path,
+)
+
+
+class TestUrlPaths:
+    """Tests for URL path construction and parsing."""
+
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [("20/some-slug", 20), ("20-some-slug", 20), ("20", 20)],
+    )
+    def test_parse_id_from_path(self, path: str, expected: int):
+        """Test the current, legacy and bare id formats."""
+        assert parse_id_from_path(path) == expected
+
+    def test_category_url_path(self):
+        """Test that only the last part of a nested slug is kept."""
+        assert category_url_path(2, "1/parent/2/child") == "2/child"
+        assert category_url_path(3, "") == "3"
+
+    def test_topic_url_path(self):
+        """Test that the id prefix of the slug is dropped."""
+        assert topic_url_path(100, "100-first-test-topic") == "100/first-test-topic"
+        assert topic_url_path(100, "100") == "100"
+        assert topic_url_path(100, "") == "100"
+
+    def test_records_carry_url_path(self, test_data_store: DataStore):
+        """Test that paths are computed when the records are built."""
+        assert test_data_store.categories[2].url_path == "2/test-subcategory"
+        assert test_data_store.topics[100].url_path == "100/first-test-topic"
+
+
+class TestResolvePath:
+    """Tests for serve vs redirect resolution."""
+
+    def test_canonical_path_served(self, test_data_store: DataStore):
+        """Test that the canonical path needs no redirect."""
+        topic, redirect = resolve_path(
+            "100/first-test-topic", test_data_store.get_topic
+        )
+        assert topic.topic_id == 100
+        assert redirect is None
+
+    def test_other_path_redirected(self, test_data_store: DataStore):
+        """Test that legacy and bare paths resolve to the canonical path."""
+        for path in ("1", "1-test-category", "1/wrong-slug"):
+            category, redirect = resolve_path(path, test_data_store.get_category)
+            assert category.id == 1
+            assert redirect == "1/test-category"
+
+    @pytest.mark.parametrize("path", ["999", "abc", ""])
+    def test_unknown_path(self, test_data_store: DataStore, path: str):
+        """Test that unknown ids and unparsable paths raise LookupError."""
+        with pytest.raises(LookupError):
+            resolve_path(path, test_data_store.get_category)
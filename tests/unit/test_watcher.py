@@ -0,0 +1,42 @@
+"""Unit tests for the data directory watcher."""
+
+import asyncio
+import contextlib
+from pathlib import Path
+
+from app.services import watcher
+from app.services.data_loader import DataStore
+
+
+class TestDiffManifests:
+    """Tests for manifest comparison."""
+
+    def test_diff_manifests(self):
+        """Test detection of added, modified and deleted files."""
+        old = {"a.md": (1, 10), "b.md": (1, 10), "c.md": (1, 10)}
+        new = {"a.md": (1, 10), "b.md": (2, 12), "d.md": (1, 5)}
+        changed, removed = watcher.diff_manifests(old, new)
+        assert changed == {"b.md", "d.md"}
+        assert removed == {"c.md"}
+
+
+class TestPollingWatcher:
+    """Tests for the polling fallback."""
+
+    async def test_polling_applies_changes(self, tmp_path: Path):
+        """Test that a new topic file is picked up by the polling loop."""
+        store = DataStore(tmp_path)
+        store.load_all()
+        task = asyncio.create_task(watcher._poll_changes(store, 0.01))
+        await asyncio.sleep(0.05)
+
+        (tmp_path / "1-new.md").write_text("---\ntopic_id: 1\ntitle: New\n---\n\nBody")
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if 1 in store.topics:
+                break
+
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        assert store.topics[1]["title"] == "New"